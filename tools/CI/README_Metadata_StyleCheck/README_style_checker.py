@@ -2,9 +2,22 @@
 
 from ast import Tuple
 import os
-import re
+import sys
 import typing
 import argparse
+import concurrent.futures
+import functools
+
+# Modules shared between the tools live in tools/shared. In the CI container
+# this script is copied to / and the repository is mounted at GITHUB_WORKSPACE.
+sys.path.append(os.path.join(os.path.dirname(os.path.realpath(__file__)), '..', '..', 'shared'))
+sys.path.append(os.path.join(os.environ.get('GITHUB_WORKSPACE', os.getcwd()), 'tools', 'shared'))
+from readme_parser import ReadmeDocument, load_readme
+from sample_folder import get_sample_folder
+from sample_tree import find_sample_root, iter_samples
+from result_cache import InputHasher, ResultCache, get_fingerprint
+from git_index import GitIndex, load_git_index
+import markdown_lint
 
 # region Global sets
 # A set of words that get omitted during letter-case checks.
@@ -30,31 +43,67 @@ exception_proper_nouns = {
     'WmsLayer',
 }
 
-# A set of category folder names in current sample viewer.
-categories = {
-    'Analysis',
-    'Data',
-    'Geometry',
-    'Geoprocessing',
-    'GraphicsOverlay',
-    'Hydrography',
-    'Layers',
-    'LocalServer',
-    'Location',
-    'Map',
-    'MapView',
-    'NetworkAnalysis',
-    'Scene',
-    'SceneView',
-    'Search',
-    'Security',
-    'Symbology',
-    'UtilityNetwork'
-}
-
 # endregion
 
 
+class ProperNounMatcher:
+    """
+    A trie of the words of proper nouns. Scanning a list of words finds every
+    proper noun in it, including multi-word ones such as 'Play a KML Tour', in
+    a single pass, however many proper nouns there are.
+    """
+
+    # The key that marks the end of a proper noun in a trie node.
+    end = None
+
+    def __init__(self, proper_nouns: typing.Iterable[str]):
+        self.root = {}
+        for proper_noun in proper_nouns:
+            node = self.root
+            for word in proper_noun.split():
+                node = node.setdefault(word, {})
+            node[self.end] = True
+
+    def match_length(self, words: typing.List[str], start: int) -> int:
+        """
+        :return: The number of words of the longest proper noun at the start
+        index, or 0 if no proper noun starts there.
+        """
+        node = self.root
+        length = 0
+        for index in range(start, len(words)):
+            node = node.get(words[index])
+            if node is None:
+                break
+            if self.end in node:
+                length = index - start + 1
+        return length
+
+    def unmatched_words(self, words: typing.List[str]) -> \
+            typing.List[typing.Tuple[int, str]]:
+        """
+        Get the words that are not part of a proper noun, whose letter case
+        still has to be checked.
+
+        :param words: The words, e.g. of a title or a tag.
+        :return: The index and word of each unmatched word.
+        """
+        unmatched = []
+        index = 0
+        while index < len(words):
+            length = self.match_length(words, index)
+            if length:
+                index += length
+            else:
+                unmatched.append((index, words[index]))
+                index += 1
+        return unmatched
+
+
+# The exceptions, compiled once for all checks.
+proper_noun_matcher = ProperNounMatcher(exception_proper_nouns)
+
+
 # region Static functions
 def get_folder_name_from_path(path: str, index: int = -1) -> str:
     """
@@ -68,20 +117,17 @@ def get_folder_name_from_path(path: str, index: int = -1) -> str:
     return os.path.normpath(path).split(os.path.sep)[index]
 
 
-def parse_head(head_string: str) -> (str, str):
+def parse_head(readme: ReadmeDocument) -> (str, str):
     """
-    Parse the head of README and get title and description.
+    Get title and description from the head of README.
 
-    :param head_string: A string containing title, description and images.
+    :param readme: The parsed README.
     :return: Stripped title and description strings.
     """
-    # Split title section and rule out empty lines.
-    parts = list(filter(bool, head_string.splitlines()))
-    if len(parts) < 3:
+    # The head should contain title, description and image lines.
+    if readme.image is None:
         raise Exception('README should contain title, description and image.')
-    title = parts[0].lstrip('# ').rstrip()
-    description = parts[1].strip()
-    return title, description
+    return readme.title, readme.description
 
 
 def check_apis(apis_string: str) -> typing.Set[str]:
@@ -129,9 +175,12 @@ def check_tags(tags_string: str) -> typing.Set[str]:
         t = tag.strip()
         s.add(t)
         stripped_tags.append(t)
-        if t.lower() != t and t.upper() != t and t.capitalize() != t \
-                and t not in exception_proper_nouns:
-            raise Exception(f'Wrong letter case for tag: "{t}".')
+        # Words other than proper nouns are lowercase or UPPERCASE, except
+        # that the first word may be capitalized.
+        for index, word in proper_noun_matcher.unmatched_words(t.split()):
+            if word.lower() != word and word.upper() != word \
+                    and (index > 0 or word.capitalize() != word):
+                raise Exception(f'Wrong letter case for tag: "{t}".')
     if '' in s:
         raise Exception('Empty char in tags.')
     if ', '.join(stripped_tags) != tags_string.strip():
@@ -158,22 +207,22 @@ def check_sentence_case(string: str) -> None:
     # Check empty string.
     if not string:
         raise Exception('Empty title string.')
-    # The whole sentence get excepted.
-    if string in exception_proper_nouns:
-        return
     # Split sentence into words.
     words = string.split()
     if words[0] == 'ï»¿#':
         raise Exception('BOM at start of file')
-    # First word should either be Title-cased or a proper noun (UPPERCASE).
-    if words[0][0].upper() != words[0][0] and words[0].upper() != words[0] \
-            and words[0] not in exception_proper_nouns:
-        raise Exception('Wrong letter case for the first word in title.')
-    # If a word is neither lowercase nor UPPERCASE then it is not great.
-    for word in words[1:]:
-        word = word.strip('()')
-        if word.lower() != word and word.upper() != word \
-                and word not in exception_proper_nouns:
+    # Proper nouns, including multi-word ones and a whole sentence that is a
+    # proper noun, are excepted.
+    stripped_words = [word.strip('()') for word in words]
+    for index, word in proper_noun_matcher.unmatched_words(stripped_words):
+        # First word should either be Title-cased or a proper noun (UPPERCASE).
+        if index == 0:
+            if words[0][0].upper() != words[0][0] \
+                    and words[0].upper() != words[0]:
+                raise Exception(
+                    'Wrong letter case for the first word in title.')
+        # If a word is neither lowercase nor UPPERCASE then it is not great.
+        elif word.lower() != word and word.upper() != word:
             raise Exception(f'Wrong letter case for word: "{word}" in title.')
 
 
@@ -200,6 +249,148 @@ def check_is_subsequence(list_a: typing.List[str],
 # endregion
 
 
+# region Rules
+# Sections rules can register for besides the section headers: the head of the
+# README, i.e. the title, description and image, and the whole README, which
+# is visited after all of its sections.
+HEAD = '<head>'
+DOCUMENT = '<document>'
+
+
+class ReadmeRule(typing.NamedTuple):
+    """
+    A style rule, called with the checker and the body of the section it is
+    registered for. A rule raises to report a violation, or returns the
+    violations if it can find several. Violations are prefixed with
+    `error_prefix`, if any.
+    """
+    section: str
+    error_prefix: typing.Optional[str]
+    check: typing.Callable[['ReadmeStyleChecker', str],
+                           typing.Optional[typing.List[str]]]
+
+
+# The registered rules, in the order their errors are reported.
+readme_rules: typing.List[ReadmeRule] = []
+
+
+def missing_section_error(header: str) -> str:
+    """
+    :return: The error of a rule whose section is missing, worded as the
+    checks have always reported it.
+    """
+    return f"'{header}' is not in list"
+
+
+def readme_rule(section: str, error_prefix: str):
+    """
+    Register a check as a rule for a section. A rule registered for a section
+    header reports the section as missing if the README doesn't have it.
+
+    :param section: A section header, e.g. 'Tags', or HEAD or DOCUMENT.
+    :param error_prefix: The prefix of the violations, e.g. 'Error tags', or
+    None to report them as raised.
+    """
+    def register(check):
+        readme_rules.append(ReadmeRule(section, error_prefix, check))
+        return check
+    return register
+
+
+@readme_rule(DOCUMENT, 'Error header')
+def check_format_heading(checker: 'ReadmeStyleChecker', _: str) -> None:
+    """
+    Check if
+    1. essential section headers present.
+    2. all sections are valid.
+    3. section headers are in correct order.
+    """
+    headers = checker.readme_headers
+    header_set = set(headers)
+    # Check if all sections are valid.
+    sets_diff = header_set - set(ReadmeStyleChecker.possible_headers)
+    if sets_diff:
+        raise Exception(
+            f'Unexpected header or extra whitespace - "{sets_diff}".')
+    # Check if all essential section headers present.
+    sets_diff = ReadmeStyleChecker.essential_headers - header_set
+    if sets_diff:
+        raise Exception(f'Missing essential header(s) - "{sets_diff}".')
+    # Check if all sections are in correct order.
+    index = check_is_subsequence(headers, ReadmeStyleChecker.possible_headers)
+    if index:
+        raise Exception(f'Wrong order at - "{headers[index-1]}".')
+
+
+@readme_rule(HEAD, 'Error title')
+def check_format_title_section(checker: 'ReadmeStyleChecker', _: str) -> None:
+    """
+    Check if
+    1. the head has at least 3 parts (title, description and image URLs).
+    2. the title string uses sentence case.
+    """
+    title, _ = parse_head(checker.readme)
+    check_sentence_case(title)
+
+
+@readme_rule('Relevant API', 'Error APIs')
+def check_format_apis(checker: 'ReadmeStyleChecker', body: str) -> None:
+    """
+    Check if APIs
+    1. do not have backticks.
+    2. are sorted.
+    3. do not have duplicate entries.
+    """
+    checker.apis = check_apis(body)
+
+
+@readme_rule('Tags', 'Error tags')
+def check_format_tags(checker: 'ReadmeStyleChecker', body: str) -> None:
+    """
+    Check if tags
+    1. are in correct case.
+    2. are sorted.
+    3. do not have duplicate entries.
+    """
+    checker.tags = check_tags(body)
+
+
+@readme_rule(DOCUMENT, None)
+def check_redundant_apis_in_tags(checker: 'ReadmeStyleChecker', _: str) \
+        -> None:
+    """
+    Check if APIs and tags intersect. A missing or malformed section fails
+    this check too, with the unprefixed error of its own check.
+    """
+    for header in ('Tags', 'Relevant API'):
+        if header not in checker.readme_headers:
+            raise Exception(missing_section_error(header))
+    apis = checker.apis
+    if apis is None:
+        apis = check_apis(checker.readme.section('Relevant API'))
+    tags = checker.tags
+    if tags is None:
+        tags = check_tags(checker.readme.section('Tags'))
+    if not apis.isdisjoint(tags):
+        raise Exception('Error tags - API should not be in tags')
+
+
+@readme_rule(DOCUMENT, 'Error markdown lint')
+def check_markdown_lint(checker: 'ReadmeStyleChecker', text: str) \
+        -> typing.List[str]:
+    """
+    Check the README against the mdl rules configured in style.rb, if the
+    checker lints. The rules work on the text of the README already loaded
+    for the other rules, so the file is only read once.
+    """
+    if not checker.lint:
+        return []
+    style = markdown_lint.get_style(markdown_lint.get_default_style_path())
+    return [error.format('readme.md')
+            for error in markdown_lint.lint(text, style)]
+# endregion
+
+
 class ReadmeStyleChecker:
 
     essential_headers = {
@@ -221,13 +412,17 @@ class ReadmeStyleChecker:
         'Tags'
     ]
 
-    def __init__(self, folder_path: str):
+    def __init__(self, folder_path: str, lint: bool = False):
         self.folder_path = folder_path
+        self.lint = lint
         self.folder_name = get_folder_name_from_path(folder_path)
         self.readme_path = os.path.join(folder_path, 'readme.md')
+        self.readme = None
         self.readme_contents = None
-        self.readme_parts = None
         self.readme_headers = None
+        # Values derived by the rules, shared with the rules that run later.
+        self.apis = None
+        self.tags = None
 
     def populate_from_readme(self) -> None:
         """
@@ -236,152 +431,101 @@ class ReadmeStyleChecker:
         :return: None. Throws if exception occurs.
         """
         try:
-            readme_file = open(self.readme_path, 'r')
-            # read the readme content into a string
-            contents = readme_file.read()
-            # A regular expression that matches exactly 2 pound marks, and
-            # capture the trailing string.
-            pattern = re.compile(r'^#{2}(?!#)\s(.*)', re.MULTILINE)
-            self.readme_contents = contents
-            # Use regex to split the README by section headers, so that they are
-            # separated into paragraphs.
-            self.readme_parts = re.split(pattern, contents)
-            # Capture the section headers.
-            self.readme_headers = re.findall(pattern, contents)
+            # The shared parser splits the README by section headers, so that
+            # they are separated into paragraphs.
+            self.readme = load_readme(self.readme_path)
+            self.readme_contents = self.readme.text
         except Exception as err:
             raise Exception(f'Error loading file - {self.readme_path} - {err}.')
-        else:
-            readme_file.close()
-
-    def check_format_heading(self) -> None:
-        """
-        Check if
-        1. essential section headers present.
-        2. all sections are valid.
-        3. section headers are in correct order.
-
-        :return: None. Throws if exception occurs.
-        """
-        header_set = set(self.readme_headers)
-        possible_header_set = set(self.possible_headers)
-        # Check if all sections are valid.
-        sets_diff = header_set - possible_header_set
-        if sets_diff:
-            raise Exception(
-                f'Error header - Unexpected header or extra whitespace'
-                f' - "{sets_diff}".')
-        # Check if all essential section headers present.
-        sets_diff = self.essential_headers - header_set
-        if sets_diff:
-            raise Exception(
-                f'Error header - Missing essential header(s) - "{sets_diff}".')
-        # Check if all sections are in correct order.
-        index = check_is_subsequence(self.readme_headers, self.possible_headers)
-        if index:
-            raise Exception(
-                f'Error header - Wrong order at - '
-                f'"{self.readme_headers[index-1]}".')
-
-    def check_format_title_section(self) -> None:
-        """
-        Check if
-        1. the head has at least 3 parts (title, description and image URLs).
-        2. the title string uses sentence case.
-
-        :return: None. Throws if exception occurs.
-        """
-        try:
-            title, _ = parse_head(self.readme_parts[0])
-            check_sentence_case(title)
-        except Exception as err:
-            raise Exception(f'Error title - {err}')
-
-    def check_format_apis(self) -> None:
-        """
-        Check if APIs
-        1. do not have backticks.
-        2. are sorted.
-        3. do not have duplicate entries.
-
-        :return: None. Throws if exception occurs.
-        """
-        try:
-            api_section_index = self.readme_parts.index('Relevant API') + 1
-            check_apis(self.readme_parts[api_section_index])
-        except Exception as err:
-            raise Exception(f'Error APIs - {err}')
-
-    def check_format_tags(self) -> None:
-        """
-        Check if tags
-        1. are in correct case.
-        2. are sorted.
-        3. do not have duplicate entries.
 
-        :return: None. Throws if exception occurs.
+    def run_rules(self) -> typing.List[str]:
         """
-        try:
-            tags_section_index = self.readme_parts.index('Tags') + 1
-            check_tags(self.readme_parts[tags_section_index])
-        except Exception as err:
-            raise Exception(f'Error tags - {err}')
+        Visit the head and the sections of the README once, calling the rules
+        registered for each, then the rules for the whole README.
 
-    def check_redundant_apis_in_tags(self) -> None:
+        :return: The violations, in the order the rules are registered.
         """
-        Check if APIs and tags intersect.
+        errors = []
 
-        :return: None. Throws if exception occurs.
-        """
-        tags_section_index = self.readme_parts.index('Tags') + 1
-        api_section_index = self.readme_parts.index('Relevant API') + 1
-        api_set = check_apis(self.readme_parts[api_section_index])
-        tag_set = check_tags(self.readme_parts[tags_section_index])
-        if not api_set.isdisjoint(tag_set):
-            raise Exception(f'Error tags - API should not be in tags')
+        def dispatch(section: str, body: str) -> None:
+            for index, rule in enumerate(readme_rules):
+                if rule.section != section:
+                    continue
+                try:
+                    violations = rule.check(self, body)
+                except Exception as err:
+                    violations = [err]
+                for violation in violations or []:
+                    errors.append((index, f'{rule.error_prefix} - {violation}'
+                                   if rule.error_prefix else str(violation)))
+
+        dispatch(HEAD, self.readme.head)
+        self.readme_headers = []
+        for section in self.readme.sections:
+            # Only the first of duplicate sections is checked; the heading
+            # rule reports the duplicate.
+            if section.header not in self.readme_headers:
+                dispatch(section.header, section.body)
+            self.readme_headers.append(section.header)
+        for index, rule in enumerate(readme_rules):
+            if rule.section not in (HEAD, DOCUMENT) and \
+                    rule.section not in self.readme_headers:
+                errors.append((index, f'{rule.error_prefix} - '
+                                      f'{missing_section_error(rule.section)}'))
+        dispatch(DOCUMENT, self.readme.text)
+        errors.sort(key=lambda error: error[0])
+        return [message for _, message in errors]
 
 
 # region Main wrapper functions
-def run_check(path: str, count: int) -> int:
-    checker = ReadmeStyleChecker(path)
-    # 1. Populate from README.
+def collect_errors(path: str, lint: bool = False) -> typing.List[str]:
+    """
+    Run every rule on a sample.
+
+    :param path: The path to the sample folder.
+    :param lint: Also check the README against the mdl rules of style.rb.
+    :return: The error messages, in the order of the rules.
+    """
+    checker = ReadmeStyleChecker(path, lint)
     try:
         checker.populate_from_readme()
     except Exception as err:
+        return [f'{checker.folder_path} - {err}']
+    return [f'{checker.folder_path} - {error}'
+            for error in checker.run_rules()]
+
+
+def run_check(path: str, count: int, lint: bool = False) -> int:
+    for error in collect_errors(path, lint):
         count += 1
-        print(f'{count}. {checker.folder_path} - {err}')
-    # 2. Check format of headings, e.g. 'Use case', 'How it works', etc.
-    try:
-        checker.check_format_heading()
-    except Exception as err:
-        count += 1
-        print(f'{count}. {checker.folder_path} - {err}')
-    # 3. Check format of title section, i.e. title, description and image URLs.
-    try:
-        checker.check_format_title_section()
-    except Exception as err:
-        count += 1
-        print(f'{count}. {checker.folder_path} - {err}')
-    # 4. Check format of relevant APIs.
-    try:
-        checker.check_format_apis()
-    except Exception as err:
-        count += 1
-        print(f'{count}. {checker.folder_path} - {err}')
-    # 5. Check format of tags.
-    try:
-        checker.check_format_tags()
-    except Exception as err:
-        count += 1
-        print(f'{count}. {checker.folder_path} - {err}')
-    # 6. Check if redundant APIs in tags
-    try:
-        checker.check_redundant_apis_in_tags()
-    except Exception as err:
-        count += 1
-        print(f'{count}. {checker.folder_path} - {err}')
+        print(f'{count}. {error}')
     return count
 
 
+def get_sample_paths(path: str,
+                     git_index: typing.Optional[GitIndex] = None) \
+        -> typing.List[str]:
+    """
+    Find the sample folders of every platform.
+
+    :param path: The path to the project root folder, or to its src folder.
+    :param git_index: The git index of the samples path. If given, the
+    samples are listed from the index instead of the folders.
+    :return: The paths to the sample folders, sorted.
+    """
+    sample_root = find_sample_root(path)
+    if git_index is not None:
+        return sorted(sample.path
+                      for sample in git_index.iter_samples(sample_root))
+    sample_paths = []
+    for sample in iter_samples(sample_root):
+        # Omit empty folders - they are omitted by Git.
+        if get_sample_folder(sample.path).is_empty():
+            continue
+        sample_paths.append(sample.path)
+    return sorted(sample_paths)
+
+
 def single(path: str):
     exception_count = run_check(path, 0)
     # Throw once if there are exceptions.
@@ -389,20 +533,97 @@ def single(path: str):
         raise Exception('Error(s) occurred during checking a single design.')
 
 
-def all_designs(path: str):
+def get_input_key(path: str,
+                  git_index: typing.Optional[GitIndex] = None) -> str:
+    """
+    Hash everything the checks of a sample read, i.e. the README and the
+    folder path, which the error messages include.
+
+    :param path: The path to the sample folder.
+    :param git_index: The git index to take the hashes of unchanged files
+    from, if any.
+    :return: The cache key of the sample.
+    """
+    hasher = InputHasher(git_index)
+    hasher.add_string(path)
+    hasher.add_file(os.path.join(path, 'readme.md'))
+    return hasher.hexdigest()
+
+
+def get_default_cache_path(path: str) -> str:
+    """
+    Get the result cache of a project, in its samples path, so that the
+    checker and the checker daemon share it whichever folder they are given.
+
+    :param path: The path to the project root folder, or to its src folder.
+    :return: The path to the cache file.
+    """
+    return os.path.join(find_sample_root(path), '.readme_style_cache.json')
+
+
+def get_checker_fingerprint() -> str:
+    """
+    :return: The fingerprint of this script and the shared modules it uses.
+    """
+    modules = [sys.modules[name] for name in
+               ('readme_parser', 'sample_folder', 'result_cache')]
+    return get_fingerprint(os.path.realpath(__file__),
+                           *(module.__file__ for module in modules))
+
+
+def all_designs(path: str, jobs: int = 1,
+                cache_path: typing.Optional[str] = None,
+                use_git_index: bool = False):
+    """
+    Run the check on all samples. The errors are printed in the order of the
+    sample paths, however many worker processes run the checks.
+
+    :param path: The path to the project root folder.
+    :param jobs: The number of worker processes; 0 uses one per CPU.
+    :param cache_path: The path to the result cache. The errors of samples
+    whose README is unchanged since the last run are replayed from the cache.
+    No cache is used if not given.
+    :param use_git_index: List the samples and hash their files from the git
+    index instead of walking the folders, if the path is in a git working
+    tree.
+    :return: None. Throws if exception occurs.
+    """
+    git_index = None
+    if use_git_index:
+        git_index = load_git_index(find_sample_root(path))
+    sample_paths = get_sample_paths(path, git_index)
+    jobs = jobs or os.cpu_count()
+    cache = None
+    if cache_path:
+        cache = ResultCache(cache_path, get_checker_fingerprint())
+        cache.load()
+    executor = None
+    if jobs > 1:
+        executor = concurrent.futures.ProcessPoolExecutor(max_workers=jobs)
+    try:
+        chunksize = max(1, len(sample_paths) // (jobs * 4))
+        if cache is not None:
+            key_function = functools.partial(get_input_key,
+                                             git_index=git_index)
+            results = cache.map(collect_errors, sample_paths, key_function,
+                                executor, chunksize)
+        elif executor is not None:
+            results = list(executor.map(collect_errors, sample_paths,
+                                        chunksize=chunksize))
+        else:
+            results = [collect_errors(sample_path)
+                       for sample_path in sample_paths]
+    finally:
+        if executor is not None:
+            executor.shutdown()
+    if cache is not None:
+        cache.save(prune=True)
+
     exception_count = 0
-    for root, dirs, files in os.walk(path):
-        # Get parent folder name.
-        parent_folder_name = get_folder_name_from_path(root)
-        # If parent folder name is a valid category name.
-        if parent_folder_name in categories:
-            for dir_name in dirs:
-                sample_path = os.path.join(root, dir_name)
-                # Omit empty folders - they are omitted by Git.
-                if len([f for f in os.listdir(sample_path)
-                        if not f.startswith('.DS_Store')]) == 0:
-                    continue
-                exception_count = run_check(sample_path, exception_count)
+    for errors in results:
+        for error in errors:
+            exception_count += 1
+            print(f'{exception_count}. {error}')
 
     # Throw once if there are exceptions.
     if exception_count > 0:
@@ -419,10 +640,26 @@ def main():
     parser = argparse.ArgumentParser(description=msg)
     parser.add_argument('-a', '--all', help='path to project root folder')
     parser.add_argument('-s', '--single', help='path to a sample folder')
+    parser.add_argument('-j', '--jobs', type=int, default=1,
+                        help='number of worker processes for --all; '
+                             '0 uses one per CPU')
+    parser.add_argument('--cache', nargs='?', const='', metavar='PATH',
+                        help='replay the errors of unchanged samples from a '
+                             'result cache for --all, at PATH or '
+                             '.readme_style_cache.json in the src folder')
+    parser.add_argument('--git-index', action='store_true',
+                        help='list the samples and hash their files from the '
+                             'git index for --all instead of walking the '
+                             'folders')
     args = parser.parse_args()
     if args.all:
+        # The cache is opt-in, so that CI and other one-off runs check every
+        # sample and leave no cache file behind.
+        cache_path = None
+        if args.cache is not None:
+            cache_path = args.cache or get_default_cache_path(args.all)
         try:
-            all_designs(args.all)
+            all_designs(args.all, args.jobs, cache_path, args.git_index)
         except Exception as err:
             raise err
     elif args.single:
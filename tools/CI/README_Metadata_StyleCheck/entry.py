@@ -1,46 +1,76 @@
 #!/usr/bin/env python3
 
 import os
+import sys
 import json
+import shutil
+import typing
 import argparse
 import subprocess as sp
 
-# A set of category folder names in current sample viewer.
-# Only run the checks when a file path is within one of these category folders.
-categories = {
-    'Analysis',
-    'Data',
-    'Geometry',
-    'Geoprocessing',
-    'GraphicsOverlay',
-    'Hydrography',
-    'Layers',
-    'LocalServer',
-    'Location',
-    'Map',
-    'MapView',
-    'NetworkAnalysis',
-    'Scene',
-    'SceneView',
-    'Search',
-    'Security',
-    'Symbology',
-    'UtilityNetwork'
-}
-
-
-def run_mdl(readme_path: str):
+# Modules shared between the tools live in tools/shared. In the CI container
+# this script is copied to / and the shared modules to /shared.
+sys.path.append(os.path.join(os.path.dirname(os.path.realpath(__file__)), '..', '..', 'shared'))
+sys.path.append(os.path.join(os.environ.get('GITHUB_WORKSPACE', os.getcwd()), 'tools', 'shared'))
+
+# The checkers are imported as libraries, so that every sample is checked in
+# this process instead of paying for two interpreter startups per sample.
+import README_style_checker
+import metadata_style_checker
+import markdown_lint
+from sample_tree import find_sample_root
+from dependency_index import load_dependency_index
+
+def run_mdl(readme_path: str) -> int:
+    """
+    Check a README with mdl against the rules configured in style.rb.
+
+    :param readme_path: The path to the README.
+    :return: The exit code of mdl.
+    """
     print("**** mdl ****")
-    code = sp.call(f'mdl --style /style.rb "{readme_path}"', shell=True)
-    return code
-
-
-def run_style_check(dirname: str):
+    return sp.call(['mdl', '--style', markdown_lint.get_default_style_path(),
+                    readme_path])
+
+
+def run_style_check(dirname: str, lint: bool) -> typing.List[str]:
+    """
+    Run the Python style checkers on a sample folder, in this process.
+
+    :param dirname: The path to the sample folder.
+    :param lint: Also lint the README of the sample.
+    :return: The names of the checks that failed.
+    """
+    failed = []
+    # mdl stays the linter of record where it is installed, i.e. in the CI
+    # image, until the fixtures of tools/tests/test_markdown_lint.py have been
+    # confirmed against it. Elsewhere the Python rules lint the README along
+    # with the other README checks.
+    use_mdl = lint and shutil.which('mdl') is not None
+    if use_mdl and run_mdl(os.path.join(dirname, 'readme.md')) != 0:
+        failed.append('mdl')
     print("**** README_style_checker ****")
-    code1 = sp.call(f'python3 /README_style_checker.py -s "{dirname}"', shell=True)
+    if README_style_checker.run_check(dirname, 0, lint and not use_mdl) > 0:
+        print('Error(s) occurred during checking a single design.')
+        failed.append('README_style_checker')
     print("**** metadata_style_checker ****")
-    code2 = sp.call(f'python3 /metadata_style_checker.py -s "{dirname}"', shell=True)
-    return code1 + code2
+    try:
+        metadata_style_checker.compare_one_metadata(dirname)
+    except Exception as err:
+        print(f'{err}')
+        failed.append('metadata_style_checker')
+    return failed
+
+
+def print_report(samples: typing.List[str],
+                 failures: typing.Dict[str, typing.List[str]]) -> None:
+    """
+    Print the checks that failed for each sample folder.
+    """
+    print("** Summary **")
+    print(f'Checked {len(samples)} sample(s), {len(failures)} with errors.')
+    for dir_path, failed in failures.items():
+        print(f'{dir_path} - failed: {", ".join(failed)}')
 
 
 def read_json(filenames_json_data):
@@ -60,7 +90,7 @@ def load_json_file(path: str):
 
 
 def main():
-    msg = 'Entry point of the docker to run mdl and style check scripts.'
+    msg = 'Entry point of the docker to run markdown lint and style check scripts.'
     parser = argparse.ArgumentParser(description=msg)
     parser.add_argument('-s', '--string', help='A JSON array of file paths.')
     args = parser.parse_args()
@@ -77,9 +107,17 @@ def main():
         print('Invalid arguments, abort.')
         exit(1)
 
-    return_code = 0
-    # A set of dirname strings to avoid duplicate checks on the same sample.
-    samples_set = set()
+    # Changed files are mapped to samples through the dependency index of the
+    # checked out repository, which also knows the samples using each shared
+    # file through ClassFile.
+    dependencies = load_dependency_index(find_sample_root('.'))
+
+    # The sample folders to style check, in order and without duplicates.
+    samples = []
+    # The sample folders with a changed README to lint.
+    changed_readmes = set()
+    # The names of the failed checks of each sample folder.
+    failures = {}
 
     for f in files:
         if not os.path.exists(f):
@@ -87,55 +125,60 @@ def main():
             print("file doesn't exist: " + f)
             continue
 
-        path_parts = os.path.normpath(f).split(os.path.sep)
-        if len(path_parts) < 7:
-            # A file not in samples folder, omit.
-            # E.g. might be in the root folder or other unrelated folders.
-            continue
-
-        # Only run checks on folders that is within a category.
-        if path_parts[-3] not in categories:
-            # Folder name is not a category, omit.
-            continue
-        
         # Get filename and folder name of the changed sample.
         filename = os.path.basename(f)
-        dir_path = os.path.dirname(f)
+        dir_path = dependencies.get_sample(f)
         l_name = filename.lower()
 
-        # Changed file is not a README or metadata file, omit.
-        if l_name != 'readme.md' and l_name != 'readme.metadata.json':
+        # A file not in a sample folder, omit.
+        # E.g. might be in the root folder or other unrelated folders.
+        if dir_path is None:
+            continue
+
+        # Changed file is not a README or metadata file of the sample, omit.
+        if os.path.dirname(os.path.normpath(f)) != dir_path or \
+                (l_name != 'readme.md' and l_name != 'readme.metadata.json'):
             continue
 
         # Print debug information for current sample.
-        if dir_path not in samples_set:
+        if dir_path not in samples:
             print(f'*** Checking {dir_path} ***')
+            samples.append(dir_path)
 
         # Check if the capitalization of doc filenames are correct.
         if l_name == 'readme.md' and filename != 'readme.md':
             print(f'Error: {dir_path} filename has wrong capitalization')
-            return_code += 1
+            failures.setdefault(dir_path, []).append('filename capitalization')
 
         if l_name == 'readme.metadata.json' and filename != 'readme.metadata.json':
             print(f'Error: {dir_path} filename has wrong capitalization')
-            return_code += 1
+            failures.setdefault(dir_path, []).append('filename capitalization')
 
-        # Run the markdownlint linter on README file.
+        # Lint the README file along with the other checks.
         if filename == 'readme.md':
-            # Run the linter on markdown file.
-            return_code += run_mdl(f)
-
-        # Run the other Python checks on the whole sample folder.
-        if dir_path not in samples_set:
-            samples_set.add(dir_path)
-            return_code += run_style_check(dir_path)
-
-    if return_code != 0:
-        # Non-zero code occurred during the process.
-        exit(return_code)
+            changed_readmes.add(dir_path)
+
+    # Samples with other changed files, e.g. source files and screenshots,
+    # and samples using a changed shared file through ClassFile are checked
+    # too, as their metadata may no longer match.
+    for dir_path in dependencies.get_affected_samples(files):
+        if dir_path not in samples:
+            print(f'*** Checking {dir_path} (affected by changed files) ***')
+            samples.append(dir_path)
+
+    # Run the Python checks once on each whole sample folder.
+    for dir_path in samples:
+        print(f'*** Style checking {dir_path} ***')
+        failed = run_style_check(dir_path, dir_path in changed_readmes)
+        if failed:
+            failures.setdefault(dir_path, []).extend(failed)
+
+    print_report(samples, failures)
+    if failures:
+        # Errors occurred during the process.
+        exit(1)
     else:
         exit(0)
 
-
 if __name__ == '__main__':
     main()
\ No newline at end of file
@@ -0,0 +1,963 @@
+#!/usr/bin/env python3
+
+import argparse
+import functools
+import os
+import re
+import typing
+
+# region Global patterns
+# Line breaks, as Ruby's \R matches them.
+line_break_pattern = re.compile(r'\r\n|[\n\v\f\r\x85\u2028\u2029]')
+
+# An opening or closing code fence, matched against a stripped line.
+fence_pattern = re.compile(r'^(`{3,}|~{3,})')
+
+# A list item, capturing the indentation, marker, spaces and text.
+list_item_pattern = re.compile(r'^([ \t]*)([*+-]|\d+\.)([ \t]+)(.*)$')
+
+# A horizontal rule, e.g. `***` or `- - -`.
+hr_pattern = re.compile(r'^ {0,3}([*_-])[ \t]*\1[ \t]*\1(?:\1|[ \t])*$')
+
+# The line under a setext style header, which kramdown only accepts at the
+# start of the line.
+setext_underline_pattern = re.compile(r'^(=+|-+)[ \t]*$')
+
+blockquote_pattern = re.compile(r'^ {0,3}>')
+
+# An ATX style header, capturing the pound marks and the contents.
+atx_header_pattern = re.compile(r'^(#{1,6})[ \t]*(.*)$')
+
+# A code span, capturing the backticks and the contents.
+code_span_pattern = re.compile(r'(?<!`)(`+)(?!`)(.+?)(?<!`)\1(?!`)')
+
+# A link or image, capturing the text of links.
+link_pattern = re.compile(r'(!?)\[([^\]]*)\](?:\([^)]*\)|\[[^\]]*\])')
+
+# Emphasis that kramdown parses, i.e. without spaces inside the markers.
+emphasis_pattern = re.compile(r'(\*\*|__|\*|_)(?=\S)(.+?)(?<=\S)\1')
+
+html_pattern = re.compile(r'<[^>]+>')
+
+# Whitespace as Ruby's \s matches it.
+whitespace = ' \t\r\n\f\v'
+# endregion
+
+
+class Header(typing.NamedTuple):
+    line: int
+    level: int
+    # 'atx', 'atx_closed' or 'setext'.
+    style: str
+    text: str
+
+
+class CodeBlock(typing.NamedTuple):
+    """
+    A code block. `line` is the opening fence of a fenced block and `end` the
+    last line of the block.
+    """
+    line: int
+    end: int
+    fenced: bool
+    language: str
+    content: typing.Tuple[str, ...]
+
+
+class ListItem(typing.NamedTuple):
+    line: int
+    indent: int
+    marker: str
+    spaces: int
+
+
+class Paragraph(typing.NamedTuple):
+    line: int
+    lines: typing.Tuple[str, ...]
+    top_level: bool
+
+
+class MarkdownList:
+    """
+    A bulleted or numbered list. Nested lists are separate lists.
+    """
+
+    def __init__(self, ordered: bool, top_level: bool):
+        self.ordered = ordered
+        self.top_level = top_level
+        self.items = []
+        # True if an item of the list has more than one paragraph.
+        self.multiparagraph = False
+
+
+class MarkdownDocument(typing.NamedTuple):
+    """
+    Block model of a markdown document, as mdl sees it through kramdown.
+
+    `blocks` is the sequence of top-level block types, with one 'blank' entry
+    per run of blank lines. `text_lines` are (line, text) pairs of the inline
+    text of paragraphs, list items, headers and blockquotes.
+    """
+    lines: typing.Tuple[str, ...]
+    headers: typing.Tuple[Header, ...]
+    code_blocks: typing.Tuple[CodeBlock, ...]
+    lists: typing.Tuple[MarkdownList, ...]
+    paragraphs: typing.Tuple[Paragraph, ...]
+    hrs: typing.Tuple[typing.Tuple[int, str], ...]
+    blockquote_lines: typing.Tuple[typing.Tuple[int, str], ...]
+    blocks: typing.Tuple[typing.Tuple[str, int], ...]
+    text_lines: typing.Tuple[typing.Tuple[int, str], ...]
+
+    @property
+    def code_lines(self) -> typing.Set[int]:
+        """
+        :return: The numbers of all lines in code blocks.
+        """
+        return {n for block in self.code_blocks
+                for n in range(block.line, block.end + 1)}
+
+
+class Rule(typing.NamedTuple):
+    id: str
+    description: str
+    params: typing.Dict[str, typing.Any]
+    check: typing.Callable[[MarkdownDocument, typing.Dict[str, typing.Any]],
+                           typing.Iterable[int]]
+
+
+class LintError(typing.NamedTuple):
+    line: int
+    rule: str
+    description: str
+
+    def format(self, path: str) -> str:
+        """
+        :return: The error in the format mdl prints it.
+        """
+        return f'{path}:{self.line}: {self.rule} {self.description}'
+
+
+class ListItemState:
+    """
+    An open list item while parsing, and the column its content starts at.
+    """
+
+    def __init__(self, markdown_list: MarkdownList, content_indent: int):
+        self.list = markdown_list
+        self.content_indent = content_indent
+        self.paragraphs = 0
+
+
+class MarkdownParser:
+    """
+    Line-based block parser following the kramdown rules that mdl relies on:
+    block elements start after a blank line or another block, paragraphs
+    absorb the following lines lazily, and lines indented to the text of a
+    list item belong to that item.
+    """
+
+    def __init__(self, text: str):
+        # Like mdl, keep the empty line after a trailing line break.
+        self.lines = tuple(line_break_pattern.split(text))
+        self.headers = []
+        self.code_blocks = []
+        self.lists = []
+        self.paragraphs = []
+        self.hrs = []
+        self.blockquote_lines = []
+        self.blocks = []
+        self.text_lines = []
+        # The open list items, innermost last.
+        self.items = []
+        # The first line, lines and top-level flag of the open paragraph.
+        self.paragraph = None
+        self.in_blockquote = False
+
+    def parse(self) -> MarkdownDocument:
+        index = 0
+        while index < len(self.lines):
+            index = self.parse_line(index)
+        self.end_paragraph()
+        return MarkdownDocument(
+            self.lines, tuple(self.headers), tuple(self.code_blocks),
+            tuple(self.lists), tuple(self.paragraphs), tuple(self.hrs),
+            tuple(self.blockquote_lines), tuple(self.blocks),
+            tuple(self.text_lines))
+
+    def parse_line(self, index: int) -> int:
+        """
+        Parse the line at the index and any following lines of the same block.
+
+        :return: The index of the next line to parse.
+        """
+        line = self.lines[index]
+        if not line.strip():
+            self.end_paragraph()
+            self.in_blockquote = False
+            if not self.blocks or self.blocks[-1][0] != 'blank':
+                self.blocks.append(('blank', index + 1))
+            return index + 1
+        if self.in_blockquote:
+            # Blockquotes continue lazily up to a blank line.
+            self.add_blockquote_line(index)
+            return index + 1
+        expanded = line.expandtabs(4)
+        indent = len(expanded) - len(expanded.lstrip())
+        if self.items:
+            next_index = self.parse_list_line(index, expanded, indent)
+            if next_index is not None:
+                return next_index
+        if self.paragraph is not None:
+            self.continue_paragraph(index)
+            return index + 1
+        return self.parse_block(index, expanded, indent, 0)
+
+    def parse_list_line(self, index: int, expanded: str,
+                        indent: int) -> typing.Optional[int]:
+        """
+        Parse a line following a list item, from the outermost list inwards.
+
+        :return: The index of the next line to parse, or None if the line
+        ends all open lists.
+        """
+        item_match = list_item_pattern.match(expanded)
+        if hr_pattern.match(expanded):
+            item_match = None
+        for depth, item in enumerate(self.items):
+            if indent >= item.content_indent:
+                # Content of the item; check the lists nested in it.
+                continue
+            base = self.items[depth - 1].content_indent if depth else 0
+            if item_match and indent - base <= 3 and \
+                    item.list.ordered == item_match.group(2)[0].isdigit():
+                # The next item of the list at this depth.
+                del self.items[depth:]
+                self.add_list_item(index, item_match, indent, item.list)
+                return index + 1
+            if self.paragraph is not None:
+                self.continue_paragraph(index)
+                return index + 1
+            # The list at this depth ends.
+            del self.items[depth:]
+            if depth == 0:
+                return None
+            return self.parse_block(index, expanded, indent, base)
+
+        # Content of the innermost item.
+        item = self.items[-1]
+        if self.paragraph is None and indent - item.content_indent >= 4:
+            return self.parse_indented_code(index, item.content_indent + 4)
+        if item_match:
+            self.end_paragraph()
+            self.add_list_item(index, item_match, indent,
+                               self.start_list(item_match, False))
+            return index + 1
+        if self.paragraph is not None:
+            self.continue_paragraph(index)
+            return index + 1
+        return self.parse_block(index, expanded, indent, item.content_indent)
+
+    def parse_block(self, index: int, expanded: str, indent: int,
+                    base: int) -> int:
+        """
+        Parse a line that starts a new block.
+
+        :param base: The column the content of the enclosing list item starts
+        at, or 0 at the top level.
+        :return: The index of the next line to parse.
+        """
+        line = self.lines[index]
+        stripped = line.strip()
+        top_level = not self.items
+        if indent - base >= 4:
+            return self.parse_indented_code(index, base + 4)
+        if fence_pattern.match(stripped):
+            return self.parse_fenced_code(index, top_level)
+        if top_level:
+            if blockquote_pattern.match(expanded):
+                self.blocks.append(('blockquote', index + 1))
+                self.in_blockquote = True
+                self.add_blockquote_line(index)
+                return index + 1
+            if line.startswith('#'):
+                self.add_atx_header(index)
+                return index + 1
+            if hr_pattern.match(expanded):
+                self.blocks.append(('hr', index + 1))
+                self.hrs.append((index + 1, stripped))
+                return index + 1
+            if index + 1 < len(self.lines) and indent <= 3 and \
+                    setext_underline_pattern.match(self.lines[index + 1]):
+                self.blocks.append(('header', index + 1))
+                level = 1 if self.lines[index + 1].strip()[0] == '=' else 2
+                self.headers.append(Header(index + 1, level, 'setext',
+                                           stripped))
+                self.text_lines.append((index + 1, stripped))
+                return index + 2
+        item_match = list_item_pattern.match(expanded)
+        if item_match and not hr_pattern.match(expanded):
+            if top_level:
+                self.blocks.append(('list', index + 1))
+            self.add_list_item(index, item_match, indent,
+                               self.start_list(item_match, top_level))
+            return index + 1
+        if top_level:
+            self.blocks.append(('p', index + 1))
+        self.start_paragraph(index, stripped, top_level)
+        return index + 1
+
+    def parse_fenced_code(self, index: int, top_level: bool) -> int:
+        fence = fence_pattern.match(self.lines[index].strip()).group(1)
+        language = self.lines[index].strip()[len(fence):].strip()
+        end = index + 1
+        while end < len(self.lines):
+            match = fence_pattern.match(self.lines[end].strip())
+            if match and match.group(1)[:len(fence)] == fence:
+                break
+            end += 1
+        last = min(end, len(self.lines) - 1)
+        self.code_blocks.append(CodeBlock(
+            index + 1, last + 1, True, language,
+            self.lines[index + 1:end]))
+        if top_level:
+            self.blocks.append(('codeblock', index + 1))
+        return last + 1
+
+    def parse_indented_code(self, index: int, code_indent: int) -> int:
+        """
+        Parse an indented code block.
+
+        :param code_indent: The column the code is indented to.
+        """
+        end = index
+        last = index
+        while end < len(self.lines):
+            line = self.lines[end].expandtabs(4)
+            if line.strip():
+                if len(line) - len(line.lstrip()) < code_indent:
+                    break
+                last = end
+            end += 1
+        self.code_blocks.append(CodeBlock(
+            index + 1, last + 1, False, '', self.lines[index:last + 1]))
+        if not self.items:
+            self.blocks.append(('codeblock', index + 1))
+        return last + 1
+
+    def add_atx_header(self, index: int) -> None:
+        line = self.lines[index]
+        match = atx_header_pattern.match(line)
+        contents = match.group(2).strip()
+        style = 'atx'
+        if line.strip().endswith('#'):
+            style = 'atx_closed'
+            contents = re.sub(r'(?<!\\)#+$', '', contents).strip()
+        self.blocks.append(('header', index + 1))
+        self.headers.append(Header(index + 1, len(match.group(1)), style,
+                                   contents))
+        self.text_lines.append((index + 1, contents))
+
+    def add_blockquote_line(self, index: int) -> None:
+        line = self.lines[index]
+        self.blockquote_lines.append((index + 1, line))
+        self.text_lines.append((index + 1, re.sub(r'^\s*>', '', line)))
+
+    def start_list(self, item_match: typing.Match,
+                   top_level: bool) -> MarkdownList:
+        markdown_list = MarkdownList(item_match.group(2)[0].isdigit(),
+                                     top_level)
+        self.lists.append(markdown_list)
+        return markdown_list
+
+    def add_list_item(self, index: int, item_match: typing.Match, indent: int,
+                      markdown_list: MarkdownList) -> None:
+        self.end_paragraph()
+        marker = item_match.group(2)
+        spaces = len(item_match.group(3))
+        markdown_list.items.append(ListItem(index + 1, indent, marker, spaces))
+        self.items.append(ListItemState(markdown_list,
+                                        indent + len(marker) + spaces))
+        if item_match.group(4).strip():
+            self.start_paragraph(index, item_match.group(4), False)
+
+    def start_paragraph(self, index: int, text: str, top_level: bool) -> None:
+        if self.items:
+            item = self.items[-1]
+            item.paragraphs += 1
+            if item.paragraphs > 1:
+                item.list.multiparagraph = True
+        self.paragraph = (index + 1, [self.lines[index]], top_level)
+        self.text_lines.append((index + 1, text))
+
+    def continue_paragraph(self, index: int) -> None:
+        self.paragraph[1].append(self.lines[index])
+        self.text_lines.append((index + 1, self.lines[index]))
+
+    def end_paragraph(self) -> None:
+        if self.paragraph is not None:
+            line, lines, top_level = self.paragraph
+            self.paragraphs.append(Paragraph(line, tuple(lines), top_level))
+            self.paragraph = None
+
+
+# region Static functions
+@functools.lru_cache(maxsize=4096)
+def parse_markdown(text: str) -> MarkdownDocument:
+    """
+    Parse markdown into its block model. Results are cached, like the README
+    section model.
+
+    :param text: The markdown text. A leading byte order mark is ignored.
+    :return: The parsed document.
+    """
+    return MarkdownParser(text.lstrip('\ufeff')).parse()
+
+
+def get_inline_text(text: str) -> str:
+    """
+    :return: The plain text kramdown leaves in text elements, i.e. without
+    code spans, links, HTML and emphasis markers.
+    """
+    text = code_span_pattern.sub('', text)
+    text = link_pattern.sub('', text)
+    text = html_pattern.sub('', text)
+    return emphasis_pattern.sub(r'\2', text)
+
+
+def matching_text_lines(doc: MarkdownDocument,
+                        pattern: typing.Pattern) -> typing.List[int]:
+    return [line for line, text in doc.text_lines
+            if pattern.search(get_inline_text(text))]
+
+
+def is_empty(line: typing.Optional[str]) -> bool:
+    return line is not None and line == ''
+# endregion
+
+
+# region Rules
+# The rules mdl implements, with their default parameters, keyed by ID.
+rules = {}
+
+
+def rule(rule_id: str, description: str, **params):
+    """
+    Register a check as the implementation of an mdl rule. The check returns
+    the line numbers of the errors.
+    """
+    def register(check):
+        rules[rule_id] = Rule(rule_id, description, params, check)
+        return check
+    return register
+
+
+@rule('MD001', 'Header levels should only increment by one level at a time')
+def check_header_increment(doc, params):
+    errors = []
+    for previous, header in zip(doc.headers, doc.headers[1:]):
+        if header.level > previous.level + 1:
+            errors.append(header.line)
+    return errors
+
+
+@rule('MD002', 'First header should be a top level header', level=1)
+def check_first_header_level(doc, params):
+    if doc.headers and doc.headers[0].level != params['level']:
+        return [doc.headers[0].line]
+    return []
+
+
+@rule('MD003', 'Header style', style='consistent')
+def check_header_style(doc, params):
+    if not doc.headers:
+        return []
+    style = params['style']
+    if style == 'consistent':
+        style = doc.headers[0].style
+    if style.startswith('setext_with_'):
+        atx_style = style[len('setext_with_'):]
+        return [h.line for h in doc.headers
+                if h.style != ('setext' if h.level <= 2 else atx_style)]
+    return [h.line for h in doc.headers if h.style != style]
+
+
+@rule('MD004', 'Unordered list style', style='consistent')
+def check_list_style(doc, params):
+    styles = {'*': 'asterisk', '+': 'plus', '-': 'dash'}
+    items = [item for markdown_list in doc.lists
+             if not markdown_list.ordered for item in markdown_list.items]
+    if not items:
+        return []
+    style = params['style']
+    if style in ('consistent', 'sublist'):
+        style = styles[items[0].marker]
+    return [item.line for item in items if styles[item.marker] != style]
+
+
+@rule('MD005', 'Inconsistent indentation for list items at the same level')
+def check_list_indent(doc, params):
+    errors = []
+    for markdown_list in doc.lists:
+        first = markdown_list.items[0]
+        for item in markdown_list.items[1:]:
+            # Numbers may also be right-aligned.
+            if item.indent != first.indent and not (
+                    markdown_list.ordered and item.indent + len(item.marker) ==
+                    first.indent + len(first.marker)):
+                errors.append(item.line)
+    return errors
+
+
+@rule('MD006', 'Consider starting bulleted lists at the beginning of the line')
+def check_list_start(doc, params):
+    return [markdown_list.items[0].line for markdown_list in doc.lists
+            if markdown_list.top_level and not markdown_list.ordered
+            and markdown_list.items[0].indent != 0]
+
+
+@rule('MD009', 'Trailing spaces', br_spaces=0)
+def check_trailing_spaces(doc, params):
+    line_break = re.compile(rf'\S[{whitespace}]{{{params["br_spaces"]}}}$')
+    return [n for n, line in enumerate(doc.lines, 1)
+            if line and line[-1] in whitespace and not (
+                params['br_spaces'] > 1 and line_break.search(line))]
+
+
+@rule('MD010', 'Hard tabs')
+def check_hard_tabs(doc, params):
+    return [n for n, line in enumerate(doc.lines, 1) if '\t' in line]
+
+
+@rule('MD011', 'Reversed link syntax')
+def check_reversed_links(doc, params):
+    return matching_text_lines(doc, re.compile(r'\([^)]+\)\[[^\]]+\]'))
+
+
+@rule('MD012', 'Multiple consecutive blank lines')
+def check_blank_lines(doc, params):
+    errors = []
+    code_lines = doc.code_lines
+    for n, line in enumerate(doc.lines[1:], 2):
+        if not line.strip(whitespace) and not doc.lines[n - 2].strip(whitespace) \
+                and n not in code_lines:
+            errors.append(n)
+    return errors
+
+
+@rule('MD014', 'Dollar signs used before commands without showing output')
+def check_dollar_signs(doc, params):
+    errors = []
+    for block in doc.code_blocks:
+        lines = [line for line in block.content if line.strip()]
+        if lines and all(re.match(r'^\s*\$\s', line) for line in lines):
+            errors.append(block.line)
+    return errors
+
+
+@rule('MD018', 'No space after hash on atx style header')
+def check_atx_missing_space(doc, params):
+    return [h.line for h in doc.headers if h.style == 'atx'
+            and re.match(r'^#+[^#\s]', doc.lines[h.line - 1])]
+
+
+@rule('MD019', 'Multiple spaces after hash on atx style header')
+def check_atx_multiple_spaces(doc, params):
+    return [h.line for h in doc.headers if h.style == 'atx'
+            and re.match(r'^#+\s\s', doc.lines[h.line - 1])]
+
+
+@rule('MD020', 'No space inside hashes on closed atx style header')
+def check_closed_atx_missing_space(doc, params):
+    return [h.line for h in doc.headers if h.style == 'atx_closed' and (
+        re.match(r'^#+[^#\s]', doc.lines[h.line - 1]) or
+        re.search(r'[^#\s\\]#+$', doc.lines[h.line - 1]))]
+
+
+@rule('MD021', 'Multiple spaces inside hashes on closed atx style header')
+def check_closed_atx_multiple_spaces(doc, params):
+    return [h.line for h in doc.headers if h.style == 'atx_closed' and (
+        re.match(r'^#+\s\s', doc.lines[h.line - 1]) or
+        re.search(r'\s\s#+$', doc.lines[h.line - 1]))]
+
+
+@rule('MD022', 'Headers should be surrounded by blank lines')
+def check_header_blank_lines(doc, params):
+    errors = []
+    for header in doc.headers:
+        previous = doc.lines[header.line - 2] if header.line > 1 else None
+        next_index = header.line + 1 if header.style == 'setext' \
+            else header.line
+        following = doc.lines[next_index] if next_index < len(doc.lines) \
+            else None
+        if (previous is not None and previous != '') or \
+                (following is not None and following != ''):
+            errors.append(header.line)
+    # A header without a blank line before it is part of a paragraph. Like
+    # kramdown, strip the whitespace at the start of the paragraph.
+    for paragraph in doc.paragraphs:
+        if paragraph.top_level:
+            errors += [paragraph.line + i for i, line
+                       in enumerate(paragraph.lines)
+                       if (line if i else line.lstrip()).startswith('#')]
+    return errors
+
+
+@rule('MD023', 'Headers must start at the beginning of the line')
+def check_header_indent(doc, params):
+    errors = [h.line for h in doc.headers
+              if re.match(r'^\s', doc.lines[h.line - 1])]
+    # Indented headers are parsed as paragraphs. mdl checks the lines of the
+    # paragraph as written, and reports an indented setext header at its text.
+    for paragraph in doc.paragraphs:
+        if not paragraph.top_level:
+            continue
+        for i, line in enumerate(paragraph.lines):
+            if re.match(r'^\s+#', line):
+                errors.append(paragraph.line + i)
+            elif i and re.match(r'^\s+(-+|=+)\s*$', line) and \
+                    paragraph.lines[i - 1] != '':
+                errors.append(paragraph.line + i - 1)
+    return errors
+
+
+@rule('MD024', 'Multiple headers with the same content',
+      allow_different_nesting=False)
+def check_duplicate_headers(doc, params):
+    errors = []
+    seen = set()
+    for header in doc.headers:
+        key = (header.text, header.level) \
+            if params['allow_different_nesting'] else header.text
+        if key in seen:
+            errors.append(header.line)
+        seen.add(key)
+    return errors
+
+
+@rule('MD025', 'Multiple top level headers in the same document', level=1)
+def check_multiple_top_headers(doc, params):
+    headers = [h for h in doc.headers if h.level == params['level']]
+    if headers and headers[0].line == 1:
+        return [h.line for h in headers[1:]]
+    return []
+
+
+@rule('MD026', 'Trailing punctuation in header', punctuation='.,;:!?')
+def check_header_punctuation(doc, params):
+    return [h.line for h in doc.headers
+            if h.text and h.text[-1] in params['punctuation']]
+
+
+@rule('MD027', 'Multiple spaces after blockquote symbol')
+def check_blockquote_spaces(doc, params):
+    return [n for n, line in doc.blockquote_lines
+            if re.match(r'^\s*>\s{2,}\S', line)]
+
+
+@rule('MD028', 'Blank line inside blockquote')
+def check_blockquote_blank_lines(doc, params):
+    return [third[1] - 1 for first, second, third
+            in zip(doc.blocks, doc.blocks[1:], doc.blocks[2:])
+            if (first[0], second[0], third[0]) ==
+            ('blockquote', 'blank', 'blockquote')]
+
+
+@rule('MD029', 'Ordered list item prefix', style='one')
+def check_ordered_prefix(doc, params):
+    errors = []
+    for markdown_list in doc.lists:
+        if not markdown_list.ordered:
+            continue
+        for index, item in enumerate(markdown_list.items):
+            number = index + 1 if params['style'] == 'ordered' else 1
+            if not doc.lines[item.line - 1].strip().startswith(f'{number}. '):
+                errors.append(item.line)
+    return errors
+
+
+@rule('MD030', 'Spaces after list markers',
+      ul_single=1, ol_single=1, ul_multi=1, ol_multi=1)
+def check_list_marker_spaces(doc, params):
+    errors = []
+    for markdown_list in doc.lists:
+        list_type = 'ol' if markdown_list.ordered else 'ul'
+        size = 'multi' if markdown_list.multiparagraph else 'single'
+        required = params[f'{list_type}_{size}']
+        errors += [item.line for item in markdown_list.items
+                   if item.spaces != required]
+    return errors
+
+
+@rule('MD031', 'Fenced code blocks should be surrounded by blank lines')
+def check_fence_blank_lines(doc, params):
+    # Examine the lines directly, like mdl, as fences without surrounding
+    # blank lines may not be parsed as code blocks.
+    errors = []
+    in_code = False
+    fence = None
+    lines = [''] + list(doc.lines) + ['']
+    for n, line in enumerate(lines):
+        match = fence_pattern.match(line.strip())
+        if not match or (in_code and match.group(1)[:len(fence)] != fence):
+            continue
+        fence = None if in_code else match.group(1)
+        in_code = not in_code
+        if (in_code and lines[n - 1] != '') or \
+                (not in_code and lines[n + 1] != ''):
+            errors.append(n)
+    return errors
+
+
+@rule('MD032', 'Lists should be surrounded by blank lines')
+def check_list_blank_lines(doc, params):
+    errors = []
+    in_code = False
+    in_list = False
+    previous = ''
+    for n, line in enumerate(doc.lines):
+        if line.strip() == '{:toc}':
+            continue
+        if not in_code:
+            marker = re.match(r'^([*+\-]|(\d+\.))\s', line.strip())
+            if marker and not in_list and not re.match(r'^($|\s)', previous):
+                errors.append(n + 1)
+            elif not marker and in_list and not re.match(r'^($|\s)', line):
+                errors.append(n)
+            in_list = bool(marker)
+        if line.startswith('```'):
+            in_code = not in_code
+        previous = line
+    return sorted(set(errors))
+
+
+@rule('MD035', 'Horizontal rule style', style='consistent')
+def check_hr_style(doc, params):
+    if not doc.hrs:
+        return []
+    style = doc.hrs[0][1] if params['style'] == 'consistent' \
+        else params['style']
+    return [n for n, text in doc.hrs if text != style]
+
+
+@rule('MD036', 'Emphasis used instead of a header', punctuation='.,;:!?')
+def check_emphasis_header(doc, params):
+    errors = []
+    for paragraph in doc.paragraphs:
+        if not paragraph.top_level or len(paragraph.lines) > 1:
+            continue
+        match = re.match(r'^(\*\*|__|\*|_)(.+)\1$', paragraph.lines[0].strip())
+        if match and match.group(1)[0] not in match.group(2) and \
+                match.group(2)[-1] not in params['punctuation']:
+            errors.append(paragraph.line)
+    return errors
+
+
+@rule('MD037', 'Spaces inside emphasis markers')
+def check_emphasis_spaces(doc, params):
+    return sorted(set(
+        matching_text_lines(doc, re.compile(r'\s(\*\*?|__?)\s.+\1')) +
+        matching_text_lines(doc, re.compile(r'(\*\*?|__?).+\s\1\s'))))
+
+
+@rule('MD038', 'Spaces inside code span elements')
+def check_code_span_spaces(doc, params):
+    errors = []
+    for line, text in doc.text_lines:
+        for match in code_span_pattern.finditer(text):
+            code = match.group(2)
+            if code != code.strip() and code.strip() and \
+                    not code.strip().startswith('`') and \
+                    not code.strip().endswith('`'):
+                errors.append(line)
+                break
+    return errors
+
+
+@rule('MD039', 'Spaces inside link text')
+def check_link_spaces(doc, params):
+    errors = []
+    for line, text in doc.text_lines:
+        for match in link_pattern.finditer(code_span_pattern.sub('', text)):
+            if not match.group(1) and match.group(2) and (
+                    match.group(2)[0] == ' ' or match.group(2)[-1] == ' '):
+                errors.append(line)
+                break
+    return errors
+
+
+@rule('MD040', 'Fenced code blocks should have a language specified')
+def check_fence_language(doc, params):
+    return [block.line for block in doc.code_blocks
+            if block.fenced and not block.language]
+
+
+@rule('MD041', 'First line in file should be a top level header', level=1)
+def check_first_line_header(doc, params):
+    if not doc.headers or doc.headers[0].line != 1 or \
+            doc.headers[0].level != params['level']:
+        return [1]
+    return []
+
+
+@rule('MD046', 'Code block style', style='fenced')
+def check_code_block_style(doc, params):
+    if not doc.code_blocks:
+        return []
+    fenced = params['style'] == 'fenced'
+    if params['style'] == 'consistent':
+        fenced = doc.code_blocks[0].fenced
+    return [block.line for block in doc.code_blocks if block.fenced != fenced]
+
+
+@rule('MD047', 'File should end with a single newline character')
+def check_trailing_newline(doc, params):
+    if doc.lines[-1] != '':
+        return [len(doc.lines)]
+    return []
+# endregion
+
+
+# region Style files
+style_rule_pattern = re.compile(r"""^rule\s+['"](MD\d{3})['"]\s*,?\s*(.*)$""")
+style_exclude_pattern = re.compile(r"""^exclude_rule\s+['"](MD\d{3})['"]$""")
+style_param_pattern = re.compile(
+    r""":(\w+)\s*=>\s*(:\w+|-?\d+|'[^']*'|"[^"]*"|true|false)""")
+
+
+def parse_style_value(value: str) -> typing.Any:
+    if value.startswith(':'):
+        return value[1:]
+    if value in ('true', 'false'):
+        return value == 'true'
+    if value[0] in '\'"':
+        return value[1:-1]
+    return int(value)
+
+
+def load_style(path: str) -> typing.Dict[str, typing.Dict[str, typing.Any]]:
+    """
+    Read an mdl style file, e.g. style.rb. Supports `all`, `rule` with
+    parameters and `exclude_rule`.
+
+    :param path: The path to the style file.
+    :return: The parameters of each enabled rule, keyed by rule ID. Throws if
+    the style uses a statement or rule this engine doesn't support.
+    """
+    style = {}
+    with open(path, 'r') as style_file:
+        for line in style_file:
+            statement = re.sub(r'#.*$', '', line).strip()
+            if not statement:
+                continue
+            if statement == 'all':
+                for rule_id, implemented in rules.items():
+                    style[rule_id] = dict(implemented.params)
+                continue
+            match = style_rule_pattern.match(statement)
+            if match:
+                rule_id = match.group(1)
+                if rule_id not in rules:
+                    raise ValueError(f'Unsupported rule "{rule_id}" in {path}')
+                params = dict(rules[rule_id].params)
+                for name, value in style_param_pattern.findall(match.group(2)):
+                    params[name] = parse_style_value(value)
+                style[rule_id] = params
+                continue
+            match = style_exclude_pattern.match(statement)
+            if match:
+                style.pop(match.group(1), None)
+                continue
+            raise ValueError(f'Unsupported statement "{statement}" in {path}')
+    return style
+
+
+@functools.lru_cache(maxsize=None)
+def get_style(path: str) -> typing.Dict[str, typing.Dict[str, typing.Any]]:
+    """
+    :return: The style file at the path, loaded once per process.
+    """
+    return load_style(path)
+
+
+def get_default_style_path() -> str:
+    return os.path.join(os.path.dirname(os.path.realpath(__file__)),
+                        'style.rb')
+# endregion
+
+
+# region Main wrapper functions
+def lint(text: str, style: typing.Dict[str, typing.Dict[str, typing.Any]]) \
+        -> typing.List[LintError]:
+    """
+    Check markdown against the rules of a style.
+
+    :param text: The markdown text.
+    :param style: The enabled rules and their parameters, from load_style.
+    :return: The errors, ordered by rule and then line, as mdl reports them.
+    """
+    doc = parse_markdown(text)
+    errors = []
+    for rule_id in sorted(style):
+        implemented = rules[rule_id]
+        lines = implemented.check(doc, style[rule_id])
+        errors += [LintError(line, rule_id, implemented.description)
+                   for line in sorted(set(lines))]
+    return errors
+
+
+def lint_file(path: str,
+              style: typing.Dict[str, typing.Dict[str, typing.Any]]) \
+        -> typing.List[LintError]:
+    """
+    Read a markdown file and check it. The READMEs of samples are linted by
+    README_style_checker instead, along with its other rules.
+
+    :param path: The path to the markdown file.
+    :param style: The enabled rules and their parameters, from load_style.
+    :return: The errors. Throws if the file can't be read.
+    """
+    with open(path, 'r') as markdown_file:
+        return lint(markdown_file.read(), style)
+
+
+def get_markdown_paths(path: str) -> typing.List[str]:
+    """
+    :return: The path if it is a file, or all markdown files under it.
+    """
+    if not os.path.isdir(path):
+        return [path]
+    paths = []
+    for root, dirs, files in os.walk(path):
+        dirs.sort()
+        paths += [os.path.join(root, f) for f in sorted(files)
+                  if f.endswith(('.md', '.markdown'))]
+    return paths
+
+
+def main():
+    msg = 'Markdown lint script implementing the mdl rules of a style file. ' \
+          'Run it against README files or folders of them. ' \
+          'On success: Script will exit with zero. ' \
+          'On failure: Errors will print to console in the mdl format and ' \
+          'the script will exit with non-zero code.'
+    parser = argparse.ArgumentParser(description=msg)
+    parser.add_argument('paths', nargs='+', help='markdown files or folders')
+    parser.add_argument('-s', '--style', default=get_default_style_path(),
+                        help='path to the mdl style file')
+    args = parser.parse_args()
+    style = get_style(args.style)
+    error_count = 0
+    for path in args.paths:
+        for markdown_path in get_markdown_paths(path):
+            for error in lint_file(markdown_path, style):
+                error_count += 1
+                print(error.format(markdown_path))
+    if error_count > 0:
+        print('\nA detailed description of the rules is available at '
+              'https://github.com/markdownlint/markdownlint/blob/main/docs/RULES.md')
+        exit(1)
+# endregion
+
+
+if __name__ == '__main__':
+    main()
@@ -1,36 +1,26 @@
 #!/usr/bin/env python3
 
+import io
 import os
 import re
+import sys
 import json
 import typing
 import argparse
-
-
-# region Global sets
-# A set of category folder names in current sample viewer.
-categories = {
-    'Analysis',
-    'Data',
-    'Geometry',
-    'Geoprocessing',
-    'GraphicsOverlay',
-    'Hydrography',
-    'Layers',
-    'LocalServer',
-    'Location',
-    'Map',
-    'MapView',
-    'NetworkAnalysis',
-    'Scene',
-    'SceneView',
-    'Search',
-    'Security',
-    'Symbology',
-    'UtilityNetwork'
-}
-
-# endregion
+import contextlib
+import concurrent.futures
+import functools
+
+# Modules shared between the tools live in tools/shared. In the CI container
+# this script is copied to / and the repository is mounted at GITHUB_WORKSPACE.
+sys.path.append(os.path.join(os.path.dirname(os.path.realpath(__file__)), '..', '..', 'shared'))
+sys.path.append(os.path.join(os.environ.get('GITHUB_WORKSPACE', os.getcwd()), 'tools', 'shared'))
+from readme_parser import ReadmeDocument, load_readme
+from sample_folder import get_sample_folder
+from sample_tree import find_sample_root, iter_samples
+from attribute_scanner import get_class_file_snippets, scan_file
+from result_cache import InputHasher, ResultCache, get_fingerprint
+from git_index import GitIndex, load_git_index
 
 
 # region Static functions
@@ -46,19 +36,16 @@ def sub_special_char(string: str) -> str:
     return re.sub(regex, '', string)
 
 
-def parse_head(head_string: str) -> (str, str):
+def parse_head(readme: ReadmeDocument) -> (str, str):
     """
-    Parse the `Title` section of README file and get the title and description.
+    Get the title and description from the `Title` section of README file.
 
-    :param head_string: A string containing title, description and images.
+    :param readme: The parsed README.
     :return: Stripped title and description strings.
     """
-    parts = list(filter(bool, head_string.splitlines()))
-    if len(parts) < 3:
+    if readme.image is None:
         raise Exception('README description parse failure!')
-    title = parts[0].lstrip('# ').rstrip()
-    description = parts[1].strip()
-    return title, description
+    return readme.title, readme.description
 
 
 def parse_apis(apis_string: str) -> typing.List[str]:
@@ -139,35 +126,21 @@ class MetadataCreator:
         """
         results = []
         additionalFiles = []
-        for file in os.listdir(self.folder_path):
-            if os.path.splitext(file)[1] in ['.xaml', '.cs']:
-                results.append(file)
-                results.sort(reverse=True)
-            
+        folder = get_sample_folder(self.folder_path)
+        for file in folder.files('.xaml', '.cs'):
+            results.append(file)
+            results.sort(reverse=True)
+
             if os.path.splitext(file)[1] in ['.cs']:
-                class_contents = ""
                 try:
-                    class_file = open(os.path.join(self.folder_path, file), "r")
-                    class_contents = class_file.readlines()
-                    class_file.close()
+                    # Check the attributes for any additional files such as helpers or converters.
+                    attributes = scan_file(os.path.join(self.folder_path, file))
                 except Exception as err:
                     print(f"Error populating metadata from sample - {file} - {err}")
                     return
-                # Loop through lines in the class file to check for any additional files such as helpers or converters.
-                for line in class_contents:
-                    if "ArcGIS.Samples.Shared.Attributes.ClassFile" in line:
-                        additional_file_paths = re.findall("\"([a-zA-Z0-9.\\\/]*)\"", line)
-                        # We are only interested in adding files that are not contained within the same folder as our class files as these are
-                        # added in `populate_snippets_from_folder`. Here we check for \\ and / characters in the file path and then reconstruct the path
-                        # as required.
-                        for additional_file_path in additional_file_paths:
-                            if "\\" in additional_file_path:
-                                additional_file_path_string = str(additional_file_path)
-                                corrected_path = additional_file_path_string.replace("\\\\", "/")
-                                additionalFiles.append("../../../" + corrected_path)
-                            elif "/" in additional_file_path:
-                                additionalFiles.append("../../../" + additional_file_path)
-                        break
+                # We are only interested in adding files that are not contained within the same folder as our class files as these are
+                # added in `populate_snippets_from_folder`.
+                additionalFiles.extend(get_class_file_snippets(attributes.class_files))
 
         additionalFiles.sort()
         for additionalFile in additionalFiles:
@@ -184,10 +157,7 @@ class MetadataCreator:
 
         :return: A list of image filenames.
         """
-        results = []
-        for file in os.listdir(self.folder_path):
-            if os.path.splitext(file)[1].lower() in ['.jpg']:
-                results.append(file)
+        results = get_sample_folder(self.folder_path).files('.jpg', ignore_case=True)
         if not results:
             raise Exception('Unable to get images paths.')
         return sorted(results)
@@ -202,30 +172,21 @@ class MetadataCreator:
         self.formal_name = pathparts[-2]
 
         try:
-            readme_file = open(self.readme_path, 'r')
-            # read the readme content into a string
-            readme_contents = readme_file.read()
+            # The shared parser splits the README by exactly 2 pound marks, so
+            # that they are separated into paragraphs.
+            readme = load_readme(self.readme_path)
         except Exception as err:
             print(f"Error reading README - {self.readme_path} - {err}.")
             raise err
-        else:
-            readme_file.close()
 
-        # Use regex to split the README by exactly 2 pound marks, so that they
-        # are separated into paragraphs.
-        pattern = re.compile(r'^#{2}(?!#)\s(.*)', re.MULTILINE)
-        readme_parts = re.split(pattern, readme_contents)
         try:
-            api_section_index = readme_parts.index('Relevant API') + 1
-            tags_section_index = readme_parts.index('Tags') + 1
-            self.title, self.description = parse_head(readme_parts[0])
-            self.relevant_apis = parse_apis(readme_parts[api_section_index])
-            keywords = parse_tags(readme_parts[tags_section_index])
+            self.title, self.description = parse_head(readme)
+            self.relevant_apis = parse_apis(readme.section('Relevant API'))
+            keywords = parse_tags(readme.section('Tags'))
             # De-duplicate API names in README's Tags section.
             self.keywords = [w for w in keywords if w not in self.relevant_apis]
-            if readme_parts.__contains__('Offline data'):
-                offline_data_section_index = readme_parts.index('Offline data') + 1
-                self.offline_data = parse_offline_data(readme_parts[offline_data_section_index])
+            if readme.has_section('Offline data'):
+                self.offline_data = parse_offline_data(readme.section('Offline data'))
 
         except Exception as err:
             print(f'Error parsing README - {self.readme_path} - {err}.')
@@ -318,30 +279,161 @@ def compare_one_metadata(folder_path: str):
         raise Exception(f'Error inconsistent metadata - {folder_path}')
 
 
-def all_samples(path: str):
+class SampleResult(typing.NamedTuple):
+    """
+    The result of checking the metadata of one sample.
     """
-    Run the check on all samples.
+    path: str
+    output: str
+    error: typing.Optional[str]
+
+
+def check_sample(folder_path: str) -> SampleResult:
+    """
+    Run compare_one_metadata with its output captured, so that results from
+    worker processes can be printed in order.
+
+    :param folder_path: The path to the sample folder.
+    :return: The result.
+    """
+    output = io.StringIO()
+    error = None
+    with contextlib.redirect_stdout(output):
+        try:
+            compare_one_metadata(folder_path)
+        except Exception as err:
+            error = str(err)
+    return SampleResult(folder_path, output.getvalue(), error)
+
+
+def get_sample_paths(path: str,
+                     git_index: typing.Optional[GitIndex] = None) \
+        -> typing.List[str]:
+    """
+    Find the sample folders of every platform.
+
+    :param path: The path to the samples repo root, or to its src folder.
+    :param git_index: The git index of the samples path. If given, the
+    samples are listed from the index instead of the folders.
+    :return: The paths to the sample folders, sorted.
+    """
+    sample_root = find_sample_root(path)
+    if git_index is not None:
+        return sorted(sample.path
+                      for sample in git_index.iter_samples(sample_root))
+    sample_paths = []
+    for sample in iter_samples(sample_root):
+        # Omit empty folders - they are omitted by Git.
+        if get_sample_folder(sample.path).is_empty():
+            continue
+        sample_paths.append(sample.path)
+    return sorted(sample_paths)
+
+
+def get_input_key(folder_path: str,
+                  git_index: typing.Optional[GitIndex] = None) -> str:
+    """
+    Hash everything compare_one_metadata reads for a sample: the folder path,
+    the README, the existing json, the names of the source files and images,
+    and the contents of the .cs files, which list the class files.
+
+    :param folder_path: The path to the sample folder.
+    :param git_index: The git index to take the hashes of unchanged files
+    from, if any.
+    :return: The cache key of the sample.
+    """
+    hasher = InputHasher(git_index)
+    hasher.add_string(folder_path)
+    hasher.add_file(os.path.join(folder_path, 'readme.md'))
+    hasher.add_file(os.path.join(folder_path, 'readme.metadata.json'))
+    folder = get_sample_folder(folder_path)
+    for file in sorted(folder.files('.jpg', ignore_case=True)):
+        hasher.add_string(file)
+    for file in sorted(folder.files('.xaml', '.cs')):
+        hasher.add_string(file)
+        if file.endswith('.cs'):
+            hasher.add_file(os.path.join(folder_path, file))
+    return hasher.hexdigest()
+
+
+def get_default_cache_path(path: str) -> str:
+    """
+    Get the result cache of a project, in its samples path, so that the
+    checker and the checker daemon share it whichever folder they are given.
+
+    :param path: The path to the project root folder, or to its src folder.
+    :return: The path to the cache file.
+    """
+    return os.path.join(find_sample_root(path), '.metadata_style_cache.json')
+
+
+def get_checker_fingerprint() -> str:
+    """
+    :return: The fingerprint of this script and the shared modules it uses.
+    """
+    modules = [sys.modules[name] for name in
+               ('readme_parser', 'sample_folder', 'attribute_scanner',
+                'result_cache')]
+    return get_fingerprint(os.path.realpath(__file__),
+                           *(module.__file__ for module in modules))
+
+
+def all_samples(path: str, jobs: int = 1,
+                cache_path: typing.Optional[str] = None,
+                use_git_index: bool = False):
+    """
+    Run the check on all samples. The results are printed in the order of the
+    sample paths, however many worker processes run the checks.
 
     :param path: The path to 'arcgis-ios-sdk-samples' folder.
+    :param jobs: The number of worker processes; 0 uses one per CPU.
+    :param cache_path: The path to the result cache. The results of samples
+    whose inputs are unchanged since the last run are replayed from the cache.
+    No cache is used if not given.
+    :param use_git_index: List the samples and hash their files from the git
+    index instead of walking the folders, if the path is in a git working
+    tree.
     :return: None. Throws if exception occurs.
     """
+    git_index = None
+    if use_git_index:
+        git_index = load_git_index(find_sample_root(path))
+    sample_paths = get_sample_paths(path, git_index)
+    jobs = jobs or os.cpu_count()
+    cache = None
+    if cache_path:
+        cache = ResultCache(cache_path, get_checker_fingerprint())
+        cache.load()
+    executor = None
+    if jobs > 1:
+        executor = concurrent.futures.ProcessPoolExecutor(max_workers=jobs)
+    try:
+        chunksize = max(1, len(sample_paths) // (jobs * 4))
+        if cache is not None:
+            key_function = functools.partial(get_input_key,
+                                             git_index=git_index)
+            results = cache.map(check_sample, sample_paths, key_function,
+                                executor, chunksize)
+        elif executor is not None:
+            results = list(executor.map(check_sample, sample_paths,
+                                        chunksize=chunksize))
+        else:
+            results = [check_sample(sample_path)
+                       for sample_path in sample_paths]
+    finally:
+        if executor is not None:
+            executor.shutdown()
+    if cache is not None:
+        cache.save(prune=True)
+
     exception_count = 0
-    for root, dirs, files in os.walk(path):
-        # Get parent folder name.
-        parent_folder_name = get_folder_name_from_path(root)
-        # If parent folder name is a valid category name.
-        if parent_folder_name in categories:
-            for dir_name in dirs:
-                sample_path = os.path.join(root, dir_name)
-                # Omit empty folders - they are omitted by Git.
-                if len([f for f in os.listdir(sample_path)
-                        if not f.startswith('.DS_Store')]) == 0:
-                    continue
-                try:
-                    compare_one_metadata(sample_path)
-                except Exception as err:
-                    exception_count += 1
-                    print(f'{exception_count}. {err}')
+    for result in results:
+        # Cached results are read back from json as lists.
+        result = SampleResult(*result)
+        print(result.output, end='')
+        if result.error is not None:
+            exception_count += 1
+            print(f'{exception_count}. {result.error}')
 
     # Throw once if there are exceptions.
     if exception_count > 0:
@@ -372,6 +464,17 @@ def main():
     parser = argparse.ArgumentParser(description=msg)
     parser.add_argument('-a', '--all', help='path to the samples repo root')
     parser.add_argument('-s', '--single', help='path to a single sample')
+    parser.add_argument('-j', '--jobs', type=int, default=1,
+                        help='number of worker processes for --all; '
+                             '0 uses one per CPU')
+    parser.add_argument('--cache', nargs='?', const='', metavar='PATH',
+                        help='replay the errors of unchanged samples from a '
+                             'result cache for --all, at PATH or '
+                             '.metadata_style_cache.json in the src folder')
+    parser.add_argument('--git-index', action='store_true',
+                        help='list the samples and hash their files from the '
+                             'git index for --all instead of walking the '
+                             'folders')
     args = parser.parse_args()
 
     if args.single:
@@ -380,8 +483,13 @@ def main():
         except Exception as err:
             raise err
     elif args.all:
+        # The cache is opt-in, so that CI and other one-off runs check every
+        # sample and leave no cache file behind.
+        cache_path = None
+        if args.cache is not None:
+            cache_path = args.cache or get_default_cache_path(args.all)
         try:
-            all_samples(args.all)
+            all_samples(args.all, args.jobs, cache_path, args.git_index)
         except Exception as err:
             raise err
     else:
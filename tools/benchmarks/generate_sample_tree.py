@@ -0,0 +1,433 @@
+#!/usr/bin/env python3
+
+import argparse
+import json
+import os
+import random
+import typing
+
+# region Global sets
+# The viewer folder of each platform, relative to src.
+platform_viewers = {
+    'WPF': os.path.join('WPF', 'WPF.Viewer'),
+    'WinUI': os.path.join('WinUI', 'ArcGIS.WinUI.Viewer'),
+    'MAUI': os.path.join('MAUI', 'Maui.Samples'),
+}
+
+# The namespace of the samples on each platform.
+platform_namespaces = {
+    'WPF': 'ArcGIS.WPF.Samples',
+    'WinUI': 'ArcGIS.WinUI.Samples',
+    'MAUI': 'ArcGIS.Samples',
+}
+
+# Category folders of the generated samples. Categories whose display name
+# has a space, e.g. 'LocalServer', are left out so that the generated metadata
+# can be checked without special cases.
+categories = [
+    'Analysis',
+    'Data',
+    'Geometry',
+    'Geoprocessing',
+    'GraphicsOverlay',
+    'Hydrography',
+    'Layers',
+    'Location',
+    'Map',
+    'MapView',
+    'Scene',
+    'SceneView',
+    'Search',
+    'Security',
+    'Symbology',
+]
+
+verbs = [
+    'Add', 'Analyze', 'Animate', 'Apply', 'Browse', 'Buffer', 'Calculate',
+    'Change', 'Clip', 'Create', 'Display', 'Download', 'Edit', 'Export',
+    'Filter', 'Find', 'Generate', 'Identify', 'Measure', 'Navigate',
+    'Project', 'Query', 'Select', 'Show', 'Style', 'Sync', 'Trace', 'View',
+]
+
+nouns = [
+    'basemap', 'elevation', 'feature layer', 'features', 'geometry',
+    'graphics', 'grid', 'image layer', 'KML layer', 'labels', 'map',
+    'map area', 'raster', 'route', 'scene', 'service area', 'symbols',
+    'tile cache', 'viewpoint', 'WMS layer', 'WFS table', '3D buildings',
+]
+
+qualifiers = [
+    'by attribute', 'from portal', 'in a scene', 'offline', 'on a map',
+    'with a definition expression', 'with a popup', 'with a renderer',
+    'with callouts', 'with time', 'within extent', 'using a template',
+]
+
+apis = [
+    'ArcGISMapImageLayer', 'ArcGISSceneLayer', 'ArcGISTiledLayer', 'Basemap',
+    'Camera', 'DefinitionExpression', 'Feature', 'FeatureLayer',
+    'FeatureQueryResult', 'GeoElement', 'GeometryEngine', 'GeoView',
+    'Graphic', 'GraphicsOverlay', 'IdentifyLayerResult', 'KmlLayer',
+    'LocatorTask', 'Map', 'MapView', 'Polygon', 'Polyline', 'PortalItem',
+    'QueryParameters', 'RasterLayer', 'RouteTask', 'Scene', 'SceneView',
+    'ServiceFeatureTable', 'SimpleLineSymbol', 'SimpleMarkerSymbol',
+    'SimpleRenderer', 'Surface', 'TextSymbol', 'Viewpoint', 'WmsLayer',
+]
+
+tags = [
+    'analysis', 'attribute', 'authentication', 'basemap', 'buffer',
+    'camera', 'cartography', 'data', 'edit', 'elevation', 'extent',
+    'feature', 'filter', 'geometry', 'graphics', 'identify', 'imagery',
+    'labels', 'layers', 'map', 'navigation', 'offline', 'portal', 'query',
+    'raster', 'render', 'route', 'scene', 'search', 'selection', 'symbol',
+    'sync', 'tiles', 'time', 'visualization', '3D',
+]
+
+sentences = [
+    'This is useful for showing the data a user needs to make a decision',
+    'Field workers can use this to review their assets before a site visit',
+    'Analysts can compare the results with existing survey data',
+    'Planners can explore alternative scenarios without changing the source data',
+    'This helps to keep the map readable when there is a lot of data',
+    'Emergency managers can use this to understand the extent of an incident',
+]
+
+# Files shared between samples, referenced through ClassFile attributes and
+# relative to the viewer folder.
+shared_class_files = [
+    'Helpers\\ArcGISLoginPrompt.cs',
+    'Helpers\\SampleDataHelper.cs',
+    'Converters\\ColorToSolidBrushConverter.cs',
+    'Converters\\BoolNegationConverter.cs',
+]
+# endregion
+
+
+class GeneratedSample(typing.NamedTuple):
+    """
+    The content of a synthetic sample, shared by all platforms.
+    """
+    category: str
+    formal_name: str
+    title: str
+    description: str
+    use_case: str
+    how_to_use: str
+    steps: typing.List[str]
+    apis: typing.List[str]
+    tags: typing.List[str]
+    offline_data: typing.List[str]
+    class_files: typing.List[str]
+
+
+# region Static functions
+def make_guid(rng: random.Random) -> str:
+    """
+    :return: A random version 4 portal item ID without dashes.
+    """
+    digits = list(f'{rng.getrandbits(128):032x}')
+    digits[12] = '4'
+    digits[16] = rng.choice('89ab')
+    return ''.join(digits)
+
+
+def make_paragraph(rng: random.Random, count: int) -> str:
+    return ' '.join(s + '.' for s in rng.sample(sentences, count))
+
+
+def make_sample(rng: random.Random, category: str,
+                used_names: typing.Set[str]) -> GeneratedSample:
+    """
+    Make the content of a sample with a title and formal name that are unique
+    across the tree, ignoring case.
+
+    :param rng: The random generator.
+    :param category: The category folder of the sample.
+    :param used_names: Casefolded formal names already in the tree; updated.
+    :return: The sample content.
+    """
+    verb = rng.choice(verbs)
+    title = f'{verb} {rng.choice(nouns)} {rng.choice(qualifiers)}'
+    base_title = title
+    suffix = 2
+    formal_name = ''.join(w[0].upper() + w[1:] for w in title.split())
+    while formal_name.casefold() in used_names:
+        title = f'{base_title} {suffix}'
+        formal_name = ''.join(w[0].upper() + w[1:] for w in title.split())
+        suffix += 1
+    used_names.add(formal_name.casefold())
+
+    sample_apis = sorted(rng.sample(apis, rng.randint(2, 6)), key=str.casefold)
+    sample_tags = sorted(rng.sample(tags, rng.randint(3, 7)), key=str.casefold)
+    steps = [f'Create a `{api}`.' for api in sample_apis]
+    steps.append(f'Use the `{sample_apis[0]}` to {verb.lower()} the data.')
+    offline_data = []
+    if rng.random() < 0.2:
+        offline_data = [make_guid(rng) for _ in range(rng.randint(1, 2))]
+    class_files = []
+    if rng.random() < 0.15:
+        class_files.append(rng.choice(shared_class_files))
+    if rng.random() < 0.1:
+        class_files.append(f'{formal_name}ViewModel.cs')
+
+    return GeneratedSample(
+        category=category,
+        formal_name=formal_name,
+        title=title,
+        description=f'{title} to explore the data.',
+        use_case=make_paragraph(rng, 2),
+        how_to_use='Pan and zoom to explore the map. Tap the button to '
+                   f'{verb.lower()} the data and view the results.',
+        steps=steps,
+        apis=sample_apis,
+        tags=sample_tags,
+        offline_data=offline_data,
+        class_files=class_files)
+
+
+def get_image_name(sample: GeneratedSample, platform: str) -> str:
+    # MAUI screenshots are lowercase.
+    if platform == 'MAUI':
+        return sample.formal_name.lower() + '.jpg'
+    return sample.formal_name + '.jpg'
+
+
+def make_readme(sample: GeneratedSample, platform: str) -> str:
+    """
+    :return: A README that passes the style checks.
+    """
+    steps = '\n'.join(f'{i}. {step}' for i, step in enumerate(sample.steps, 1))
+    parts = [
+        f'# {sample.title}',
+        sample.description,
+        f'![Image of {sample.title.lower()}]'
+        f'({get_image_name(sample, platform)})',
+        '## Use case',
+        sample.use_case,
+        '## How to use the sample',
+        sample.how_to_use,
+        '## How it works',
+        steps,
+        '## Relevant API',
+        '\n'.join(f'* {api}' for api in sample.apis),
+    ]
+    if sample.offline_data:
+        parts.append('## Offline data')
+        parts.append('This sample downloads the following items from ArcGIS '
+                     'Online automatically:')
+        parts.append('\n'.join(
+            f'* [Item {i}](https://www.arcgis.com/home/item.html?id={guid}) '
+            f'- Data used by the sample.'
+            for i, guid in enumerate(sample.offline_data, 1)))
+    parts.append('## Tags')
+    parts.append(', '.join(sample.tags))
+    return '\n\n'.join(parts) + '\n'
+
+
+def get_snippets(sample: GeneratedSample) -> typing.List[str]:
+    """
+    :return: The snippets in the order process_metadata lists them.
+    """
+    files = [sample.formal_name + '.xaml', sample.formal_name + '.xaml.cs']
+    files.extend(f for f in sample.class_files if '\\' not in f)
+    files.sort(reverse=True)
+    files.extend(sorted('../../../' + f.replace('\\', '/')
+                        for f in sample.class_files if '\\' in f))
+    return files
+
+
+def make_metadata(sample: GeneratedSample, platform: str) -> str:
+    """
+    :return: The readme.metadata.json text process_metadata would write.
+    """
+    data = {
+        'category': sample.category,
+        'description': sample.description,
+        'formal_name': sample.formal_name,
+        'ignore': False,
+        'images': [get_image_name(sample, platform)],
+        'keywords': sorted(sample.tags),
+        'offline_data': sample.offline_data,
+        'redirect_from': [
+            f'/net/latest/{platform.lower()}/sample-code/'
+            f'{sample.formal_name.lower()}.htm'],
+        'relevant_apis': sorted(sample.apis),
+        'snippets': get_snippets(sample),
+        'title': sample.title,
+    }
+    return json.dumps(data, indent=4, sort_keys=True)
+
+
+def make_source(sample: GeneratedSample, platform: str,
+                rng: random.Random) -> str:
+    """
+    :return: The code-behind of the sample, with the attributes in the format
+    process_metadata writes them.
+    """
+    namespace = f'{platform_namespaces[platform]}.{sample.formal_name}'
+    base_class = ' : ContentPage' if platform == 'MAUI' else ''
+    tag_list = ', '.join(f'"{tag}"' for tag in sorted(sample.tags))
+    lines = [
+        '// Copyright 2024 Esri.',
+        '//',
+        '// Licensed under the Apache License, Version 2.0 (the "License"); '
+        'you may not use this file except in compliance with the License.',
+        '',
+        *(f'using Esri.ArcGISRuntime.{ns};'
+          for ns in ('Data', 'Geometry', 'Mapping', 'Symbology', 'UI')),
+        'using System;',
+        'using System.Threading.Tasks;',
+        '',
+        f'namespace {namespace}',
+        '{',
+        '    [ArcGIS.Samples.Shared.Attributes.Sample(',
+        f'        name: "{sample.title}",',
+        f'        category: "{sample.category}",',
+        f'        description: "{sample.description}",',
+        f'        instructions: "{sample.how_to_use}",',
+        f'        tags: new[] {{ {tag_list} }})]',
+        *(f'    [ArcGIS.Samples.Shared.Attributes.ClassFile'
+          f'("{f.replace(chr(92), chr(92) * 2)}")]'
+          for f in sample.class_files),
+    ]
+    if sample.offline_data:
+        guids = ', '.join(f'"{guid}"' for guid in sample.offline_data)
+        lines.append(f'    [ArcGIS.Samples.Shared.Attributes.OfflineData({guids})]')
+    lines += [
+        f'    public partial class {sample.formal_name}{base_class}',
+        '    {',
+        f'        public {sample.formal_name}()',
+        '        {',
+        '            InitializeComponent();',
+        '            _ = Initialize();',
+        '        }',
+        '',
+        '        private async Task Initialize()',
+        '        {',
+        '            try',
+        '            {',
+        '                MyMapView.Map = new Map(BasemapStyle.ArcGISTopographic);',
+        '                await MyMapView.Map.LoadAsync();',
+        '            }',
+        '            catch (Exception ex)',
+        '            {',
+        '                System.Diagnostics.Debug.WriteLine(ex.Message);',
+        '            }',
+        '        }',
+    ]
+    for index in range(rng.randint(2, 8)):
+        lines += [
+            '',
+            f'        private async void Button{index}_Click(object sender, EventArgs e)',
+            '        {',
+            '            var parameters = new QueryParameters { WhereClause = "1=1" };',
+            f'            // Step {index}: update the map with the results.',
+            '            await Task.Yield();',
+            '        }',
+        ]
+    lines += ['    }', '}', '']
+    return '\n'.join(lines)
+
+
+def make_xaml(sample: GeneratedSample, platform: str) -> str:
+    class_name = f'{platform_namespaces[platform]}.{sample.formal_name}.' \
+                 f'{sample.formal_name}'
+    if platform == 'MAUI':
+        return (f'<ContentPage x:Class="{class_name}"\n'
+                '             xmlns="http://schemas.microsoft.com/dotnet/2021/maui"\n'
+                '             xmlns:x="http://schemas.microsoft.com/winfx/2009/xaml"\n'
+                '             xmlns:esriUI="clr-namespace:Esri.ArcGISRuntime.Maui;'
+                'assembly=Esri.ArcGISRuntime.Maui">\n'
+                '    <Grid>\n'
+                '        <esriUI:MapView x:Name="MyMapView" />\n'
+                '    </Grid>\n'
+                '</ContentPage>\n')
+    esri = 'using:Esri.ArcGISRuntime.UI.Controls' if platform == 'WinUI' \
+        else 'http://schemas.esri.com/arcgis/runtime/2013'
+    return (f'<UserControl x:Class="{class_name}"\n'
+            '             xmlns="http://schemas.microsoft.com/winfx/2006/xaml/presentation"\n'
+            '             xmlns:x="http://schemas.microsoft.com/winfx/2006/xaml"\n'
+            f'             xmlns:esriUI="{esri}">\n'
+            '    <Grid>\n'
+            '        <esriUI:MapView x:Name="MyMapView" />\n'
+            '    </Grid>\n'
+            '</UserControl>\n')
+
+
+def write_file(path: str, content: typing.Union[str, bytes]) -> None:
+    if isinstance(content, str):
+        with open(path, 'w', encoding='utf-8', newline='\n') as file:
+            file.write(content)
+    else:
+        with open(path, 'wb') as file:
+            file.write(content)
+
+
+def write_sample(sample_root: str, platform: str, sample: GeneratedSample,
+                 rng: random.Random) -> None:
+    sample_dir = os.path.join(sample_root, platform_viewers[platform],
+                              'Samples', sample.category, sample.formal_name)
+    os.makedirs(sample_dir)
+    name = sample.formal_name
+    write_file(os.path.join(sample_dir, 'readme.md'),
+               make_readme(sample, platform))
+    write_file(os.path.join(sample_dir, 'readme.metadata.json'),
+               make_metadata(sample, platform))
+    write_file(os.path.join(sample_dir, name + '.xaml'),
+               make_xaml(sample, platform))
+    write_file(os.path.join(sample_dir, name + '.xaml.cs'),
+               make_source(sample, platform, rng))
+    for class_file in sample.class_files:
+        if '\\' not in class_file:
+            write_file(os.path.join(sample_dir, class_file),
+                       f'namespace {platform_namespaces[platform]}.{name}\n'
+                       f'{{\n    public class {class_file[:-3]}\n    {{\n'
+                       f'    }}\n}}\n')
+    # A small stand-in for the screenshot.
+    write_file(os.path.join(sample_dir, get_image_name(sample, platform)),
+               b'\xff\xd8\xff\xe0' + rng.randbytes(2048) + b'\xff\xd9')
+
+
+def generate_sample_tree(sample_root: str, sample_count: int,
+                         seed: int = 0) -> typing.List[GeneratedSample]:
+    """
+    Generate a synthetic samples tree, laid out like the src folder of this
+    repository. Every sample exists on all three platforms, and the output is
+    the same for the same count and seed.
+
+    :param sample_root: The folder to generate, ending in src. Must not exist.
+    :param sample_count: The number of samples per platform.
+    :param seed: The seed of the random generator.
+    :return: The generated samples.
+    """
+    os.makedirs(sample_root)
+    rng = random.Random(seed)
+    used_names = set()
+    samples = [make_sample(rng, categories[i % len(categories)], used_names)
+               for i in range(sample_count)]
+    for platform, viewer in platform_viewers.items():
+        for class_file in shared_class_files:
+            path = os.path.join(sample_root, viewer, *class_file.split('\\'))
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            write_file(path, f'namespace ArcGIS.{os.path.basename(path)[:-3]}'
+                             '\n{\n}\n')
+        for sample in samples:
+            write_sample(sample_root, platform, sample, rng)
+    return samples
+# endregion
+
+
+def main():
+    msg = 'Generate a synthetic samples tree for benchmarking the tools.'
+    parser = argparse.ArgumentParser(description=msg)
+    parser.add_argument('output', help='folder to generate, ending in src')
+    parser.add_argument('-n', '--samples', type=int, default=1000,
+                        help='number of samples per platform')
+    parser.add_argument('--seed', type=int, default=0,
+                        help='seed of the random generator')
+    args = parser.parse_args()
+    samples = generate_sample_tree(args.output, args.samples, args.seed)
+    print(f'Generated {len(samples)} samples per platform in {args.output}')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,216 @@
+#!/usr/bin/env python3
+
+import argparse
+import contextlib
+import datetime
+import io
+import json
+import os
+import platform
+import shutil
+import sys
+import tempfile
+import time
+import typing
+
+from generate_sample_tree import generate_sample_tree
+
+# The tools are scripts that import their siblings, so each folder goes on the
+# path before the tools are imported.
+tools_root = os.path.join(os.path.dirname(os.path.realpath(__file__)), '..')
+for folder in ('shared', 'metadata_tools', 'readme_copy', 'githook_scripts',
+               os.path.join('CI', 'README_Metadata_StyleCheck')):
+    sys.path.append(os.path.join(tools_root, folder))
+
+import check_file_casing
+import metadata_style_checker
+import process_metadata
+import readme_copy
+import README_style_checker
+import sample_folder
+from readme_parser import parse_readme
+
+
+class BenchmarkResult(typing.NamedTuple):
+    """
+    The wall times of the runs of one benchmark, and what the last run printed.
+    """
+    seconds: typing.List[float]
+    output_lines: int
+    error: typing.Optional[str]
+
+    def to_json(self) -> typing.Dict[str, typing.Any]:
+        return {
+            'seconds': self.seconds,
+            'best_seconds': min(self.seconds),
+            'output_lines': self.output_lines,
+            'error': self.error,
+        }
+
+
+# region Static functions
+def clear_caches() -> None:
+    """
+    Drop the caches the tools share within a process, so that each benchmark
+    starts cold as if the tool ran in a process of its own.
+    """
+    parse_readme.cache_clear()
+    sample_folder.invalidate()
+
+
+def run_benchmark(function: typing.Callable[[], typing.Any],
+                  argv: typing.List[str], repeat: int) -> BenchmarkResult:
+    """
+    Time a tool entry point in this process, with its output captured.
+
+    :param function: The entry point to call.
+    :param argv: The command line the entry point sees in sys.argv.
+    :param repeat: The number of runs.
+    :return: The result. An exception raised by the tool, such as the style
+    checkers failing, is recorded as the error of the result.
+    """
+    seconds = []
+    output = ''
+    error = None
+    original_argv = sys.argv
+    try:
+        for _ in range(repeat):
+            clear_caches()
+            sys.argv = argv
+            buffer = io.StringIO()
+            start = time.perf_counter()
+            try:
+                with contextlib.redirect_stdout(buffer):
+                    function()
+            except (Exception, SystemExit) as err:
+                error = f'{type(err).__name__}: {err}'
+            seconds.append(time.perf_counter() - start)
+            output = buffer.getvalue()
+    finally:
+        sys.argv = original_argv
+    return BenchmarkResult(seconds, len(output.splitlines()), error)
+
+
+def run_size(work_dir: str, sample_count: int, repeat: int, jobs: int,
+             seed: int) -> typing.Dict[str, typing.Any]:
+    """
+    Generate a tree with the given number of samples per platform and time
+    every tool against it.
+
+    :return: The results for this size.
+    """
+    repo_root = os.path.join(work_dir, f'samples_{sample_count}')
+    sample_root = os.path.join(repo_root, 'src')
+    start = time.perf_counter()
+    generate_sample_tree(sample_root, sample_count, seed)
+    generate_seconds = time.perf_counter() - start
+
+    metadata_args = ['process_metadata.py', sample_root, '--jobs', str(jobs)]
+    # The metadata tools run first so the TOCs exist for the later runs. The
+    # first run processes every sample; the second one only checks the
+    # manifest, as a run without changes would.
+    benchmarks = [
+        ('process_metadata (full)', process_metadata.main,
+         metadata_args + ['--force']),
+        ('process_metadata (incremental)', process_metadata.main,
+         metadata_args),
+        ('readme_copy', readme_copy.main, ['readme_copy.py', sample_root]),
+        ('README_style_checker.all_designs',
+         lambda: README_style_checker.all_designs(sample_root, jobs), []),
+        ('metadata_style_checker.all_samples',
+         lambda: metadata_style_checker.all_samples(sample_root, jobs), []),
+        ('check_file_casing', check_file_casing.main,
+         ['check_file_casing.py', repo_root]),
+    ]
+    results = {}
+    for name, function, argv in benchmarks:
+        result = run_benchmark(function, argv, repeat)
+        results[name] = result.to_json()
+        status = f' ({result.error})' if result.error else ''
+        print(f'{sample_count:>6} samples  {name:<36} '
+              f'{min(result.seconds):9.3f}s{status}')
+
+    return {
+        'samples_per_platform': sample_count,
+        'sample_folders': sample_count * 3,
+        'generate_seconds': generate_seconds,
+        'tools': results,
+    }
+
+
+def compare(results: typing.Dict[str, typing.Any],
+            baseline_path: str) -> None:
+    """
+    Print the speedup of each benchmark over an earlier results file, for the
+    sizes both runs have.
+    """
+    with open(baseline_path, 'r') as baseline_file:
+        baseline = json.load(baseline_file)
+    baseline_sizes = {size['samples_per_platform']: size
+                      for size in baseline['sizes']}
+    for size in results['sizes']:
+        old_size = baseline_sizes.get(size['samples_per_platform'])
+        if old_size is None:
+            continue
+        for name, result in size['tools'].items():
+            old = old_size['tools'].get(name)
+            if old is None:
+                continue
+            speedup = old['best_seconds'] / max(result['best_seconds'], 1e-9)
+            print(f'{size["samples_per_platform"]:>6} samples  {name:<36} '
+                  f'{old["best_seconds"]:9.3f}s -> '
+                  f'{result["best_seconds"]:9.3f}s  x{speedup:.2f}')
+# endregion
+
+
+def main():
+    msg = 'Benchmark the sample tools against generated sample trees. ' \
+          'Results are written to a json file so that runs can be compared.'
+    parser = argparse.ArgumentParser(description=msg)
+    parser.add_argument('-n', '--samples', type=int, nargs='+',
+                        default=[1000, 5000],
+                        help='sizes to benchmark, in samples per platform')
+    parser.add_argument('-r', '--repeat', type=int, default=1,
+                        help='number of runs of each tool per size')
+    parser.add_argument('-j', '--jobs', type=int, default=1,
+                        help='worker processes for process_metadata and the '
+                             'style checkers')
+    parser.add_argument('--seed', type=int, default=0,
+                        help='seed of the sample tree generator')
+    parser.add_argument('-o', '--output', default='benchmark_results.json',
+                        help='path of the json results file')
+    parser.add_argument('--baseline',
+                        help='earlier results file to compare against')
+    parser.add_argument('--work-dir',
+                        help='folder for the generated trees, which are kept; '
+                             'defaults to a temporary folder')
+    args = parser.parse_args()
+
+    work_dir = args.work_dir or tempfile.mkdtemp(prefix='sample_benchmarks_')
+    try:
+        sizes = [run_size(work_dir, count, args.repeat, args.jobs, args.seed)
+                 for count in args.samples]
+    finally:
+        if args.work_dir is None:
+            shutil.rmtree(work_dir, ignore_errors=True)
+
+    results = {
+        'timestamp': datetime.datetime.now().isoformat(timespec='seconds'),
+        'python': platform.python_version(),
+        'platform': platform.platform(),
+        'cpu_count': os.cpu_count(),
+        'repeat': args.repeat,
+        'jobs': args.jobs,
+        'seed': args.seed,
+        'sizes': sizes,
+    }
+    with open(args.output, 'w') as output_file:
+        json.dump(results, output_file, indent=4)
+    print(f'Results written to {args.output}')
+
+    if args.baseline:
+        compare(results, args.baseline)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,535 @@
+#!/usr/bin/env python3
+
+import argparse
+import hashlib
+import json
+import os
+import signal
+import socket
+import socketserver
+import sys
+import tempfile
+import threading
+import time
+import typing
+
+# The tools are scripts that import their siblings, so each folder goes on the
+# path before the tools are imported.
+tools_root = os.path.join(os.path.dirname(os.path.realpath(__file__)), '..')
+for folder in ('shared', 'githook_scripts',
+               os.path.join('CI', 'README_Metadata_StyleCheck')):
+    sys.path.append(os.path.join(tools_root, folder))
+
+from sample_tree import SampleDir, find_sample_root, iter_samples
+
+# region Global sets
+# The checks the daemon runs, in the order their errors are reported.
+check_names = ('readme', 'metadata', 'api_key', 'file_casing')
+# endregion
+
+
+class CheckResult(typing.NamedTuple):
+    """
+    The errors one check found in a sample folder or, for the API key check,
+    a file.
+    """
+    check: str
+    path: str
+    errors: typing.List[str]
+
+
+# region Static functions
+def import_checkers() -> None:
+    """
+    Import the checkers and the modules they share. Only the daemon and the
+    in-process fallback run checks, so a client answered by the daemon
+    doesn't pay for loading them.
+    """
+    global check_api_key, check_file_casing, metadata_style_checker, \
+        README_style_checker, sample_folder, DependencyIndex, to_key, \
+        ResultCache
+    import check_api_key
+    import check_file_casing
+    import metadata_style_checker
+    import README_style_checker
+    import sample_folder
+    from dependency_index import DependencyIndex, to_key
+    from result_cache import ResultCache
+
+
+def get_socket_path(sample_root: str) -> str:
+    """
+    Get the default socket of the daemon serving a samples path. The socket
+    lives in the temporary folder, as socket paths are limited to about a
+    hundred characters.
+
+    :param sample_root: The samples path (ends in src).
+    :return: The path to the socket.
+    """
+    digest = hashlib.sha1(
+        os.path.realpath(sample_root).encode('utf-8')).hexdigest()
+    return os.path.join(tempfile.gettempdir(),
+                        f'arcgis-samples-checker-{digest[:12]}.sock')
+
+
+def get_folder_signature(path: str) \
+        -> typing.Optional[typing.Tuple[typing.Tuple[str, int, int], ...]]:
+    """
+    :return: The name, size and modification time of each entry of a folder,
+    to tell whether the folder changed, or None if it can't be scanned.
+    """
+    try:
+        with os.scandir(path) as scanner:
+            entries = []
+            for entry in scanner:
+                stat = entry.stat(follow_symlinks=False)
+                entries.append((entry.name, stat.st_size, stat.st_mtime_ns))
+    except OSError:
+        return None
+    return tuple(sorted(entries))
+
+
+def get_source_signature() -> typing.Dict[str, int]:
+    """
+    :return: The modification time of the source of each tool module loaded,
+    so that the daemon can tell when it runs outdated checks.
+    """
+    signature = {}
+    for module in list(sys.modules.values()):
+        path = getattr(module, '__file__', None)
+        if path and os.path.realpath(path).startswith(
+                os.path.realpath(tools_root) + os.sep):
+            try:
+                signature[path] = os.stat(path).st_mtime_ns
+            except OSError:
+                signature[path] = None
+    return signature
+
+
+def check_metadata(sample_path: str) -> typing.List[str]:
+    """
+    :return: The error of metadata_style_checker on a sample, if any, as a
+    json-serializable list.
+    """
+    result = metadata_style_checker.check_sample(sample_path)
+    return [f'{sample_path} - {result.error}'] if result.error else []
+# endregion
+
+
+class CheckerState:
+    """
+    What the daemon keeps between requests: the sample folders with the
+    signature of each, the dependency index, and the README and metadata
+    result caches. The snapshots of sample_folder and the parsed READMEs
+    stay warm in the process as well. The checkers must be imported first,
+    see import_checkers.
+
+    Snapshots are invalidated when the signature of their folder changes,
+    either when the watcher polls the tree or when a request touches the
+    folder, so that a request never sees a folder older than the request.
+    """
+
+    def __init__(self, sample_root: str):
+        self.sample_root = os.path.abspath(sample_root)
+        self.lock = threading.Lock()
+        self.sample_paths = []
+        self.sample_dirs = {}
+        self.signatures = {}
+        self.dependencies = DependencyIndex(self.sample_root)
+        self.dependencies.load()
+        self.caches = {
+            'readme': ResultCache(
+                README_style_checker.get_default_cache_path(self.sample_root),
+                README_style_checker.get_checker_fingerprint()),
+            'metadata': ResultCache(
+                metadata_style_checker.get_default_cache_path(
+                    self.sample_root),
+                metadata_style_checker.get_checker_fingerprint()),
+        }
+        for cache in self.caches.values():
+            cache.load()
+        # The key of the latest result of each sample, by check, so that the
+        # results of older versions of a sample can be dropped.
+        self.keys = {check: {} for check in self.caches}
+        self.dirty = False
+        self.caches_dirty = False
+        self.refresh()
+
+    def refresh(self, sample_paths: typing.Optional[typing.List[str]] = None) \
+            -> typing.List[str]:
+        """
+        Rescan the signatures of sample folders and drop the snapshots of the
+        ones that changed.
+
+        :param sample_paths: The sample folders to rescan; every sample of the
+        samples path if not given, which also picks up added and removed
+        samples.
+        :return: The paths to the samples that changed.
+        """
+        full = sample_paths is None
+        if full:
+            self.sample_dirs = {sample.path: sample for sample in
+                                iter_samples(self.sample_root)}
+            sample_paths = list(self.sample_dirs)
+        changed = []
+        for sample_path in sample_paths:
+            signature = get_folder_signature(sample_path)
+            if signature != self.signatures.get(sample_path):
+                sample_folder.invalidate(sample_path)
+                changed.append(sample_path)
+            if signature is None:
+                self.signatures.pop(sample_path, None)
+            else:
+                self.signatures[sample_path] = signature
+        if full:
+            for sample_path in set(self.signatures) - set(sample_paths):
+                del self.signatures[sample_path]
+                sample_folder.invalidate(sample_path)
+                changed.append(sample_path)
+            self.sample_paths = sorted(sample_paths)
+        if changed:
+            if self.dependencies.update(self.sample_paths):
+                self.dirty = True
+        return changed
+
+    def resolve_samples(self, paths: typing.List[str]) -> typing.List[str]:
+        """
+        Get the samples to check for the given paths: the samples containing
+        the files, the samples referencing them through ClassFile, and the
+        samples under the folders, e.g. a sample, a category or src.
+
+        :return: The paths to the sample folders, sorted.
+        """
+        samples = set(self.dependencies.get_affected_samples(paths))
+        for path in paths:
+            if os.path.isdir(path) and to_key(path, self.sample_root) \
+                    is not None:
+                prefix = os.path.join(os.path.abspath(path), '')
+                samples.update(sample_path for sample_path in self.sample_paths
+                               if os.path.join(sample_path, '').startswith(
+                                   prefix))
+        return sorted(sample_path for sample_path in samples
+                      if sample_path in self.signatures)
+
+    def check(self, paths: typing.List[str],
+              checks: typing.Iterable[str] = check_names) \
+            -> typing.List[CheckResult]:
+        """
+        Run checks on the samples affected by the given paths, and the API key
+        check on the files among them.
+
+        :param paths: Absolute paths to files or folders. Files may no longer
+        exist.
+        :param checks: The names of the checks to run.
+        :return: The results with errors, by check, then path.
+        """
+        paths = [os.path.abspath(path) for path in paths]
+        # Samples added since the watcher last polled aren't known yet, and
+        # folders above the samples are checked against the current tree.
+        if any(self.dependencies.get_sample(path) is None and
+               path not in self.signatures and os.path.exists(path) and
+               to_key(path, self.sample_root) is not None for path in paths):
+            self.refresh()
+        sample_paths = self.resolve_samples(paths)
+        self.refresh(sample_paths)
+        sample_paths = [sample_path for sample_path in sample_paths
+                        if sample_path in self.signatures and
+                        not sample_folder.get_sample_folder(
+                            sample_path).is_empty()]
+
+        results = []
+        for check in check_names:
+            if check not in checks:
+                continue
+            if check == 'readme':
+                results.extend(self.run_cached(
+                    check, README_style_checker.collect_errors,
+                    README_style_checker.get_input_key, sample_paths))
+            elif check == 'metadata':
+                results.extend(self.run_cached(
+                    check, check_metadata,
+                    metadata_style_checker.get_input_key, sample_paths))
+            elif check == 'api_key':
+                for path in paths:
+                    if not os.path.isfile(path):
+                        continue
+                    line = check_api_key.check_file(path)
+                    if line:
+                        results.append(CheckResult(check, path, [
+                            f'{path} - Error API key found on line {line}']))
+            elif check == 'file_casing':
+                samples = [self.sample_dirs.get(sample_path) or
+                           SampleDir(None, os.path.basename(
+                               os.path.dirname(sample_path)), sample_path)
+                           for sample_path in sample_paths]
+                errors = {}
+                for error in check_file_casing.check_samples(samples):
+                    errors.setdefault(error.path, []).append(error.message)
+                results.extend(CheckResult(check, sample_path, messages)
+                               for sample_path, messages in errors.items())
+        return results
+
+    def run_cached(self, check: str,
+                   function: typing.Callable[[str], typing.List[str]],
+                   key_function: typing.Callable[[str], str],
+                   sample_paths: typing.List[str]) -> typing.List[CheckResult]:
+        cache = self.caches[check]
+        keys = self.keys[check]
+        cached_count = len(cache.results)
+
+        def record_key(sample_path: str) -> str:
+            key = key_function(sample_path)
+            previous = keys.get(sample_path)
+            if previous is not None and previous != key:
+                cache.discard(previous)
+                self.caches_dirty = True
+            keys[sample_path] = key
+            return key
+
+        errors = cache.map(function, sample_paths, record_key)
+        if len(cache.results) != cached_count:
+            self.caches_dirty = True
+        return [CheckResult(check, sample_path, sample_errors)
+                for sample_path, sample_errors in zip(sample_paths, errors)
+                if sample_errors]
+
+    def save(self) -> None:
+        """
+        Write the caches and the dependency index to disk if they changed. They
+        are only caches, so failing to write them is not an error.
+
+        The caches are pruned to the results used since the daemon started,
+        and results are dropped when their sample changes, so that a
+        long-lived daemon keeps at most one result per sample and check.
+        They are only written once a check used them, so that starting the
+        daemon doesn't prune the results of earlier runs.
+        """
+        try:
+            if self.caches_dirty:
+                for cache in self.caches.values():
+                    cache.save(prune=True)
+            if self.dirty:
+                self.dependencies.save()
+        except OSError:
+            pass
+        self.dirty = False
+        self.caches_dirty = False
+
+
+class RequestHandler(socketserver.StreamRequestHandler):
+    """
+    Answers one request per connection. A request is a line of json, e.g.
+    {"command": "check", "paths": [...], "checks": [...]}, and so is the
+    response.
+    """
+
+    def handle(self):
+        try:
+            request = json.loads(self.rfile.readline())
+            response = self.server.answer(request)
+        except Exception as err:
+            response = {'error': f'{type(err).__name__}: {err}'}
+        self.wfile.write((json.dumps(response) + '\n').encode('utf-8'))
+        # Request threads don't keep the process alive, so the server only
+        # stops once the response is written.
+        if response.get('stopped'):
+            self.server.stop()
+
+
+class CheckerServer(socketserver.ThreadingMixIn, socketserver.UnixStreamServer):
+    """
+    Serves the checks of one samples path on a Unix socket, with a thread
+    that polls the sample folders and invalidates what changed.
+
+    Checks share module-level state, so requests run one at a time.
+    """
+
+    daemon_threads = True
+
+    def __init__(self, socket_path: str, state: CheckerState,
+                 poll_seconds: float):
+        super().__init__(socket_path, RequestHandler)
+        self.state = state
+        self.poll_seconds = poll_seconds
+        self.started = time.time()
+        self.request_count = 0
+        self.source_signature = get_source_signature()
+        self.stopping = threading.Event()
+        self.watcher = threading.Thread(target=self.watch, daemon=True)
+
+    def answer(self, request: typing.Dict[str, typing.Any]) \
+            -> typing.Dict[str, typing.Any]:
+        command = request.get('command')
+        if command == 'check':
+            start = time.perf_counter()
+            with self.state.lock:
+                self.request_count += 1
+                results = self.state.check(request.get('paths', []),
+                                           request.get('checks', check_names))
+            return {'results': [result._asdict() for result in results],
+                    'seconds': time.perf_counter() - start}
+        if command == 'status':
+            return {'sample_root': self.state.sample_root,
+                    'samples': len(self.state.sample_paths),
+                    'requests': self.request_count,
+                    'uptime': time.time() - self.started}
+        if command == 'stop':
+            return {'stopped': True}
+        raise ValueError(f'Unknown command "{command}"')
+
+    def watch(self) -> None:
+        """
+        Poll the tree until the server stops. The daemon stops itself when the
+        source of the tools changes, as it would keep running the old checks.
+        """
+        while not self.stopping.wait(self.poll_seconds):
+            if get_source_signature() != self.source_signature:
+                print('Tool sources changed, stopping.', file=sys.stderr)
+                self.stop()
+                return
+            with self.state.lock:
+                self.state.refresh()
+                self.state.save()
+
+    def stop(self) -> None:
+        if not self.stopping.is_set():
+            self.stopping.set()
+            # shutdown() waits for serve_forever, so it can't run on the
+            # thread of a request.
+            threading.Thread(target=self.shutdown).start()
+
+
+# region Client functions
+def send_request(socket_path: str, request: typing.Dict[str, typing.Any],
+                 timeout: float = 60) \
+        -> typing.Optional[typing.Dict[str, typing.Any]]:
+    """
+    Send a request to the daemon.
+
+    :return: The response, or None if no daemon listens on the socket.
+    """
+    if not hasattr(socket, 'AF_UNIX'):
+        return None
+    with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as client:
+        client.settimeout(timeout)
+        try:
+            client.connect(socket_path)
+        except (FileNotFoundError, ConnectionRefusedError):
+            return None
+        client.sendall((json.dumps(request) + '\n').encode('utf-8'))
+        with client.makefile('rb') as response_file:
+            response = json.loads(response_file.readline())
+    if 'error' in response:
+        raise Exception(f'Checker daemon error: {response["error"]}')
+    return response
+
+
+def serve(sample_root: str, socket_path: str, poll_seconds: float) -> None:
+    if send_request(socket_path, {'command': 'status'}) is not None:
+        raise Exception(f'A checker daemon already listens on {socket_path}')
+    if os.path.exists(socket_path):
+        # Left behind by a daemon that didn't stop cleanly.
+        os.unlink(socket_path)
+    import_checkers()
+    state = CheckerState(sample_root)
+    state.save()
+    server = CheckerServer(socket_path, state, poll_seconds)
+    signal.signal(signal.SIGTERM, lambda *_: server.stop())
+    print(f'Checking {state.sample_root} on {socket_path}', file=sys.stderr)
+    server.watcher.start()
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.stopping.set()
+        server.server_close()
+        os.unlink(socket_path)
+        with state.lock:
+            state.save()
+
+
+def check(sample_root: str, socket_path: str, paths: typing.List[str],
+          checks: typing.List[str], fallback: bool) -> int:
+    """
+    Check paths through the daemon, or in this process if no daemon runs and
+    fallback is allowed, and print the errors.
+
+    :return: The number of errors.
+    """
+    paths = [os.path.abspath(path) for path in paths]
+    request = {'command': 'check', 'paths': paths, 'checks': checks}
+    response = send_request(socket_path, request)
+    if response is not None:
+        results = [CheckResult(**result) for result in response['results']]
+    elif fallback:
+        import_checkers()
+        state = CheckerState(sample_root)
+        results = state.check(paths, checks)
+        state.save()
+    else:
+        raise Exception(f'No checker daemon listens on {socket_path}')
+
+    error_count = 0
+    for result in results:
+        for error in result.errors:
+            error_count += 1
+            print(f'{error_count}. [{result.check}] {error}')
+    return error_count
+# endregion
+
+
+def main():
+    msg = 'Keeps the sample checks warm in a background process, so that ' \
+          'pre-commit hooks and editors can check a few files in ' \
+          'milliseconds.'
+    common = argparse.ArgumentParser(add_help=False)
+    common.add_argument('--repo', default=os.getcwd(),
+                        help='path to the repository root or its src folder; '
+                             'defaults to the current folder')
+    common.add_argument('--socket',
+                        help='path to the socket; defaults to one per samples '
+                             'path in the temporary folder')
+    parser = argparse.ArgumentParser(description=msg)
+    commands = parser.add_subparsers(dest='command', required=True)
+    serve_parser = commands.add_parser('serve', parents=[common],
+                                       help='run the daemon')
+    serve_parser.add_argument('--poll', type=float, default=2,
+                              help='seconds between scans of the tree for '
+                                   'changes')
+    check_parser = commands.add_parser('check', parents=[common],
+                                       help='check files or folders')
+    check_parser.add_argument('paths', nargs='+',
+                              help='files or folders to check; folders check '
+                                   'every sample under them')
+    check_parser.add_argument('--checks', nargs='+', choices=check_names,
+                              default=list(check_names),
+                              help='the checks to run; defaults to all of '
+                                   'them')
+    check_parser.add_argument('--no-fallback', action='store_true',
+                              help='fail instead of checking in this process '
+                                   'when no daemon is running')
+    commands.add_parser('status', parents=[common],
+                        help='print what the daemon serves')
+    commands.add_parser('stop', parents=[common], help='stop the daemon')
+    args = parser.parse_args()
+
+    sample_root = os.path.abspath(find_sample_root(args.repo))
+    socket_path = args.socket or get_socket_path(sample_root)
+
+    if args.command == 'serve':
+        serve(sample_root, socket_path, args.poll)
+    elif args.command == 'check':
+        if check(sample_root, socket_path, args.paths, args.checks,
+                 not args.no_fallback):
+            sys.exit(1)
+    else:
+        response = send_request(socket_path, {'command': args.command})
+        if response is None:
+            print(f'No checker daemon listens on {socket_path}')
+            sys.exit(1)
+        print(json.dumps(response, indent=1))
+
+
+if __name__ == '__main__':
+    main()
@@ -25,65 +25,366 @@ Notes:
             .. apiKey is not found
         * Esri.ArcGISRuntime.ArcGISRuntimeEnvironment.ApiKey not found
 '''
+import io
+import os
 import re
+import sys
+import json
+import typing
 import argparse
+import subprocess
+import concurrent.futures
+
+sys.path.append(os.path.join(os.path.dirname(os.path.realpath(__file__)), "..", "shared"))
+from git_index import hash_blob, load_git_index, run_git
+from result_cache import ResultCache, get_fingerprint
 
 #-------------------------------------------------------------------------------
 # Global Variables
 #-------------------------------------------------------------------------------
 
-content = []
-
 net_apiKey_argument_regex = r"Esri\.ArcGISRuntime\.ArcGISRuntimeEnvironment\.ApiKey[\s]*\=[\s]*([\sa-zA-Z0-9_\"\']*)"
 # REGEX explanation: Esri.ArcGISRuntime.ArcGISRuntimeEnvironment.ApiKey = {0+ spaces}{0+ alphanumeric characters}{0+ underscores}{0+ quotes}
 
 valid_variable_regex = r"[_a-zA-Z][_a-zA-Z0-9]*[a-zA-Z0-9]"
 # Starts with an alphabetical character or underscore, contains zero or more alphabetical characters or underscores then ends with an alphanumeric character
 
+assignment_regex = r"(?<!\w)([_a-zA-Z][_a-zA-Z0-9]*) *=(?!=) *([\"|\']?[\w]*[\"|\']?)"
+# REGEX explanation: {identifier}{0+ spaces}={0+ spaces}{value}, where = is not part of ==, and the value is
+# any quote surrounded string or identifier
+
+# The patterns are compiled once, rather than for every line and every variable looked up.
+net_apiKey_argument_pattern = re.compile(net_apiKey_argument_regex)
+valid_variable_pattern = re.compile(valid_variable_regex)
+assignment_pattern = re.compile(assignment_regex)
+
+binary_extensions = {".bmp", ".dll", ".exe", ".gif", ".ico", ".jpeg", ".jpg", ".otf", ".pdb", ".png", ".ttf", ".webp",
+                     ".zip"}
+# Files with these extensions, e.g. the .jpg screenshots, are skipped without being read. Every other file is
+# scanned if it is utf-8, even with NUL bytes, so that a key can't hide in a file that merely looks binary.
+
+secret_regexes = {
+    "api_key": r"AAPK", # BLOCK anything with AAPK to be overly cautious
+    "access_token": r"AAPT[\w-]{20,}", # ArcGIS access tokens, which newer API keys are
+    "api_key_setter": re.escape("Esri.ArcGISRuntime.ArcGISRuntimeEnvironment.ApiKey ="), # checked like check_lines does
+    "private_key": r"-----BEGIN (?:[A-Z]+ )?PRIVATE KEY-----",
+}
+# The key-like patterns of the --all sweep, combined into one pattern so that each file is searched once
+
+secret_pattern = re.compile("|".join(f"(?P<{name}>{regex})" for name, regex in secret_regexes.items()))
+
+generated_pattern = re.compile(r"<auto-?generated", re.IGNORECASE)
+generated_sniff_length = 1000
+# Files marked as generated near their start, e.g. by "// <auto-generated>", are skipped by the sweep
+
+sweep_pruned_folders = {".git", ".vs", "bin", "obj"}
+# Folders the sweep never descends into when the tree isn't a git working tree
+
+sweep_cache_name = ".api_key_sweep_cache.json"
+# The hashes of the files the sweep found clean, in the swept folder
+
+#-------------------------------------------------------------------------------
+# Classes
+#-------------------------------------------------------------------------------
+
+class ScanResult(typing.NamedTuple):
+    path: str
+    line: int # 0 if ALLOW, else line_num if BLOCK.
+    skipped: typing.Optional[str] # Why the file wasn't scanned, e.g. "binary", or None.
+    pattern: typing.Optional[str] = None # The name of the secret pattern the sweep matched, or None.
+
 #-------------------------------------------------------------------------------
 # Functions
 #-------------------------------------------------------------------------------
 
 def read_file(args):
-    global content
+    if args.all:
+        # Sweep every file under a folder, and only print the files with a key.
+        results = [result for result in sweep(args.all, args.jobs, "" if args.no_cache else args.cache) if result.line]
+        if not args.json:
+            for result in results:
+                print(f"{result.line}\t{result.path}\t{result.pattern}")
+            return 1 if results else 0
+    elif args.staged:
+        # Scan what is staged for commit, whatever the working tree holds.
+        results = scan_staged(".")
+    else:
+        # Read the paths from the arguments, or NUL-separated from stdin, e.g. from git diff --name-only -z.
+        paths = list(args.input)
+        if args.null:
+            paths += [path for path in sys.stdin.read().split("\0") if path]
+
+        # Check if file was passed
+        if not paths:
+            print(0)
+            return 0
+
+        results = scan_files(paths, args.jobs)
+
+    if args.json:
+        print(json.dumps([result._asdict() for result in results], indent=1))
+    elif len(results) == 1 and args.input and not args.null:
+        print(results[0].line)
+    else:
+        # One line per file: the line number (0 if ALLOW) and the path, separated by a tab.
+        for result in results:
+            print(f"{result.line}\t{result.path}")
+
+    return 1 if any(result.line for result in results) else 0
+
+#-------------------------------------------------------------------------------
+
+def scan_files(paths: typing.List[str], jobs: int = 0) -> typing.List[ScanResult]:
+    # The files are scanned on a thread pool, so reading one file overlaps with scanning others.
+    # The results are in the order of the paths.
+    with concurrent.futures.ThreadPoolExecutor(max_workers=jobs or None) as executor:
+        return list(executor.map(scan_file, paths))
+
+#-------------------------------------------------------------------------------
+
+def scan_staged(repo: str) -> typing.List[ScanResult]:
+    # The staged files, except deletions, with paths relative to the repository root.
+    paths = run_git(repo, "diff", "--cached", "--name-only", "-z", "--diff-filter=d")
+    return [scan_data(path, data) for path, data in read_staged_blobs(repo, paths)]
+
+#-------------------------------------------------------------------------------
+
+def read_staged_blobs(repo: str, paths: typing.List[str]) -> typing.Iterator[typing.Tuple[str, typing.Optional[bytes]]]:
+    # Stream the staged contents of the files through a single git cat-file --batch process.
+    # ":<path>" names the blob of a path in the index. Each answer is "<sha> <type> <size>", then the
+    # contents and a newline, or "<name> missing", e.g. for a submodule. The format is given explicitly, so that
+    # an answer for an object never contains the path; a path may still contain spaces in a "missing" answer.
+    with subprocess.Popen(["git", "cat-file", "--batch=%(objectname) %(objecttype) %(objectsize)"], cwd=repo,
+                          stdin=subprocess.PIPE, stdout=subprocess.PIPE, stderr=subprocess.DEVNULL) as git:
+        for path in paths:
+            if "\n" in path:
+                # cat-file reads one name per line, so it can't be asked for this path.
+                yield path, None
+                continue
+            git.stdin.write(b":" + path.encode("utf-8") + b"\n")
+            git.stdin.flush()
+            header = git.stdout.readline().split()
+            if len(header) != 3 or header[-1] in (b"missing", b"ambiguous"):
+                yield path, None
+                continue
+            data = git.stdout.read(int(header[2]))
+            git.stdout.read(1)
+            yield path, data
+        git.stdin.close()
+
+#-------------------------------------------------------------------------------
+
+def sweep(root: str, jobs: int = 0, cache_path: typing.Optional[str] = None) -> typing.List[ScanResult]:
+    # Scan every file under a folder for secrets. Files are listed from the git index in a working tree, which
+    # also gives their content hashes without reading them; otherwise the folder is walked and every file is
+    # read to hash it. Files found clean before with the same content hash are skipped.
+    # The cache defaults to sweep_cache_name in the folder; an empty cache_path sweeps without one.
+    # This script is never swept, as it contains the patterns it looks for.
+    # The paths of the results are relative to the folder, with forward slashes.
+    root = os.path.abspath(root)
+    git_index = load_git_index(root)
+    if git_index is not None:
+        paths = git_index.list_files(root)
+    else:
+        paths = []
+        for folder, dirs, files in os.walk(root):
+            dirs[:] = sorted(name for name in dirs if name not in sweep_pruned_folders)
+            relative = os.path.relpath(folder, root).replace(os.sep, "/")
+            paths += [name if relative == "." else f"{relative}/{name}" for name in sorted(files)]
+
+    cache = None
+    if cache_path is None:
+        cache_path = os.path.join(root, sweep_cache_name)
+    if cache_path:
+        cache = ResultCache(cache_path, get_fingerprint(os.path.realpath(__file__)))
+        cache.load()
+        cache_file = os.path.relpath(os.path.abspath(cache_path), root).replace(os.sep, "/")
+        paths = [path for path in paths if path != cache_file]
+
+    # This script documents the patterns it blocks, e.g. in the docstring above, so it isn't swept.
+    this_script = os.path.realpath(__file__)
+    paths = [path for path in paths if os.path.realpath(os.path.join(root, path)) != this_script]
+
+    results = {}
+    keys = {}
+    for path in paths:
+        if is_binary(path):
+            results[path] = ScanResult(path, 0, "binary")
+            continue
+        keys[path] = get_sweep_key(os.path.join(root, path), path, git_index)
+        if cache is not None:
+            cached = cache.get(keys[path])
+            if cached is not None:
+                results[path] = ScanResult(path, 0, cached["skipped"])
+
+    misses = [path for path in paths if path not in results]
+    with concurrent.futures.ThreadPoolExecutor(max_workers=jobs or None) as executor:
+        for path, result in zip(misses, executor.map(lambda path: sweep_file(root, path), misses)):
+            results[path] = result
+            if cache is not None and not result.line:
+                # Only clean files are recorded, so files with a key are reported on every sweep.
+                cache.put(keys[path], {"skipped": result.skipped})
+
+    if cache is not None:
+        try:
+            cache.save(prune=True)
+        except OSError:
+            pass
+    binary_count = len(paths) - len(keys)
+    print(f"Swept {len(paths)} files: {len(misses)} scanned, {binary_count} binary, "
+          f"{len(keys) - len(misses)} clean since the last sweep.", file=sys.stderr)
+    return [results[path] for path in paths]
+
+#-------------------------------------------------------------------------------
+
+def get_sweep_key(source: str, path: str, git_index) -> str:
+    # The content hash of a file for the sweep cache: its blob SHA, from the git index if git knows the file,
+    # else hashed from the contents, so that a file rewritten with the same size and time is swept again.
+    blob = git_index.content_hash(source) if git_index is not None else None
+    if blob is None:
+        try:
+            with open(source, 'rb') as file:
+                blob = hash_blob(file.read())
+        except OSError:
+            return f"missing {path}"
+    return f"blob {blob}"
+
+#-------------------------------------------------------------------------------
+
+def is_binary(path: str) -> bool:
+    return os.path.splitext(path)[1].lower() in binary_extensions
+
+#-------------------------------------------------------------------------------
+
+def sweep_file(root: str, path: str) -> ScanResult:
+    try:
+        with open(os.path.join(root, path), 'rb') as file:
+            data = file.read()
+    except OSError:
+        return ScanResult(path, 0, "unreadable")
+    return sweep_data(path, data)
+
+#-------------------------------------------------------------------------------
+
+def sweep_data(source: str, data: bytes) -> ScanResult:
+    if is_binary(source):
+        return ScanResult(source, 0, "binary")
+    try:
+        text = data.decode('utf-8')
+    except UnicodeDecodeError:
+        return ScanResult(source, 0, "not utf-8")
+    if generated_pattern.search(text, 0, generated_sniff_length):
+        return ScanResult(source, 0, "generated")
+
+    # Most files match nothing, and are never split into lines.
+    if not secret_pattern.search(text):
+        return ScanResult(source, 0, None)
 
-    # Check if file was passed
-    if not args.input:
-        print(0)
-        return
+    # Split the lines the way reading the file in text mode does, so the line numbers match check_lines.
+    text = io.StringIO(text, newline=None).read()
+    content = text.split("\n")
+    assignments = None
+    for match in secret_pattern.finditer(text):
+        i = text.count("\n", 0, match.start())
+        if match.lastgroup != "api_key_setter":
+            return ScanResult(source, i+1, None, match.lastgroup)
+        if assignments is None:
+            assignments = index_assignments(content)
+        ApiKey_argument = net_apiKey_argument_pattern.search(content[i]).group(1)
+        argument_value = check_argument(ApiKey_argument, i, assignments)+1
+        if argument_value > 0:
+            return ScanResult(source, argument_value, None, match.lastgroup)
 
-    source = args.input
+    return ScanResult(source, 0, None) # ALLOW, API key not found anywhere
+
+#-------------------------------------------------------------------------------
+
+def check_file(source: str) -> int: # returns 0 if ALLOW, else line_num if BLOCK.
+    return scan_file(source).line
+
+#-------------------------------------------------------------------------------
+
+def scan_file(source: str) -> ScanResult:
+    if is_binary(source):
+        return ScanResult(source, 0, "binary")
 
     # try to open input file
     try:
-        with open(source, 'r', encoding='utf-8') as file:
-            content = file.readlines()
-    except:
+        with open(source, 'rb') as file:
+            data = file.read()
+    except OSError:
         # This file was most likely deleted.
         # Regardless, IO errors are not API keys and this should pass.
-        print(0)
-        return
+        return ScanResult(source, 0, "unreadable")
+
+    return scan_data(source, data)
+
+#-------------------------------------------------------------------------------
+
+def scan_data(source: str, data: typing.Optional[bytes]) -> ScanResult:
+    if data is None:
+        return ScanResult(source, 0, "unreadable")
+
+    if is_binary(source):
+        return ScanResult(source, 0, "binary")
+    try:
+        text = data.decode('utf-8')
+    except UnicodeDecodeError:
+        return ScanResult(source, 0, "not utf-8")
+
+    # Split the lines the way reading the file in text mode does.
+    content = io.StringIO(text, newline=None).readlines()
+    return ScanResult(source, check_lines(content), None)
+
+#-------------------------------------------------------------------------------
+
+def check_lines(content: typing.List[str]) -> int: # returns 0 if ALLOW, else line_num if BLOCK.
+    # The assignments are only indexed once a line sets the API key.
+    assignments = None
 
     # for each line, parse line
     for i in range(len(content)):
         if "AAPK" in content[i]:
-            print(i+1) # BLOCK anything with AAPK to be overly cautious
-            return
+            return i+1 # BLOCK anything with AAPK to be overly cautious
         
         if "Esri.ArcGISRuntime.ArcGISRuntimeEnvironment.ApiKey =" in content[i]:
-            ApiKey_argument = re.search(net_apiKey_argument_regex, content[i]).group(1)
-            argument_value = check_argument(ApiKey_argument, i)+1
+            if assignments is None:
+                assignments = index_assignments(content)
+            ApiKey_argument = net_apiKey_argument_pattern.search(content[i]).group(1)
+            argument_value = check_argument(ApiKey_argument, i, assignments)+1
             if argument_value > 0:
-                print(argument_value)
-                return
+                return argument_value
             continue
 
-    print(0) # ALLOW, API key not found anywhere
-    return
+    return 0 # ALLOW, API key not found anywhere
 
 #-------------------------------------------------------------------------------
 
-def check_argument(ApiKey_argument: str, i: int) -> int: # returns 0 if ALLOW, else line_num if BLOCK.
+def index_assignments(content: typing.List[str]) -> typing.Dict[str, typing.List[typing.Tuple[int, str]]]:
+    # Map each variable to the line index and value of each of its assignments, in the order of the lines,
+    # in one pass over the file.
+    assignments = {}
+    for i in range(len(content)):
+        if "=" not in content[i]:
+            continue
+        for match in assignment_pattern.finditer(content[i]):
+            assignments.setdefault(match.group(1), []).append((i, match.group(2)))
+    return assignments
+
+#-------------------------------------------------------------------------------
+
+def check_argument(ApiKey_argument: str, i: int, assignments: typing.Dict[str, typing.List[typing.Tuple[int, str]]]) -> int: # returns 0 if ALLOW, else line_num if BLOCK.
+    argument_value = check_value(ApiKey_argument, i)
+    if argument_value is None:
+        # The API key is set via a variable so we now need to find the value of that variable
+        return find_value(valid_variable_pattern.match(ApiKey_argument).group(0), assignments)
+    return argument_value
+
+    # We return i+1 to indicate the line number where the API key is defined, because line numbers are not zero indexed
+
+#-------------------------------------------------------------------------------
+
+def check_value(ApiKey_argument: str, i: int) -> typing.Optional[int]: # returns -1 if ALLOW, i if BLOCK, None if a variable.
     if not ApiKey_argument:
         return -1 # ALLOW, Esri.ArcGISRuntime.ArcGISRuntimeEnvironment.ApiKey is not set
 
@@ -92,42 +393,49 @@ def check_argument(ApiKey_argument: str, i: int) -> int: # returns 0 if ALLOW, e
             return -1 # ALLOW, API key is an empty string or Citra requested snippet
         return i # BLOCK, API key is a string
 
-    if not re.match(valid_variable_regex, ApiKey_argument):
+    if not valid_variable_pattern.match(ApiKey_argument):
         return i # BLOCK, API key not a valid variable, though may still be sensitive information. For instance "-AAPK{...}"
 
-    else:
-        # The API key is set via a variable so we now need to find the value of that variable
-        return find_value(ApiKey_argument)
-    
-    # We return i+1 to indicate the line number where the API key is defined, because line numbers are not zero indexed
+    return None
 
 #-------------------------------------------------------------------------------
 
-def find_value(var) -> int:
-    for i in range(len(content)):
-        if re.search(var+r" *=", content[i]):
-            try:
-                if re.search(r" *= *"+var, content[i]):
-                    continue
-                pattern = r"= *([\"|\']?[\w]*[\"|\']?);?"
-                # captures any quote surrounded string, after a "=" and zero or more spaces
-                ApiKey_argument = re.search(pattern, content[i]).group(1)
-            except:
-                return -1
-
-            return check_argument(ApiKey_argument, i)
-            # We again check this value to see if is null, a string, or another variable
+def find_value(var: str, assignments: typing.Dict[str, typing.List[typing.Tuple[int, str]]]) -> int:
+    # Follow the chain of variables through the index. A variable seen before means the chain is a cycle.
+    visited = set()
+    while var not in visited:
+        visited.add(var)
+        for i, value in assignments.get(var, ()):
+            if not value.startswith(var):
+                break
+            # Skip assignments of the variable to itself, e.g. apiKey = apiKey.Trim()
+        else:
+            return -1
+            # The variable was not found or defined (using '=' at least), ALLOW the commit in this case
+
+        argument_value = check_value(value, i)
+        if argument_value is not None:
+            return argument_value
+        # We again check this value to see if is null, a string, or another variable
+        var = valid_variable_pattern.match(value).group(0)
 
     return -1
-    # The variable was not found or defined (using '=' at least), ALLOW the commit in this case
+    # The variables are only assigned to each other, so none of them holds an API key, ALLOW the commit in this case
 
 #-------------------------------------------------------------------------------
 # main process
 #-------------------------------------------------------------------------------
 def parse_command_line():
 
-    parser = argparse.ArgumentParser(description="Format include lines in source code.")
-    parser.add_argument("input", default=None, help="File to parse")
+    parser = argparse.ArgumentParser(description="Check files for API keys. With one file, prints the line of the first API key, or 0 if there is none.")
+    parser.add_argument("input", nargs="*", default=[], help="Files to parse")
+    parser.add_argument("-z", "--null", action="store_true", help="also read NUL-separated paths from stdin, e.g. from git diff --cached --name-only -z")
+    parser.add_argument("--staged", action="store_true", help="scan the contents staged for commit instead of the files, read from the git object store")
+    parser.add_argument("--all", metavar="FOLDER", help="sweep every file under a folder, e.g. the repository root, for key-like patterns and print the files with a key")
+    parser.add_argument("--cache", help=f"path to the sweep cache of clean files, keyed by content hash, for --all; defaults to {sweep_cache_name} in the folder")
+    parser.add_argument("--no-cache", action="store_true", help="scan every file in the --all sweep")
+    parser.add_argument("-j", "--jobs", type=int, default=0, help="number of threads scanning files; 0 picks a default")
+    parser.add_argument("--json", action="store_true", help="print a json list with the path, line (0 if allowed) and skip reason of each file")
     args = parser.parse_args()
 
     return args
@@ -135,8 +443,8 @@ def parse_command_line():
 #-------------------------------------------------------------------------------
 def main_process():
     args = parse_command_line()
-    read_file(args)
+    sys.exit(read_file(args))
 
 #-------------------------------------------------------------------------------
 if __name__ == '__main__':
-    main_process()
\ No newline at end of file
+    main_process()
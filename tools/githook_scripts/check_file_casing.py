@@ -1,53 +1,195 @@
 #!/usr/bin/env python3
 import os
+import sys
+import typing
+import argparse
 
-def check_file_names(sample_folder):
+sys.path.append(os.path.join(os.path.dirname(os.path.realpath(__file__)), "..", "shared"))
+from sample_tree import SampleDir, get_platform_samples_root, iter_samples, list_subfolders, platform_samples_roots
 
-    files_to_check = []
+class CasingError(typing.NamedTuple):
+    # The sample folder the error is about, and the message.
+    path: str
+    message: str
 
+class CasingIndex:
+    '''
+    Maps casefolded names to the names seen for them, built in one pass over the sample folders, so
+    that every casing problem in the tree is found without comparing names pairwise:
+
+    * .xaml.cs and .xaml files of a sample whose names differ only in casing.
+    * Files of a sample whose paths differ only in casing, which collide on case-insensitive file systems.
+    * MAUI screenshots that aren't lowercase.
+    * Samples, and the .xaml and .cs files in them, named with different casings on different platforms.
+    '''
+
+    def __init__(self):
+        self.errors = []
+        # (casefolded category, casefolded sample) -> platform -> (folder, category, sample, casefolded .cs and .xaml name -> name)
+        self.samples = {}
+
+    def add_sample(self, sample: SampleDir, file_paths: typing.List[str]):
+        '''
+        Index the files of a sample and record the problems within it.
+
+        file_paths: The paths of the files relative to the sample folder, with forward slashes,
+        including those in subfolders.
+        '''
+        folder = sample.path
+        # Casefolded stem -> the stems of the .cs and .xaml files, e.g. "displaymap" -> {"DisplayMap"}
+        cs_stems = {}
+        xaml_stems = {}
+        # Casefolded path -> the paths
+        paths = {}
+        # Casefolded name -> name, of the .cs and .xaml files directly in the sample folder
+        names = {}
+        for file_path in file_paths:
+            paths.setdefault(file_path.casefold(), []).append(file_path)
+            name = file_path.rsplit("/", 1)[-1]
+            stem = name.split(".")[0]
+            top_level = "/" not in file_path
+            if name.endswith(".cs"):
+                cs_stems.setdefault(stem.casefold(), set()).add(stem)
+            elif name.endswith(".xaml"):
+                xaml_stems.setdefault(stem.casefold(), set()).add(stem)
+            else:
+                # The screenshots of MAUI samples are named after the sample in lowercase.
+                if sample.platform == "MAUI" and top_level and name.lower().endswith(".jpg") and name != name.lower():
+                    self.errors.append(CasingError(folder, f'Error MAUI screenshot name is not lowercase {name} - {folder}'))
+                continue
+            if top_level:
+                names[name.casefold()] = name
+
+        for key, stems in sorted(cs_stems.items()):
+            for file_cs in sorted(stems):
+                for file_xaml in sorted(xaml_stems.get(key, ())):
+                    if file_cs != file_xaml:
+                        self.errors.append(CasingError(folder, f'Error mismatching file casings {file_cs}.xaml.cs, {file_xaml}.xaml - {folder}'))
+        for key, duplicates in sorted(paths.items()):
+            if len(duplicates) > 1:
+                self.errors.append(CasingError(folder, f'Error file names differ only in casing {", ".join(sorted(duplicates))} - {folder}'))
+
+        sample_name = os.path.basename(folder)
+        key = (sample.category.casefold(), sample_name.casefold())
+        self.samples.setdefault(key, {})[sample.platform] = (folder, sample.category, sample_name, names)
+
+    def get_errors(self) -> typing.List[CasingError]:
+        '''
+        Get the problems within the samples, then the casings that differ across platforms.
+        '''
+        errors = list(self.errors)
+        for key, platforms in sorted(self.samples.items()):
+            if len(platforms) < 2:
+                continue
+            # The folders are the same sample on every platform, so they are named alike.
+            folder_names = {f'{category}/{sample_name}' for _, category, sample_name, _ in platforms.values()}
+            # Each difference is reported once, at the folder of the first platform, rather than once for every platform.
+            folders = [folder for _, (folder, _, _, _) in sorted(platforms.items())]
+            if len(folder_names) > 1:
+                listing = ", ".join(f'{platform}: {category}/{sample_name}' for platform, (_, category, sample_name, _) in sorted(platforms.items()))
+                errors.append(CasingError(folders[0], f'Error sample casing differs across platforms ({listing}) - {", ".join(folders)}'))
+            # Casefolded file name -> platform -> file name
+            files = {}
+            for platform, (_, _, _, names) in platforms.items():
+                for name_key, name in names.items():
+                    files.setdefault(name_key, {})[platform] = name
+            for name_key, names in sorted(files.items()):
+                if len(set(names.values())) > 1:
+                    listing = ", ".join(f'{platform}: {name}' for platform, name in sorted(names.items()))
+                    name_folders = [platforms[platform][0] for platform in sorted(names)]
+                    errors.append(CasingError(name_folders[0], f'Error file casing differs across platforms ({listing}) - {", ".join(name_folders)}'))
+        return errors
+
+def get_file_paths(sample_folder, git_index=None):
+    # The files of a sample, including those in subfolders, relative to the sample folder.
+    if git_index is not None:
+        return git_index.list_files(sample_folder)
+    file_paths = []
     for subdir, dirs, files in os.walk(sample_folder):
-        for file in files:
-            if (file.endswith(".cs") or file.endswith(".xaml")):
-                files_to_check.append(file)
-  
-    for file in files_to_check:
-      if file.endswith(".cs"):
-          file_cs = file.split(".")[0]
-          for file in files_to_check:
-              if file.endswith(".xaml"):
-                file_xaml = file.split(".")[0]
-                if file_cs.lower() == file_xaml.lower() and file_cs != file_xaml:
-                    print(f'Error mismatching file casings {file_cs}.xaml.cs, {file_xaml}.xaml - {sample_folder}')
-                    return 1
-    return 0
-
-def get_platform_samples_root(platform, sample_root):
+        relative = os.path.relpath(subdir, sample_folder).replace(os.sep, "/")
+        file_paths += [file if relative == "." else f'{relative}/{file}' for file in files]
+    return file_paths
+
+def check_samples(samples, git_index=None) -> typing.List[CasingError]:
+    casing_index = CasingIndex()
+    for sample in samples:
+        casing_index.add_sample(sample, get_file_paths(sample.path, git_index))
+    return casing_index.get_errors()
+
+def get_affected_samples(sample_root, paths, platforms) -> typing.List[SampleDir]:
     '''
-    Gets the root directory for each platform
+    Get the sample folders containing the given paths, and the folders of the same samples on the other
+    platforms, which the cross-platform checks compare them with. Only the category folders of the
+    platforms and the affected categories are listed.
+
+    paths: The changed paths, relative to the repository root (the parent of sample_root), e.g. as git
+    diff prints them. Paths outside of the sample folders are ignored.
     '''
-    if (platform == "WPF"):
-        return os.path.join(sample_root, "WPF", "WPF.Viewer", "Samples")
-    if (platform == "WinUI"):
-        return os.path.join(sample_root, "WinUI", "ArcGIS.WinUI.Viewer", "Samples")
-    if (platform == "MAUI"):
-        return os.path.join(sample_root, "MAUI", "Maui.Samples", "Samples")
-    raise AssertionError(None, None)
+    # (casefolded category, casefolded sample) of each affected sample
+    keys = set()
+    for path in paths:
+        parts = path.replace("\\", "/").split("/")
+        for platform_root in platform_samples_roots.values():
+            prefix = ["src"] + platform_root.split(os.sep)
+            # <prefix>/<category>/<sample>/<file>
+            if len(parts) > len(prefix) + 2 and parts[:len(prefix)] == prefix:
+                keys.add((parts[len(prefix)].casefold(), parts[len(prefix) + 1].casefold()))
+
+    samples = []
+    for platform in platforms:
+        platform_root = get_platform_samples_root(platform, sample_root)
+        if not keys or not os.path.isdir(platform_root):
+            continue
+        categories = {}
+        for category in list_subfolders(platform_root):
+            categories.setdefault(category.name.casefold(), []).append(category)
+        for category_key in sorted({category_key for category_key, _ in keys}):
+            for category in categories.get(category_key, []):
+                for sample in list_subfolders(category.path):
+                    if (category_key, sample.name.casefold()) in keys:
+                        samples.append(SampleDir(platform, category.name, sample.path))
+    return samples
+
+def check_file_names(sample_folder, git_index=None, platform=None):
+    # Check one sample folder on its own, printing the errors. Returns the number of errors.
+    sample = SampleDir(platform, os.path.basename(os.path.dirname(sample_folder)), sample_folder)
+    errors = check_samples([sample], git_index)
+    for error in errors:
+        print(error.message)
+    return len(errors)
 
 def main():
-        
-        script_location = os.path.dirname(os.path.realpath(__file__))
-        repo_root = os.path.abspath(os.path.join(script_location, "..", "..", "src"))
-        errors_found = 0
+
+        parser = argparse.ArgumentParser(description="Check the casing of the file names of the samples. Prints the errors, or 0 if there are none.")
+        parser.add_argument("repo", nargs="?", help="path to the repository root; defaults to the repository of this script")
+        parser.add_argument("--staged", action="store_true", help="only check the samples with staged changes, and the same samples on the other platforms")
+        parser.add_argument("--paths", nargs="+", help="only check the samples containing these paths, relative to the repository root, and the same samples on the other platforms")
+        args = parser.parse_args()
+
+        if args.repo:
+            # The pre-commit hook passes the root of the repository.
+            repo_root = os.path.abspath(os.path.join(args.repo, "src"))
+        else:
+            script_location = os.path.dirname(os.path.realpath(__file__))
+            repo_root = os.path.abspath(os.path.join(script_location, "..", "..", "src"))
         platforms = ["MAUI", "WPF", "WinUI"]
-        for platform in platforms:
-            samples_folder = get_platform_samples_root(platform, repo_root)
-            for category in os.listdir(samples_folder):
-              category_folder = os.path.join(samples_folder, category)
-              for sample in os.listdir(category_folder):
-                sample_folder = os.path.join(category_folder, sample)
-                errors_found = errors_found + check_file_names(sample_folder)
-        if (errors_found == 0):
-            print(errors_found)
+        if args.staged or args.paths:
+            # Only the affected sample folders are listed and walked, rather than the whole tree.
+            paths = list(args.paths or [])
+            if args.staged:
+                # Only this mode runs git, so the full-tree check doesn't import it.
+                from git_index import run_git
+                paths += run_git(os.path.dirname(repo_root), "diff", "--cached", "--name-only", "-z")
+            errors = check_samples(get_affected_samples(repo_root, paths, platforms))
+        else:
+            # The sample folders are walked rather than listed from the git index: loading the index costs
+            # more than walking the folders of this tree.
+            # Every sample of every platform goes into one index, which reports all the errors at once.
+            errors = check_samples(iter_samples(repo_root, platforms))
+        for error in errors:
+            print(error.message)
+        if (len(errors) == 0):
+            print(0)
 
 if __name__=="__main__":
-    main()
\ No newline at end of file
+    main()
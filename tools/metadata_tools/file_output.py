@@ -0,0 +1,50 @@
+import io
+import os
+import tempfile
+
+# The umask can only be read by setting it, which changes it for the whole process. It is read once
+# when the module is loaded, before any thread or worker writes files through it.
+UMASK = os.umask(0)
+os.umask(UMASK)
+
+def render_text(text, encoding=None, newline=None):
+    '''
+    Returns the bytes that writing text to a file opened with open(path, 'w', encoding=encoding, newline=newline) would produce
+    '''
+    buffer = io.BytesIO()
+    wrapper = io.TextIOWrapper(buffer, encoding=encoding, newline=newline)
+    wrapper.write(text)
+    wrapper.flush()
+    data = buffer.getvalue()
+    wrapper.close()
+    return data
+
+def write_if_changed(path, text, encoding=None, newline=None):
+    '''
+    Writes text to path only if the file content would change, so that unchanged files keep their modification time.
+    The file is replaced atomically through a temporary file in the same folder.
+    Returns True if the file was written.
+    '''
+    data = render_text(text, encoding, newline)
+    try:
+        with open(path, 'rb') as file:
+            if file.read() == data:
+                return False
+    except FileNotFoundError:
+        pass
+
+    directory = os.path.dirname(os.path.abspath(path))
+    handle, temp_path = tempfile.mkstemp(dir=directory, prefix=".", suffix=".tmp")
+    try:
+        with os.fdopen(handle, 'wb') as temp_file:
+            temp_file.write(data)
+        # mkstemp creates the file readable by the owner only, keep the permissions of the file being replaced.
+        if os.path.exists(path):
+            os.chmod(temp_path, os.stat(path).st_mode)
+        else:
+            os.chmod(temp_path, 0o666 & ~UMASK)
+        os.replace(temp_path, path)
+    except BaseException:
+        os.remove(temp_path)
+        raise
+    return True
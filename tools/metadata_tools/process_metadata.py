@@ -1,19 +1,19 @@
 from sample_metadata import *
+from sample_manifest import *
+from file_output import write_if_changed
+from sample_documents import sample_documents
+from stage_timings import stage_timings
+import concurrent.futures
+import collections
+import time
 import urllib.parse
+import argparse
 import sys
 import os
 
-def get_platform_samples_root(platform, sample_root):
-    '''
-    Gets the root directory for each platform
-    '''
-    if (platform == "WPF"):
-        return os.path.join(sample_root, "WPF", "WPF.Viewer", "Samples")
-    if (platform == "WinUI"):
-        return os.path.join(sample_root, "WinUI", "ArcGIS.WinUI.Viewer", "Samples")
-    if (platform == "MAUI"):
-        return os.path.join(sample_root, "MAUI", "Maui.Samples", "Samples")
-    raise AssertionError(None, None)
+sys.path.append(os.path.join(os.path.dirname(os.path.realpath(__file__)), "..", "shared"))
+from sample_tree import get_platform_samples_root, iter_samples
+from git_index import load_git_index
 
 def get_relative_path_to_samples_from_platform_root(platform):
     '''
@@ -32,6 +32,7 @@ def write_samples_toc(platform_dir, relative_path_to_samples, samples_in_categor
     '''
     sample_in_categories is a dictionary of categories, each key is a list of sample_metadata
     platform_dir is where the readme.md file should be written
+    Returns True if the TOC changed
     '''
     readme_text = "# Table of contents\n\n"
 
@@ -54,10 +55,16 @@ def write_samples_toc(platform_dir, relative_path_to_samples, samples_in_categor
     readme_text = readme_text[:-1]   
 
     readme_path = os.path.join(platform_dir, "../..", "readme.md")
-    with open(readme_path, 'w+') as file:
-        file.write(readme_text)
+    return write_if_changed(readme_path, readme_text)
 
-def update_attribute(sample, sample_dir):
+def update_attribute(sample, sample_dir, documents=None):
+    '''
+    Rewrites the Sample attribute in the sample's .xaml.cs file from the metadata.
+    documents is an optional sample_documents for the sample folder, used to avoid re-reading files
+    Returns True if the file changed
+    '''
+    if documents is None:
+        documents = sample_documents(sample_dir)
     try:
         # Get the formal name of the sample
         if '\\' in sample_dir:
@@ -73,148 +80,248 @@ def update_attribute(sample, sample_dir):
         # Open the file
         path_to_source = os.path.join(sample_dir, name + ending)
 
-        with open(path_to_source, 'r') as f:
-            lines = f.readlines()
-            i = 0
-            start_found = False
-
-            # Use an indexed while loop so we can delete sections of lines
-            while i < len(lines):
-                line = lines[i]
-
-                # Check if the line is the start of the attributes
-                if ".Sample(" in line and "[" in line:
-                    #store the start index
-                    start = i
-                    start_found = True
-
-                # Check for the end of the attributes
-                if "]" in line and start_found:
-                    # Store the end index
-                    end = i
-                    # Delete the existing attributes
-                    del lines[start:end+1]
-
-                    # Create the new attributes
-                    new_attributes = "    [ArcGIS.Samples.Shared.Attributes.Sample(\n"
-                    new_attributes += "        name: \"" + sample.friendly_name + "\",\n"
-                    new_attributes += "        category: \"" + sample.category + "\",\n"
-                    new_attributes += "        description: \"" + sample.description.replace("\"", "\\\"") + "\",\n"
-
-                    # Add the instructions
-                    if type(sample.how_to_use) is str:
-                        instructions = sample.how_to_use
-                    elif type(sample.how_to_use) is list and len(sample.how_to_use)>0:
-                        instructions = sample.how_to_use[0]
-                    else:
-                        instructions = ""
-
-                    # Instructions can have multiple items, we only add the first one.
-                    if "\n" in instructions:
-                        instructions = instructions.split("\n")[0]
-                    instructions = "        instructions: \"" + instructions.replace("\"", "\\\"") + "\""
-                        
-                    new_attributes += instructions
-
-                    # Add the tags
-                    tags = []
-                    if type(sample.keywords) is list and len(sample.keywords)>0:
-                        tags = sample.keywords
-                        
-                    if len(tags)>0:
-                        new_attributes += ",\n        tags: new[] { "
-                        for tag in tags:
-                            new_attributes += "\"" + tag +"\", "
-                        # Remove the trailing comma-space
-                        new_attributes = new_attributes[:-2]
-                        new_attributes += " }"
-
-                    # Add the closing characters
-                    new_attributes += ")]\n"
-
-                    # Add the new attributes
-                    lines.insert(start, new_attributes)
-
-                    # Break and write the revised file.
-                    break
-                i=i+1
-            f.close()
-
-        # Rewrite the file with updated attributes.
-        with open(path_to_source, "w") as file:
-            file.seek(0)
-            file.write(''.join(lines))
-            file.close()
+        lines = documents.read_lines(name + ending)
+        i = 0
+        start_found = False
+
+        # Use an indexed while loop so we can delete sections of lines
+        while i < len(lines):
+            line = lines[i]
+
+            # Check if the line is the start of the attributes
+            if ".Sample(" in line and "[" in line:
+                #store the start index
+                start = i
+                start_found = True
+
+            # Check for the end of the attributes
+            if "]" in line and start_found:
+                # Store the end index
+                end = i
+                # Delete the existing attributes
+                del lines[start:end+1]
+
+                # Create the new attributes
+                new_attributes = "    [ArcGIS.Samples.Shared.Attributes.Sample(\n"
+                new_attributes += "        name: \"" + sample.friendly_name + "\",\n"
+                new_attributes += "        category: \"" + sample.category + "\",\n"
+                new_attributes += "        description: \"" + sample.description.replace("\"", "\\\"") + "\",\n"
+
+                # Add the instructions
+                if type(sample.how_to_use) is str:
+                    instructions = sample.how_to_use
+                elif type(sample.how_to_use) is list and len(sample.how_to_use)>0:
+                    instructions = sample.how_to_use[0]
+                else:
+                    instructions = ""
+
+                # Instructions can have multiple items, we only add the first one.
+                if "\n" in instructions:
+                    instructions = instructions.split("\n")[0]
+                instructions = "        instructions: \"" + instructions.replace("\"", "\\\"") + "\""
+                    
+                new_attributes += instructions
+
+                # Add the tags
+                tags = []
+                if type(sample.keywords) is list and len(sample.keywords)>0:
+                    tags = sample.keywords
+                    
+                if len(tags)>0:
+                    new_attributes += ",\n        tags: new[] { "
+                    for tag in tags:
+                        new_attributes += "\"" + tag +"\", "
+                    # Remove the trailing comma-space
+                    new_attributes = new_attributes[:-2]
+                    new_attributes += " }"
+
+                # Add the closing characters
+                new_attributes += ")]\n"
+
+                # Add the new attributes
+                lines.insert(start, new_attributes)
+
+                # Break and write the revised file.
+                break
+            i=i+1
+
+        # Rewrite the file with updated attributes, if they changed.
+        source_text = ''.join(lines)
+        documents.set_text(name + ending, source_text)
+        return write_if_changed(path_to_source, source_text)
 
     except Exception as e:
         print("Error with sample: "+sample_dir+"-"+str(e))
+        return False
+
+def get_sample_dirs(platform, sample_root, git_index=None):
+    '''
+    Returns a list of (category directory, sample directory name) pairs for the platform,
+    in the order the samples are processed.
+    The samples are listed from git_index if provided, instead of scanning the category folders.
+    '''
+    samples = git_index.iter_samples(sample_root, [platform]) if git_index is not None else iter_samples(sample_root, [platform])
+    return [(os.path.dirname(sample.path), os.path.basename(sample.path)) for sample in samples]
+
+# The outcome of process_sample: the sample_metadata, its manifest entry, the number of files changed and the timing records.
+sample_result = collections.namedtuple("sample_result", ["sample", "entry", "changed_files", "timings"])
+
+def process_sample(platform, category_dir, sample_dir, previous_entry=None, timings_enabled=False):
+    '''
+    Syncs the metadata and attributes of a single sample with its readme.
+    Returns a sample_result, or None if the directory is not a sample.
+    If the inputs of the sample still match previous_entry the sample is not processed again.
+    Runs in a worker process when main is started with --jobs.
+    '''
+    # skip category directories
+    sample = sample_metadata()
+    sample_path = os.path.join(category_dir, sample_dir)
+    path_to_readme = os.path.join(sample_path, "readme.md")
+
+    path_to_json = os.path.join(sample_path, "readme.metadata.json")
+    if not os.path.exists(path_to_readme):
+        print(f"skipping path; does not exist: {path_to_readme}")
+        return None
+    if not os.path.exists(path_to_json):
+        print(f"skipping path; does not exist: {path_to_json}")
+        return None
+
+    timings = stage_timings(timings_enabled)
+    sample_name = os.path.basename(category_dir) + "/" + sample_dir
+
+    # every stage reads the sample's files through the same documents, so each file is read once
+    documents = sample_documents(sample_path)
+
+    # skip samples that haven't changed since the last run
+    if previous_entry is not None:
+        with timings.time("manifest check", platform, sample_name):
+            unchanged = previous_entry["inputs"] == fingerprint_sample(sample_path, documents)
+        if unchanged:
+            return sample_result(sample_from_entry(previous_entry), previous_entry, 0, timings.records)
+
+    with timings.time("readme parse", platform, sample_name):
+        sample.populate_from_readme(platform, path_to_readme, path_to_json, documents)
+    with timings.time("snippet discovery", platform, sample_name):
+        sample.populate_snippets_from_folder(platform, path_to_readme, documents)
+        sample.populate_snippets_from_class(platform, path_to_readme, documents)
+
+    changed_files = 0
+    with timings.time("json flush", platform, sample_name):
+        if sample.flush_to_json(path_to_json, documents):
+            changed_files += 1
+
+    # update attributes in the sample code files
+    with timings.time("update attribute", platform, sample_name):
+        if update_attribute(sample, sample_path, documents):
+            changed_files += 1
+
+    # fingerprint the sample as written, so an unchanged sample matches on the next run
+    with timings.time("manifest update", platform, sample_name):
+        entry = make_entry(sample, fingerprint_sample(sample_path, documents))
+    documents.release()
+    return sample_result(sample, entry, changed_files, timings.records)
+
+def process_samples(platform, sample_dirs, previous_entries, executor=None, jobs=1, timings_enabled=False):
+    '''
+    Processes the samples, in parallel across jobs worker processes if an executor is provided.
+    previous_entries holds the manifest entry for each sample in sample_dirs, or None.
+    Results are returned in the same order as sample_dirs regardless of which worker finished first.
+    '''
+    category_dirs = [category_dir for category_dir, _ in sample_dirs]
+    names = [sample_dir for _, sample_dir in sample_dirs]
+    platforms = [platform] * len(sample_dirs)
+    timings = [timings_enabled] * len(sample_dirs)
+    if executor is None:
+        return list(map(process_sample, platforms, category_dirs, names, previous_entries, timings))
+
+    # Hand out work in chunks to keep the inter-process overhead low.
+    chunksize = max(1, len(sample_dirs) // (jobs * 4))
+    return list(executor.map(process_sample, platforms, category_dirs, names, previous_entries, timings, chunksize=chunksize))
 
 def main():
     '''
-    Usage: python process_metadata.py {path_to_samples (ends in src)} (optional)
+    Usage: python process_metadata.py {path_to_samples (ends in src)} (optional) [--jobs N] [--manifest PATH] [--force] [--timings [PATH]] [--git-index]
         Location of script being run will be used for a relative path if path to samples is not specified.
+        --jobs N spreads the per-sample work across N worker processes; 0 uses one per CPU.
+        Samples that haven't changed since the last run are skipped, unless --force is specified.
+        --timings writes the wall time and call count of each stage to a json report.
+        --git-index lists the samples from the git index instead of scanning the category folders.
     '''
-
-    if len(sys.argv) < 2:
+    parser = argparse.ArgumentParser(description="Sync sample metadata, attributes and TOCs with the sample readmes.")
+    parser.add_argument("sample_root", nargs="?", help="path to samples (ends in src)")
+    parser.add_argument("-j", "--jobs", type=int, default=1, help="number of worker processes; 0 uses one per CPU")
+    parser.add_argument("--manifest", help=f"path to the manifest of processed samples; defaults to {MANIFEST_FILE_NAME} in the samples path")
+    parser.add_argument("-f", "--force", action="store_true", help="process every sample, ignoring the manifest")
+    parser.add_argument("--timings", nargs="?", const="metadata_timings.json", metavar="PATH",
+                        help="write per-stage timings to a json report (default: metadata_timings.json)")
+    parser.add_argument("--git-index", action="store_true", help="list the samples from the git index instead of scanning the category folders")
+    args = parser.parse_args()
+    start_time = time.perf_counter()
+    timings = stage_timings(args.timings is not None)
+
+    if args.sample_root is None:
         # get the location of the samples relative to this script in the tools folder
         script_location = os.path.dirname(os.path.realpath(__file__))
         sample_root = os.path.abspath(os.path.join(script_location, "..", "..", "src"))
     else:
-        sample_root = sys.argv[1]
-
-    for platform in ["WPF", "WinUI", "MAUI"]:
-        # make a list of samples, so that build_all_csproj.bat can be produced
-        list_of_sample_dirs = []
-        list_of_samples = {}
-        skipped_categories = False
-        for r, d, f in os.walk(get_platform_samples_root(platform, sample_root)):
-            if not skipped_categories:
-                skipped_categories = True
-                continue
-            
-            d.sort()
-            for sample_dir in d:
-
-                # the SketchOnMap contains a resources folder which is unintentionally included in the list of sample directories as a resut of the os.walk
-                # we ignore the resources folder here to prevent an error being thrown in the output.
-                if sample_dir == 'resources':
-                    continue
-
-                # skip category directories
-                sample = sample_metadata()
-                path_to_readme = os.path.join(r, sample_dir, "readme.md")
-
-                path_to_json = os.path.join(r, sample_dir, "readme.metadata.json")
-                if not os.path.exists(path_to_readme):
-                    print(f"skipping path; does not exist: {path_to_readme}")
-                    continue
-                if not os.path.exists(path_to_json):
-                    print(f"skipping path; does not exist: {path_to_json}")
+        sample_root = args.sample_root
+
+    manifest = sample_manifest(args.manifest or os.path.join(sample_root, MANIFEST_FILE_NAME))
+    if not args.force:
+        manifest.load()
+    previous_samples = manifest.samples
+    manifest.samples = {}
+
+    git_index = None
+    if args.git_index:
+        with timings.time("git index", "all"):
+            git_index = load_git_index(sample_root)
+        if git_index is None:
+            print("Unable to read the git index, scanning the sample folders instead")
+
+    jobs = args.jobs or os.cpu_count()
+    executor = None
+    if jobs > 1:
+        executor = concurrent.futures.ProcessPoolExecutor(max_workers=jobs)
+
+    changed_files = 0
+    try:
+        for platform in ["WPF", "WinUI", "MAUI"]:
+            list_of_samples = {}
+            with timings.time("sample discovery", platform):
+                sample_dirs = get_sample_dirs(platform, sample_root, git_index)
+            keys = [get_sample_key(sample_root, os.path.join(r, sample_dir)) for r, sample_dir in sample_dirs]
+            previous_entries = [previous_samples.get(key) for key in keys]
+            results = process_samples(platform, sample_dirs, previous_entries, executor, jobs, timings.enabled)
+            for key, result in zip(keys, results):
+                if result is None:
                     continue
-                sample.populate_from_readme(platform, path_to_readme, path_to_json)
-                sample.populate_snippets_from_folder(platform, path_to_readme)
-                sample.populate_snippets_from_class(platform, path_to_readme)
-
-                # read existing packages from metadata
-                if os.path.exists(path_to_json):
-                    metadata_based_sample = sample_metadata()
-                    metadata_based_sample.populate_from_json(path_to_json)
-                sample.flush_to_json(path_to_json)
-
-                # update attributes in the sample code files
-                update_attribute(sample, os.path.join(r, sample_dir))
-
-                list_of_sample_dirs.append(sample_dir)
+                sample = result.sample
+                changed_files += result.changed_files
+                timings.merge(result.timings)
+                manifest.samples[key] = result.entry
 
                 # track samples in each category to enable TOC generation
                 if sample.category in list_of_samples.keys():
                     list_of_samples[sample.category].append(sample)
                 else:
                     list_of_samples[sample.category] = [sample]
-                
-        # write out samples TOC
-        write_samples_toc(get_platform_samples_root(platform, sample_root), get_relative_path_to_samples_from_platform_root(platform), list_of_samples)
-    
+
+            # write out samples TOC; it is rendered on every run, and only written when its content changed
+            platform_dir = get_platform_samples_root(platform, sample_root)
+            with timings.time("toc write", platform):
+                if write_samples_toc(platform_dir, get_relative_path_to_samples_from_platform_root(platform), list_of_samples):
+                    changed_files += 1
+    finally:
+        if executor is not None:
+            executor.shutdown()
+
+    manifest.save()
+    print(f"{changed_files} files changed")
+
+    if timings.enabled:
+        timings.write(args.timings, time.perf_counter() - start_time)
+        print(f"Timings written to {args.timings}")
     return
 
 if __name__ == "__main__":
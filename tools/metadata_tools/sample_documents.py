@@ -0,0 +1,70 @@
+import io
+import json
+import os
+import sys
+from file_output import render_text
+# Modules shared between the tools live in tools/shared.
+sys.path.append(os.path.join(os.path.dirname(os.path.realpath(__file__)), "..", "shared"))
+from sample_folder import get_sample_folder
+
+class sample_documents:
+    '''
+    Loads the files of a single sample at most once and hands the contents to every processing stage.
+    The folder listing comes from one shared snapshot of the sample folder.
+    Files are cached as bytes; text is decoded the same way open(path, 'r') would.
+    Writes made through the stages are recorded with set_text so the cache stays current.
+    Call release once the sample has been flushed.
+    '''
+
+    def __init__(self, sample_dir):
+        self.sample_dir = sample_dir
+        self.contents = {}
+        self.metadata = None
+
+    @property
+    def folder(self):
+        '''
+        Returns the SampleFolder snapshot of the sample folder
+        '''
+        return get_sample_folder(self.sample_dir)
+
+    def read_bytes(self, file_name):
+        '''
+        Returns the raw contents of a file in the sample folder. Raises OSError if it can't be read.
+        '''
+        if file_name not in self.contents:
+            with open(os.path.join(self.sample_dir, file_name), 'rb') as file:
+                self.contents[file_name] = file.read()
+        return self.contents[file_name]
+
+    def read_text(self, file_name):
+        '''
+        Returns the text of a file in the sample folder. Raises OSError if it can't be read.
+        '''
+        return io.TextIOWrapper(io.BytesIO(self.read_bytes(file_name))).read()
+
+    def read_lines(self, file_name):
+        '''
+        Returns the lines of a file in the sample folder, as readlines() would
+        '''
+        return io.TextIOWrapper(io.BytesIO(self.read_bytes(file_name))).readlines()
+
+    def get_metadata(self):
+        '''
+        Returns the parsed readme.metadata.json. The result is shared between stages and must not be modified.
+        '''
+        if self.metadata is None:
+            self.metadata = json.loads(self.read_text("readme.metadata.json"))
+        return self.metadata
+
+    def set_text(self, file_name, text):
+        '''
+        Records text that was written to a file in the sample folder
+        '''
+        self.contents[file_name] = render_text(text)
+        if file_name == "readme.metadata.json":
+            self.metadata = None
+
+    def release(self):
+        self.contents = {}
+        self.metadata = None
@@ -0,0 +1,151 @@
+import hashlib
+import json
+import os
+from sample_metadata import sample_metadata
+from file_output import write_if_changed
+from sample_documents import sample_documents
+from attribute_scanner import scan_lines
+
+# Bump when the layout of the manifest changes.
+MANIFEST_VERSION = 2
+
+# The name of the manifest file written to the root of the samples.
+MANIFEST_FILE_NAME = ".metadata_manifest.json"
+
+def hash_bytes(data):
+    return hashlib.sha1(data).hexdigest()
+
+def hash_file(path):
+    '''
+    Returns the hash of the file contents, or None if the file can't be read
+    '''
+    try:
+        with open(path, 'rb') as file:
+            return hash_bytes(file.read())
+    except OSError:
+        return None
+
+def hash_document(documents, file_name):
+    '''
+    Returns the hash of a file in the sample folder, or None if the file can't be read
+    '''
+    try:
+        return hash_bytes(documents.read_bytes(file_name))
+    except OSError:
+        return None
+
+def get_generator_hash():
+    '''
+    Returns a hash of the metadata scripts, so that changes to the tooling invalidate the manifest
+    '''
+    script_location = os.path.dirname(os.path.realpath(__file__))
+    hasher = hashlib.sha1()
+    for script in ["process_metadata.py", "sample_metadata.py", "sample_manifest.py", "file_output.py", "sample_documents.py",
+                   "stage_timings.py",
+                   os.path.join("..", "shared", "readme_parser.py"), os.path.join("..", "shared", "sample_folder.py"),
+                   os.path.join("..", "shared", "attribute_scanner.py"), os.path.join("..", "shared", "sample_tree.py"),
+                   os.path.join("..", "shared", "git_index.py")]:
+        with open(os.path.join(script_location, script), 'rb') as file:
+            hasher.update(file.read())
+    return hasher.hexdigest()
+
+def get_sample_key(sample_root, sample_path):
+    '''
+    Returns the manifest key for a sample, e.g. WPF/WPF.Viewer/Samples/Map/DisplayMap
+    '''
+    return os.path.relpath(sample_path, sample_root).replace(os.sep, "/")
+
+def fingerprint_sample(sample_path, documents=None):
+    '''
+    Hashes everything process_metadata reads for a sample:
+    the readme, the existing json, the .cs/.xaml file list and contents of the .cs files,
+    and the sources referenced through ArcGIS.Samples.Shared.Attributes.ClassFile
+    documents is an optional sample_documents for the sample folder, used to avoid re-reading files
+    '''
+    if documents is None:
+        documents = sample_documents(sample_path)
+
+    sources = sorted(documents.folder.files(".xaml", ".cs"))
+
+    source_hasher = hashlib.sha1()
+    class_files = []
+    for file in sources:
+        source_hasher.update(file.encode("utf-8") + b"\0")
+        if not file.endswith(".cs"):
+            continue
+        try:
+            contents = documents.read_bytes(file)
+        except OSError:
+            continue
+        source_hasher.update(contents)
+        class_files.extend(scan_lines(documents.read_lines(file)).class_files)
+
+    # Class files outside of the sample folder are relative to the viewer project.
+    class_file_hashes = {}
+    for class_file in sorted(set(class_files)):
+        relative_path = class_file.replace("\\", "/")
+        if "/" in relative_path:
+            class_file_hashes[class_file] = hash_file(os.path.join(sample_path, "..", "..", "..", relative_path))
+
+    return {
+        "readme": hash_document(documents, "readme.md"),
+        "metadata": hash_document(documents, "readme.metadata.json"),
+        "sources": source_hasher.hexdigest(),
+        "class_files": class_file_hashes,
+    }
+
+def make_entry(sample, inputs):
+    '''
+    Creates the manifest entry for a processed sample.
+    Stores the fields needed to write the TOC, so that unchanged samples don't have to be re-read.
+    '''
+    return {
+        "inputs": inputs,
+        "toc": {
+            "category": sample.category,
+            "formal_name": sample.formal_name,
+            "friendly_name": sample.friendly_name,
+            "description": sample.description,
+        },
+    }
+
+def sample_from_entry(entry):
+    '''
+    Recreates the TOC fields of a sample_metadata from its manifest entry
+    '''
+    sample = sample_metadata()
+    for key, value in entry["toc"].items():
+        setattr(sample, key, value)
+    return sample
+
+class sample_manifest:
+    '''
+    Persisted record of the inputs of every sample as of the last run of process_metadata.
+    Samples whose inputs still match the recorded hashes are skipped.
+    '''
+
+    def __init__(self, path):
+        self.path = path
+        self.generator = get_generator_hash()
+        self.samples = {}
+
+    def load(self):
+        '''
+        Reads the manifest from disk. A missing, unreadable or outdated manifest is treated as empty.
+        '''
+        try:
+            with open(self.path, 'r') as manifest_file:
+                data = json.load(manifest_file)
+        except (OSError, ValueError):
+            return
+        if data.get("version") != MANIFEST_VERSION or data.get("generator") != self.generator:
+            return
+        self.samples = data.get("samples", {})
+
+    def save(self):
+        data = {
+            "version": MANIFEST_VERSION,
+            "generator": self.generator,
+            "samples": self.samples,
+        }
+        write_if_changed(self.path, json.dumps(data, indent=1, sort_keys=True))
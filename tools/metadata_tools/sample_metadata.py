@@ -4,6 +4,12 @@ import sys
 import os
 import re
 from slugify import slugify
+# Modules shared between the tools live in tools/shared.
+sys.path.append(os.path.join(os.path.dirname(os.path.realpath(__file__)), "..", "shared"))
+from readme_parser import parse_readme
+from attribute_scanner import get_class_file_snippets, scan_lines
+from file_output import write_if_changed
+from sample_documents import sample_documents
 
 class sample_metadata:
     
@@ -58,21 +64,25 @@ class sample_metadata:
 
         return
     
-    def populate_from_readme(self, platform, path_to_readme, path_to_json):
-        
+    def populate_from_readme(self, platform, path_to_readme, path_to_json, documents=None):
+        '''
+        Populate the sample from its readme.md
+        documents is an optional sample_documents for the sample folder, used to avoid re-reading files
+        '''
+        if documents is None:
+            documents = sample_documents(os.path.dirname(path_to_readme))
+
         # read the readme content into a string
         readme_contents = ""
         try:
-            readme_file = open(path_to_readme, "r")
-            readme_contents = readme_file.read()
-            readme_file.close()
+            readme_contents = documents.read_text(os.path.basename(path_to_readme))
         except Exception as err:
             # not a sample, skip
             print(f"Error populating sample from readme - {path_to_readme} - {err}")
             return
         
-        # break into sections
-        readme_parts = readme_contents.split("\n\n") # a blank line is two newlines
+        # break into sections, a blank line is two newlines
+        readme_parts = list(parse_readme(readme_contents).paragraphs)
 
         # extract human-readable name
         title_line = readme_parts[0].strip()
@@ -87,10 +97,9 @@ class sample_metadata:
 
         # Load existing metadata if present
         if os.path.exists(path_to_json):
-            with open(path_to_json, 'r') as json_file:
-                existing_metadata = json.load(json_file)
-                if "redirect_from" in existing_metadata:
-                    self.redirect_from = existing_metadata["redirect_from"]
+            existing_metadata = documents.get_metadata()
+            if "redirect_from" in existing_metadata:
+                self.redirect_from = existing_metadata["redirect_from"]
 
         # category is the name of the folder containing the sample folder
         self.category = pathparts[-3]
@@ -134,7 +143,14 @@ class sample_metadata:
 
         return
 
-    def flush_to_json(self, path_to_json):
+    def flush_to_json(self, path_to_json, documents=None):
+        '''
+        Writes the metadata to the json file.
+        documents is an optional sample_documents for the sample folder, used to avoid re-reading files
+        Returns True if the file content changed.
+        '''
+        if documents is None:
+            documents = sample_documents(os.path.dirname(path_to_json))
 
         data = {}
 
@@ -150,62 +166,51 @@ class sample_metadata:
         data["offline_data"] = self.offline_data
         data["formal_name"] = self.formal_name
 
-        with open(path_to_json, 'r') as json_file:
-            existing_metadata = json.load(json_file)
-            if set(data["redirect_from"]).issubset(set(existing_metadata["redirect_from"])):
-                data["redirect_from"] = existing_metadata["redirect_from"]
-    
-        with open(path_to_json, 'w+') as json_file:
-            json.dump(data, json_file, indent=4, sort_keys=True)
+        existing_metadata = documents.get_metadata()
+        if set(data["redirect_from"]).issubset(set(existing_metadata["redirect_from"])):
+            data["redirect_from"] = existing_metadata["redirect_from"]
 
-        return
+        # only rewrite the file if the metadata changed
+        json_text = json.dumps(data, indent=4, sort_keys=True)
+        documents.set_text(os.path.basename(path_to_json), json_text)
+        return write_if_changed(path_to_json, json_text)
 
-    def populate_snippets_from_folder(self, platform, path_to_readme):
+    def populate_snippets_from_folder(self, platform, path_to_readme, documents=None):
         '''
         Take a path to a readme file
         Populate the snippets from: any .xaml, .cs files in the directory; 
+        documents is an optional sample_documents for the sample folder, used to avoid re-listing the folder
         '''
         # populate files in the directory
         sample_dir = os.path.split(path_to_readme)[0]
-        for file in os.listdir(sample_dir):
-            if os.path.splitext(file)[1] in [".xaml", ".cs"]:
-                self.source_files.append(file)        
+        if documents is None:
+            documents = sample_documents(sample_dir)
+        for file in documents.folder.files(".xaml", ".cs"):
+            self.source_files.append(file)
         # order the source files such that the .cs file appears first
         self.source_files.sort(reverse=True)
 
-    def populate_snippets_from_class(self, platform, path_to_readme):
+    def populate_snippets_from_class(self, platform, path_to_readme, documents=None):
         '''
         Take a path to a readme file
         Populate the snippets from the sample .cs file;
+        documents is an optional sample_documents for the sample folder, used to avoid re-reading files
         '''
         # populate from .cs files in the directory
         sample_dir = os.path.split(path_to_readme)[0]
+        if documents is None:
+            documents = sample_documents(sample_dir)
         additionalFiles = []
-        for file in os.listdir(sample_dir):
-            if os.path.splitext(file)[1] in [".cs"]:
-                class_contents = ""
-                try:
-                    class_file = open(os.path.join(sample_dir, file), "r")
-                    class_contents = class_file.readlines()
-                    class_file.close()
-                except Exception as err:
-                    print(f"Error populating metadata from sample - {file} - {err}")
-                    return
-                # Loop through lines in the class file to check for any additional files such as helpers or converters.
-                for line in class_contents:
-                    if "ArcGIS.Samples.Shared.Attributes.ClassFile" in line:
-                        additional_file_paths = re.findall("\"([a-zA-Z0-9.\\\/]*)\"", line)
-                        # We are only interested in adding files that are not contained within the same folder as our class files as these are
-                        # added in `populate_snippets_from_folder`. Here we check for \\ and / characters in the file path and then reconstruct the path
-                        # as required.
-                        for additional_file_path in additional_file_paths:
-                            if "\\" in additional_file_path:
-                                additional_file_path_string = str(additional_file_path)
-                                corrected_path = additional_file_path_string.replace("\\\\", "/")
-                                additionalFiles.append("../../../" + corrected_path)
-                            elif "/" in additional_file_path:
-                                additionalFiles.append("../../../" + additional_file_path)
-                        break
+        for file in documents.folder.files(".cs"):
+            try:
+                # Check the attributes for any additional files such as helpers or converters.
+                attributes = scan_lines(documents.read_lines(file))
+            except Exception as err:
+                print(f"Error populating metadata from sample - {file} - {err}")
+                return
+            # We are only interested in adding files that are not contained within the same folder as our class files as these are
+            # added in `populate_snippets_from_folder`.
+            additionalFiles.extend(get_class_file_snippets(attributes.class_files))
 
         additionalFiles.sort()
         for additionalFile in additionalFiles:
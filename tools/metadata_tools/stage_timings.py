@@ -0,0 +1,75 @@
+import contextlib
+import json
+import time
+
+# The number of samples listed in the slowest samples section of the report.
+SLOWEST_SAMPLE_COUNT = 20
+
+class stage_timings:
+    '''
+    Records the wall time of each stage of process_metadata, per platform and sample.
+    When disabled, timing a stage does nothing.
+    '''
+
+    def __init__(self, enabled=True):
+        self.enabled = enabled
+        # list of [stage, platform, sample key or None, seconds]
+        self.records = []
+
+    @contextlib.contextmanager
+    def time(self, stage, platform, sample=None):
+        '''
+        Times the body of a with statement as one call of the stage
+        '''
+        if not self.enabled:
+            yield
+            return
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.records.append([stage, platform, sample, time.perf_counter() - start])
+
+    def merge(self, records):
+        '''
+        Adds the records of another stage_timings, e.g. one returned by a worker process
+        '''
+        self.records.extend(records)
+
+    def report(self, total_seconds):
+        '''
+        Summarizes the records into totals per stage, a per-platform breakdown and the slowest samples
+        '''
+        stages = {}
+        platforms = {}
+        samples = {}
+        for stage, platform, sample, seconds in self.records:
+            add_call(stages, stage, seconds)
+            platform_report = platforms.setdefault(platform, {"seconds": 0.0, "samples": 0, "stages": {}})
+            platform_report["seconds"] += seconds
+            add_call(platform_report["stages"], stage, seconds)
+            if sample is None:
+                continue
+            key = (platform, sample)
+            if key not in samples:
+                samples[key] = {"sample": sample, "platform": platform, "seconds": 0.0, "stages": {}}
+                platform_report["samples"] += 1
+            samples[key]["seconds"] += seconds
+            add_call(samples[key]["stages"], stage, seconds)
+
+        slowest = sorted(samples.values(), key=lambda s: (-s["seconds"], s["platform"], s["sample"]))[:SLOWEST_SAMPLE_COUNT]
+        return {
+            "total_seconds": total_seconds,
+            "stages": stages,
+            "platforms": platforms,
+            "slowest_samples": slowest,
+        }
+
+    def write(self, path, total_seconds):
+        with open(path, 'w') as report_file:
+            json.dump(self.report(total_seconds), report_file, indent=4)
+
+def add_call(stages, stage, seconds):
+    entry = stages.setdefault(stage, {"seconds": 0.0, "calls": 0})
+    entry["seconds"] += seconds
+    entry["calls"] += 1
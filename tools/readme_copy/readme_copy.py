@@ -3,23 +3,15 @@ import sys
 import os
 import copy
 
+sys.path.append(os.path.join(os.path.dirname(os.path.realpath(__file__)), "..", "shared"))
+from sample_tree import get_platform_samples_root, iter_samples
+
 excluded_samples = [
     ("ChangeBasemap", "WinUI"),
     ("UpdateBasemapForContrastAccessibility", "MAUI"),
     ("UpdateBasemapForContrastAccessibility", "WinUI")
 ]
 
-def get_platform_samples_root(platform, sample_root):
-    '''
-    Gets the root directory for each platform
-    '''
-    if (platform == "WPF"):
-        return os.path.join(sample_root, "WPF", "WPF.Viewer", "Samples")
-    if (platform == "WinUI"):
-        return os.path.join(sample_root, "WinUI", "ArcGIS.WinUI.Viewer", "Samples")
-    if (platform == "MAUI"):
-        return os.path.join(sample_root, "MAUI", "Maui.Samples", "Samples")
-    raise AssertionError(None, None)
 def replace_readmes(category, formal_name, sample_root):
     wpfcontent = None
     try:
@@ -90,9 +82,8 @@ def main():
             sample_root = os.path.abspath(os.path.join(script_location, "..", "..", "src"))
         else:
             sample_root = sys.argv[1]
-        for category in os.listdir(get_platform_samples_root("WPF", sample_root)):
-            for sample in os.listdir( os.path.join(get_platform_samples_root("WPF", sample_root), category) ):
-                replace_readmes(category, sample, sample_root)
+        for sample in iter_samples(sample_root, ["WPF"]):
+            replace_readmes(sample.category, os.path.basename(sample.path), sample_root)
     else:
         print("Usage for single sample: python readme_copy.py {category} {formal name of sample} {path_to_samples (ends in src)}")
         print("Usage for all samples: python readme_copy.py {path_to_samples (ends in src)}")
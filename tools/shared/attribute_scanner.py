@@ -0,0 +1,137 @@
+import re
+import typing
+
+# region Global patterns
+# A C# string literal, either regular, e.g. "a\\b.cs", where backslashes
+# escape, or verbatim, e.g. @"a\b.cs", where only "" is an escape.
+string_literal = r'(?:@"(?:[^"]|"")*"|"(?:[^"\\]|\\.)*")'
+
+# A sample attribute, e.g. [ArcGIS.Samples.Shared.Attributes.ClassFile("a.cs")],
+# capturing the attribute name and the argument list. String literals in the
+# arguments may contain parentheses.
+attribute_pattern = re.compile(
+    r'ArcGIS\.Samples\.Shared\.Attributes\.(Sample|ClassFile|OfflineData)\s*'
+    r'\(((?:' + string_literal + r'|[^")])*)\)')
+
+# A C# string literal, capturing the contents of a verbatim literal or the
+# escaped contents of a regular one.
+string_pattern = re.compile(r'@"((?:[^"]|"")*)"|"((?:[^"\\]|\\.)*)"')
+
+# A named argument, e.g. `name: "Display map"` or `tags: new[] { "map" }`.
+named_argument_pattern = re.compile(
+    r'(\w+)\s*:\s*(' + string_literal +
+    r'|new\s*(?:string\s*)?\[\s*\]\s*\{[^}]*\})')
+
+# A line declaring a type. Attributes of a sample precede its class
+# declaration, so scanning can stop here.
+type_declaration_pattern = re.compile(
+    r'^\s*(?:(?:public|internal|private|protected|sealed|static|abstract|'
+    r'partial|unsafe)\s+)*(?:class|struct|record|interface)\s+\w')
+
+escape_pattern = re.compile(r'\\(.)')
+# endregion
+
+
+class SampleAttributes(typing.NamedTuple):
+    """
+    The sample attributes found in a C# file.
+
+    `sample` maps the named arguments of the Sample attribute, e.g. 'name',
+    'category' and 'tags', or is None if the file has no Sample attribute.
+    """
+    sample: typing.Optional[typing.Dict[str, typing.Any]]
+    class_files: typing.Tuple[str, ...]
+    offline_data: typing.Tuple[str, ...]
+
+
+# region Static functions
+def unescape(string: str) -> str:
+    """
+    Undo the escape sequences of a regular C# string literal, e.g. \\" and
+    \\\\.
+    """
+    return escape_pattern.sub(r'\1', string)
+
+
+def parse_strings(arguments: str) -> typing.List[str]:
+    """
+    :param arguments: The argument list of an attribute.
+    :return: The unescaped string literals in the argument list.
+    """
+    strings = []
+    for match in string_pattern.finditer(arguments):
+        verbatim, regular = match.groups()
+        strings.append(verbatim.replace('""', '"') if verbatim is not None
+                       else unescape(regular))
+    return strings
+
+
+def parse_attributes(header: str) -> SampleAttributes:
+    """
+    Parse all Sample, ClassFile and OfflineData attributes in one pass.
+
+    :param header: The C# source preceding the class declaration.
+    :return: The parsed attributes.
+    """
+    sample = None
+    class_files = []
+    offline_data = []
+    for match in attribute_pattern.finditer(header):
+        name, arguments = match.groups()
+        if name == 'Sample':
+            sample = {}
+            for key, value in named_argument_pattern.findall(arguments):
+                strings = parse_strings(value)
+                sample[key] = strings if value.startswith('new') \
+                    else strings[0]
+        elif name == 'ClassFile':
+            class_files.extend(parse_strings(arguments))
+        else:
+            offline_data.extend(parse_strings(arguments))
+    return SampleAttributes(sample, tuple(class_files), tuple(offline_data))
+
+
+def scan_lines(lines: typing.Iterable[str]) -> SampleAttributes:
+    """
+    Scan C# source lines for sample attributes, stopping at the first type
+    declaration so that the rest of the file is never read.
+
+    :param lines: An iterable of lines, e.g. an open file.
+    :return: The parsed attributes.
+    """
+    header = []
+    for line in lines:
+        if type_declaration_pattern.match(line):
+            break
+        header.append(line)
+    return parse_attributes(''.join(header))
+
+
+def scan_file(path: str) -> SampleAttributes:
+    """
+    Stream a C# file and parse its sample attributes.
+
+    :param path: The path to the C# file.
+    :return: The parsed attributes. Throws if the file can't be read.
+    """
+    with open(path, 'r') as source_file:
+        return scan_lines(source_file)
+
+
+def get_class_file_snippets(class_files: typing.Iterable[str]) -> \
+        typing.List[str]:
+    """
+    Get the snippet paths of class files outside of the sample folder. Class
+    files in the sample folder are already listed with the sample's own
+    source files, so only paths with a folder are returned, relative to the
+    sample folder, e.g. '../../../Helpers/ArcGISLoginPrompt.cs'.
+
+    :param class_files: The ClassFile attribute arguments.
+    :return: The snippet paths.
+    """
+    snippets = []
+    for class_file in class_files:
+        if '\\' in class_file or '/' in class_file:
+            snippets.append('../../../' + class_file.replace('\\', '/'))
+    return snippets
+# endregion
@@ -0,0 +1,219 @@
+import json
+import os
+import typing
+
+import attribute_scanner
+from attribute_scanner import scan_file
+from result_cache import get_fingerprint
+from sample_folder import get_sample_folder
+from sample_tree import iter_samples
+
+# Bump when the layout of the index file changes.
+INDEX_VERSION = 1
+
+# The name of the index file written to the samples path.
+INDEX_FILE_NAME = '.sample_dependencies.json'
+
+
+# region Static functions
+def to_key(path: str, sample_root: str) -> typing.Optional[str]:
+    """
+    :return: The path relative to the samples path with forward slashes, e.g.
+    'WPF/WPF.Viewer/Helpers/ArcGISLoginPrompt.cs', or None if the path is
+    outside of the samples path.
+    """
+    relative = os.path.relpath(os.path.abspath(path),
+                               os.path.abspath(sample_root))
+    if relative == os.pardir or relative.startswith(os.pardir + os.sep):
+        return None
+    return relative.replace(os.sep, '/')
+
+
+def get_class_file_key(sample_key: str, class_file: str) -> str:
+    """
+    Resolve a ClassFile attribute argument of a sample. Class files are
+    relative to the viewer project, three folders up from the sample.
+
+    :return: The key of the class file, e.g. 'WPF/WPF.Viewer/Helpers/A.cs'.
+    """
+    viewer_key = sample_key.rsplit('/', 3)[0]
+    return os.path.normpath(
+        os.path.join(viewer_key, class_file.replace('\\', '/'))
+    ).replace(os.sep, '/')
+
+
+def get_signature(sample_path: str) -> typing.List[typing.List[typing.Any]]:
+    """
+    :return: The name, size and modification time of each .cs file in the
+    sample folder, to tell whether its attributes have to be scanned again.
+    """
+    folder = get_sample_folder(sample_path)
+    signature = []
+    for name in sorted(folder.files('.cs')):
+        stat = folder.stat(name)
+        signature.append([name, stat.st_size, stat.st_mtime_ns])
+    return signature
+# endregion
+
+
+class DependencyIndex:
+    """
+    The files samples reference from outside their own folder through
+    ArcGIS.Samples.Shared.Attributes.ClassFile, e.g. helpers and converters
+    shared by many samples, and the reverse mapping from each file to the
+    samples that reference it.
+
+    The index is persisted with the signature of the .cs files of each
+    sample, so that updating it only rescans the samples that changed.
+    """
+
+    def __init__(self, sample_root: str, path: typing.Optional[str] = None):
+        self.sample_root = sample_root
+        self.path = path or os.path.join(sample_root, INDEX_FILE_NAME)
+        self.fingerprint = get_fingerprint(os.path.realpath(__file__),
+                                           attribute_scanner.__file__)
+        # Sample key -> {'signature': ..., 'class_files': [...]}
+        self.samples = {}
+        self.dependents = {}
+
+    def load(self) -> None:
+        """
+        Read the index from disk. A missing, unreadable or outdated index is
+        treated as empty.
+        """
+        try:
+            with open(self.path, 'r') as index_file:
+                data = json.load(index_file)
+        except (OSError, ValueError):
+            return
+        if data.get('version') != INDEX_VERSION or \
+                data.get('fingerprint') != self.fingerprint:
+            return
+        self.samples = data.get('samples', {})
+        self.build_dependents()
+
+    def save(self) -> None:
+        data = {
+            'version': INDEX_VERSION,
+            'fingerprint': self.fingerprint,
+            'samples': self.samples,
+        }
+        with open(self.path, 'w') as index_file:
+            json.dump(data, index_file, indent=1, sort_keys=True)
+
+    def update(self,
+               sample_paths: typing.Optional[typing.Iterable[str]] = None) \
+            -> int:
+        """
+        Bring the index up to date with the sample folders, scanning the
+        attributes of the samples whose .cs files changed.
+
+        :param sample_paths: The sample folders; every sample of the samples
+        path if not given. Samples no longer listed are dropped.
+        :return: The number of samples scanned.
+        """
+        if sample_paths is None:
+            sample_paths = [sample.path for sample in
+                            iter_samples(self.sample_root)]
+        samples = {}
+        scanned = 0
+        for sample_path in sample_paths:
+            key = to_key(sample_path, self.sample_root)
+            signature = get_signature(sample_path)
+            previous = self.samples.get(key)
+            if previous is not None and previous['signature'] == signature:
+                samples[key] = previous
+                continue
+            class_files = set()
+            for name, _, _ in signature:
+                try:
+                    attributes = scan_file(os.path.join(sample_path, name))
+                except (OSError, UnicodeDecodeError):
+                    continue
+                for class_file in attributes.class_files:
+                    # Class files without a folder are in the sample folder.
+                    if '\\' in class_file or '/' in class_file:
+                        class_files.add(get_class_file_key(key, class_file))
+            samples[key] = {'signature': signature,
+                            'class_files': sorted(class_files)}
+            scanned += 1
+        self.samples = samples
+        self.build_dependents()
+        return scanned
+
+    def build_dependents(self) -> None:
+        self.dependents = {}
+        for sample_key, entry in self.samples.items():
+            for class_file in entry['class_files']:
+                self.dependents.setdefault(class_file, []).append(sample_key)
+
+    def get_sample(self, path: str) -> typing.Optional[str]:
+        """
+        Get the sample folder a file is in.
+
+        :param path: The path to a file, which may no longer exist.
+        :return: The path to the sample folder, or None if the file is not in
+        a sample folder.
+        """
+        key = to_key(path, self.sample_root)
+        if key is None:
+            return None
+        # Sample keys are <platform>/<viewer>/Samples/<category>/<sample>.
+        parts = key.split('/')
+        sample_key = '/'.join(parts[:5])
+        if len(parts) < 6 or sample_key not in self.samples:
+            return None
+        return self.to_path(sample_key)
+
+    def get_dependents(self, path: str) -> typing.List[str]:
+        """
+        :return: The paths to the samples referencing a file through ClassFile.
+        """
+        key = to_key(path, self.sample_root)
+        return [self.to_path(sample_key)
+                for sample_key in sorted(self.dependents.get(key, ()))]
+
+    def get_affected_samples(self, changed_paths: typing.Iterable[str]) \
+            -> typing.List[str]:
+        """
+        Get the samples whose checks may have a different outcome after the
+        given files changed: the samples containing the files, and the samples
+        referencing them through ClassFile.
+
+        :param changed_paths: The paths to the changed, added or deleted files.
+        :return: The paths to the samples, sorted.
+        """
+        affected = set()
+        for path in changed_paths:
+            sample = self.get_sample(path)
+            if sample is not None:
+                affected.add(sample)
+            affected.update(self.get_dependents(path))
+        return sorted(affected)
+
+    def to_path(self, key: str) -> str:
+        return os.path.normpath(os.path.join(self.sample_root, key))
+
+
+def load_dependency_index(sample_root: str,
+                          path: typing.Optional[str] = None) \
+        -> DependencyIndex:
+    """
+    Load the persisted index, update it with the samples that changed since
+    it was saved, and save it again if any did.
+
+    :param sample_root: The samples path (ends in src).
+    :param path: The path to the index file; defaults to
+    .sample_dependencies.json in the samples path.
+    :return: The up to date index.
+    """
+    index = DependencyIndex(sample_root, path)
+    index.load()
+    previous_count = len(index.samples)
+    if index.update() or len(index.samples) != previous_count:
+        try:
+            index.save()
+        except OSError:
+            # The index is only a cache; it is rebuilt on the next run.
+            pass
+    return index
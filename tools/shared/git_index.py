@@ -0,0 +1,160 @@
+import bisect
+import hashlib
+import os
+import subprocess
+import typing
+
+from sample_tree import SampleDir, platform_samples_roots, pruned_folders
+
+
+# region Static functions
+def hash_blob(data: bytes) -> str:
+    """
+    Hash file contents the way git hashes a blob, so that the hash of a
+    changed file can stand in for the blob SHA recorded in the index.
+    """
+    hasher = hashlib.sha1(b'blob %d\0' % len(data))
+    hasher.update(data)
+    return hasher.hexdigest()
+
+
+def run_git(path: str, *args: str) -> typing.List[str]:
+    """
+    Run a git command in a folder and split its -z output.
+
+    :return: The NUL-separated records. Throws if git fails.
+    """
+    output = subprocess.run(['git', *args], cwd=path, check=True,
+                            stdout=subprocess.PIPE,
+                            stderr=subprocess.DEVNULL).stdout
+    return [record.decode('utf-8') for record in output.split(b'\0')
+            if record]
+
+
+def load_git_index(path: str) -> typing.Optional['GitIndex']:
+    """
+    Read the files under a folder from the git index, with the working tree
+    changes git reports on top, instead of walking and hashing the folder.
+
+    :param path: A folder in a git working tree, e.g. the samples path.
+    :return: The index, or None if git isn't available or the folder isn't in
+    a working tree, so that the caller can walk the filesystem instead.
+    """
+    try:
+        staged = run_git(path, 'ls-files', '-z', '-s')
+        changes = run_git(path, 'ls-files', '-z', '-t', '-m', '-d', '-o',
+                          '--exclude-standard')
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+    blobs = {}
+    for record in staged:
+        # <mode> <blob> <stage>\t<path>
+        info, file_path = record.split('\t', 1)
+        blobs[file_path] = info.split(' ')[1]
+    deleted = set()
+    for record in changes:
+        # <tag> <path>, where the tag is 'C' for a modified file, 'R' for a
+        # deleted one and '?' for an untracked one. A deleted file is also
+        # listed as modified, so deletions are applied last.
+        tag, file_path = record[0], record[2:]
+        if tag == 'R':
+            deleted.add(file_path)
+        else:
+            blobs[file_path] = None
+    for file_path in deleted:
+        blobs.pop(file_path, None)
+    return GitIndex(path, blobs)
+# endregion
+
+
+class GitIndex:
+    """
+    The files under a folder as git tracks them. The blob SHAs of the index
+    double as content hashes; files that changed in the working tree or are
+    untracked have no blob and are hashed on demand.
+
+    Paths are relative to the folder, with forward slashes.
+    """
+
+    def __init__(self, path: str, blobs: typing.Dict[str, typing.Optional[str]]):
+        self.path = os.path.abspath(path)
+        self.blobs = blobs
+        self.paths = sorted(blobs)
+
+    def relative_path(self, path: str) -> str:
+        """
+        :return: The index path of a file or folder path.
+        """
+        relative = os.path.relpath(os.path.abspath(path), self.path)
+        return '' if relative == '.' else relative.replace(os.sep, '/')
+
+    def list_files(self, folder: str) -> typing.List[str]:
+        """
+        Get the files under a folder, including those in subfolders.
+
+        :param folder: The path to the folder.
+        :return: The paths of the files relative to the folder, sorted.
+        """
+        prefix = self.relative_path(folder)
+        if prefix:
+            prefix += '/'
+        start = bisect.bisect_left(self.paths, prefix)
+        files = []
+        for index in range(start, len(self.paths)):
+            if not self.paths[index].startswith(prefix):
+                break
+            files.append(self.paths[index][len(prefix):])
+        return files
+
+    def content_hash(self, path: str) -> typing.Optional[str]:
+        """
+        Get the blob SHA of a file, hashing the file only if it differs from
+        the index.
+
+        :param path: The path to the file.
+        :return: The hash, or None if the file isn't in the index or can't be
+        read.
+        """
+        relative = self.relative_path(path)
+        if relative not in self.blobs:
+            return None
+        blob = self.blobs[relative]
+        if blob is None:
+            try:
+                with open(path, 'rb') as file:
+                    blob = hash_blob(file.read())
+            except OSError:
+                return None
+            self.blobs[relative] = blob
+        return blob
+
+    def iter_samples(self, sample_root: str,
+                     platforms: typing.Optional[typing.Iterable[str]] = None) \
+            -> typing.Iterator[SampleDir]:
+        """
+        Enumerate the sample folders from the index, with the same pruning and
+        order as sample_tree.iter_samples. Empty folders are never listed,
+        as git doesn't track them.
+
+        :param sample_root: The samples path (ends in src).
+        :param platforms: The platforms to enumerate; all of them if not given.
+        :return: The samples, by platform, then category and name.
+        """
+        for platform in platforms or platform_samples_roots:
+            platform_root = os.path.join(sample_root,
+                                         platform_samples_roots[platform])
+            samples = set()
+            for file_path in self.list_files(platform_root):
+                parts = file_path.split('/')
+                # Files directly in a category folder are not samples.
+                if len(parts) < 3:
+                    continue
+                category, sample = parts[0], parts[1]
+                if any(name.startswith('.') or name in pruned_folders
+                       for name in (category, sample)):
+                    continue
+                samples.add((category, sample))
+            for category, sample in sorted(samples):
+                yield SampleDir(platform, category,
+                                os.path.join(platform_root, category, sample))
@@ -0,0 +1,125 @@
+import functools
+import re
+import typing
+
+# region Global patterns
+# A regular expression that matches exactly 2 pound marks, and captures the
+# trailing string as the section header.
+section_header_pattern = re.compile(r'^#{2}(?!#)\s(.*)', re.MULTILINE)
+
+# A blank line separates paragraphs.
+paragraph_separator = '\n\n'
+# endregion
+
+
+class ReadmeSection(typing.NamedTuple):
+    """
+    A `## Header` section of a README, and the body up to the next section.
+    `start` and `end` are the offsets of the section in the README text.
+    """
+    header: str
+    body: str
+    start: int
+    end: int
+
+
+class ReadmeDocument(typing.NamedTuple):
+    """
+    Immutable section model of a README.
+
+    `head` is the text before the first section header, i.e. the title,
+    description and image. `paragraphs` are the blocks of the whole text
+    separated by blank lines.
+    """
+    text: str
+    head: str
+    sections: typing.Tuple[ReadmeSection, ...]
+    paragraphs: typing.Tuple[str, ...]
+
+    @property
+    def headers(self) -> typing.List[str]:
+        """
+        :return: The section headers, in order of appearance.
+        """
+        return [section.header for section in self.sections]
+
+    @property
+    def head_lines(self) -> typing.List[str]:
+        """
+        :return: The non-empty lines of the head.
+        """
+        return list(filter(bool, self.head.splitlines()))
+
+    @property
+    def title(self) -> typing.Optional[str]:
+        """
+        :return: The title without pound marks, or None if the head is empty.
+        """
+        lines = self.head_lines
+        return lines[0].lstrip('# ').rstrip() if lines else None
+
+    @property
+    def description(self) -> typing.Optional[str]:
+        """
+        :return: The description line, or None if it is missing.
+        """
+        lines = self.head_lines
+        return lines[1].strip() if len(lines) > 1 else None
+
+    @property
+    def image(self) -> typing.Optional[str]:
+        """
+        :return: The image line, or None if it is missing.
+        """
+        lines = self.head_lines
+        return lines[2].strip() if len(lines) > 2 else None
+
+    def has_section(self, header: str) -> bool:
+        return any(section.header == header for section in self.sections)
+
+    def section(self, header: str) -> str:
+        """
+        Get the body of the first section with the given header.
+
+        :param header: The section header, e.g. 'Relevant API'.
+        :return: The body of the section. Throws if the section is missing.
+        """
+        for section in self.sections:
+            if section.header == header:
+                return section.body
+        raise ValueError(f'Missing section "{header}"')
+
+
+# region Static functions
+@functools.lru_cache(maxsize=4096)
+def parse_readme(text: str) -> ReadmeDocument:
+    """
+    Tokenize a README into its section model. Results are cached, so each
+    README is only tokenized once per process no matter how many tools
+    consume it.
+
+    :param text: The README contents.
+    :return: The parsed README.
+    """
+    sections = []
+    matches = list(section_header_pattern.finditer(text))
+    head_end = matches[0].start() if matches else len(text)
+    for index, match in enumerate(matches):
+        end = matches[index + 1].start() if index + 1 < len(matches) \
+            else len(text)
+        sections.append(ReadmeSection(match.group(1), text[match.end():end],
+                                      match.start(), end))
+    return ReadmeDocument(text, text[:head_end], tuple(sections),
+                          tuple(text.split(paragraph_separator)))
+
+
+def load_readme(path: str) -> ReadmeDocument:
+    """
+    Read and tokenize a README file.
+
+    :param path: The path to the README.
+    :return: The parsed README. Throws if the file can't be read.
+    """
+    with open(path, 'r') as readme_file:
+        return parse_readme(readme_file.read())
+# endregion
@@ -0,0 +1,168 @@
+import concurrent.futures
+import hashlib
+import json
+import typing
+
+# Bump when the layout of the cache file changes.
+CACHE_VERSION = 1
+
+
+# region Static functions
+def get_fingerprint(*paths: str) -> str:
+    """
+    Hash the source of a checker, so that changes to the checks invalidate the
+    results cached by earlier versions.
+
+    :param paths: The paths to the checker script and the modules it uses,
+    e.g. the `__file__` of each.
+    :return: The fingerprint.
+    """
+    hasher = hashlib.sha1()
+    for path in paths:
+        with open(path, 'rb') as source_file:
+            hasher.update(source_file.read())
+    return hasher.hexdigest()
+# endregion
+
+
+class InputHasher:
+    """
+    Builds the cache key of a sample from everything a check reads. Each value
+    is length-prefixed, so that adjacent values can't run into each other.
+
+    If a git index is given, files are added by their blob SHA instead of
+    being read, unless they changed in the working tree.
+    """
+
+    def __init__(self, git_index=None):
+        self.hasher = hashlib.sha1()
+        self.git_index = git_index
+
+    def add_bytes(self, data: bytes) -> None:
+        self.hasher.update(len(data).to_bytes(8, 'little'))
+        self.hasher.update(data)
+
+    def add_string(self, string: str) -> None:
+        self.add_bytes(string.encode('utf-8'))
+
+    def add_file(self, path: str) -> None:
+        """
+        Add the contents of a file. A missing or unreadable file is hashed
+        differently from an empty one, so the check runs and reports it.
+        """
+        if self.git_index is not None:
+            blob = self.git_index.content_hash(path)
+            if blob is not None:
+                self.hasher.update(b'blob')
+                self.add_string(blob)
+                return
+        try:
+            with open(path, 'rb') as file:
+                data = file.read()
+        except OSError:
+            self.hasher.update(b'missing')
+            return
+        self.add_bytes(data)
+
+    def hexdigest(self) -> str:
+        return self.hasher.hexdigest()
+
+
+class ResultCache:
+    """
+    Persisted results of a checker, keyed by a hash of the inputs of each
+    sample. Results are replayed for samples whose inputs are unchanged, so
+    that only the samples that changed since the last run are checked.
+
+    Results must be serializable to json; tuples are read back as lists.
+    """
+
+    def __init__(self, path: str, fingerprint: str):
+        self.path = path
+        self.fingerprint = fingerprint
+        self.results = {}
+        self.used = set()
+
+    def load(self) -> None:
+        """
+        Read the cache from disk. A missing, unreadable or outdated cache, e.g.
+        one written by another version of the checker, is treated as empty.
+        """
+        try:
+            with open(self.path, 'r') as cache_file:
+                data = json.load(cache_file)
+        except (OSError, ValueError):
+            return
+        if data.get('version') != CACHE_VERSION or \
+                data.get('fingerprint') != self.fingerprint:
+            return
+        self.results = data.get('results', {})
+
+    def save(self, prune: bool = False) -> None:
+        """
+        Write the cache to disk.
+
+        :param prune: Drop the results that weren't used since the cache was
+        loaded, e.g. after a run over every sample.
+        """
+        if prune:
+            self.results = {key: result for key, result in self.results.items()
+                            if key in self.used}
+        data = {
+            'version': CACHE_VERSION,
+            'fingerprint': self.fingerprint,
+            'results': self.results,
+        }
+        with open(self.path, 'w') as cache_file:
+            json.dump(data, cache_file, indent=1, sort_keys=True)
+
+    def get(self, key: str) -> typing.Optional[typing.Any]:
+        """
+        :return: The cached result, or None on a miss.
+        """
+        result = self.results.get(key)
+        if result is not None:
+            self.used.add(key)
+        return result
+
+    def put(self, key: str, result: typing.Any) -> None:
+        self.results[key] = result
+        self.used.add(key)
+
+    def discard(self, key: str) -> None:
+        """
+        Drop a result, e.g. one for inputs that have since changed.
+        """
+        self.results.pop(key, None)
+        self.used.discard(key)
+
+    def map(self, function: typing.Callable[[str], typing.Any],
+            items: typing.List[str],
+            key_function: typing.Callable[[str], str],
+            executor: typing.Optional[concurrent.futures.Executor] = None,
+            chunksize: int = 1) -> typing.List[typing.Any]:
+        """
+        Call a function on each item, replaying cached results and only
+        calling the function for the items whose key isn't cached.
+
+        :param function: The check, called with an item.
+        :param items: The items, e.g. sample folder paths.
+        :param key_function: Hashes the inputs of an item.
+        :param executor: Runs the calls for the misses if given.
+        :param chunksize: The number of items sent to a worker at a time.
+        :return: The results, in the order of the items.
+        """
+        keys = [key_function(item) for item in items]
+        results = [self.get(key) for key in keys]
+        misses = [index for index, result in enumerate(results)
+                  if result is None]
+        miss_items = [items[index] for index in misses]
+        if executor is None:
+            miss_results = map(function, miss_items)
+        else:
+            miss_results = executor.map(function, miss_items,
+                                        chunksize=chunksize)
+        for index, result in zip(misses, miss_results):
+            self.put(keys[index], result)
+            results[index] = result
+        return results
@@ -0,0 +1,97 @@
+import os
+import typing
+
+# Entries ignored when deciding whether a folder is empty. Git omits empty
+# folders, so a folder with only these entries is not a sample.
+ignored_entries = ('.DS_Store',)
+
+
+class SampleFolder:
+    """
+    Snapshot of a sample folder, taken with a single `os.scandir` call.
+
+    Entries keep the order `os.listdir` would return them in, are classified
+    by extension, and cache their stat information.
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        self.entries = {}
+        self.extensions = {}
+        with os.scandir(path) as scanner:
+            for entry in scanner:
+                self.entries[entry.name] = entry
+                self.extensions[entry.name] = os.path.splitext(entry.name)[1]
+
+    @property
+    def names(self) -> typing.List[str]:
+        """
+        :return: The names of all entries in the folder.
+        """
+        return list(self.entries)
+
+    def files(self, *extensions: str,
+              ignore_case: bool = False) -> typing.List[str]:
+        """
+        Get the names of the files with the given extensions.
+
+        :param extensions: Extensions including the dot, e.g. '.cs'. Note that
+        the extension of 'Sample.xaml.cs' is '.cs'.
+        :param ignore_case: Match the extensions case-insensitively.
+        :return: The file names, in folder order.
+        """
+        if ignore_case:
+            extensions = {extension.lower() for extension in extensions}
+            return [name for name, extension in self.extensions.items()
+                    if extension.lower() in extensions and self.is_file(name)]
+        return [name for name, extension in self.extensions.items()
+                if extension in extensions and self.is_file(name)]
+
+    def contains(self, name: str) -> bool:
+        return name in self.entries
+
+    def is_file(self, name: str) -> bool:
+        return self.entries[name].is_file()
+
+    def is_dir(self, name: str) -> bool:
+        return self.entries[name].is_dir()
+
+    def is_empty(self) -> bool:
+        """
+        :return: True if the folder has no entries other than ignored ones.
+        """
+        return all(name.startswith(ignored_entries) for name in self.entries)
+
+    def stat(self, name: str) -> os.stat_result:
+        """
+        :return: The stat information of an entry, cached after the first call.
+        """
+        return self.entries[name].stat()
+
+
+# A snapshot per folder, shared by every tool running in this process.
+_snapshots = {}
+
+
+def get_sample_folder(path: str) -> SampleFolder:
+    """
+    Get the snapshot of a sample folder, scanning it on first use.
+
+    :param path: The path to the sample folder.
+    :return: The snapshot. Throws if the folder can't be scanned.
+    """
+    key = os.path.abspath(path)
+    if key not in _snapshots:
+        _snapshots[key] = SampleFolder(path)
+    return _snapshots[key]
+
+
+def invalidate(path: typing.Optional[str] = None) -> None:
+    """
+    Drop the snapshot of a folder, or of all folders if no path is given, so
+    that the next use rescans it.
+    """
+    if path is None:
+        _snapshots.clear()
+    else:
+        _snapshots.pop(os.path.abspath(path), None)
@@ -0,0 +1,101 @@
+import os
+import typing
+
+# region Global sets
+# The folder holding the category folders of each platform, relative to the
+# samples path (ends in src).
+platform_samples_roots = {
+    'WPF': os.path.join('WPF', 'WPF.Viewer', 'Samples'),
+    'WinUI': os.path.join('WinUI', 'ArcGIS.WinUI.Viewer', 'Samples'),
+    'MAUI': os.path.join('MAUI', 'Maui.Samples', 'Samples'),
+}
+
+# Folders that are never categories or samples, such as build outputs and
+# sample resources.
+pruned_folders = {'bin', 'obj', 'resources'}
+# endregion
+
+
+class SampleDir(typing.NamedTuple):
+    """
+    A sample folder, e.g. platform 'WPF', category 'Map' and the path to
+    src/WPF/WPF.Viewer/Samples/Map/DisplayMap.
+    """
+    platform: str
+    category: str
+    path: str
+
+
+# region Static functions
+def get_platform_samples_root(platform: str, sample_root: str) -> str:
+    """
+    Get the folder holding the category folders of a platform.
+
+    :param platform: 'WPF', 'WinUI' or 'MAUI'.
+    :param sample_root: The samples path (ends in src).
+    :return: The path. Throws if the platform is unknown.
+    """
+    if platform not in platform_samples_roots:
+        raise ValueError(f'Unknown platform "{platform}"')
+    return os.path.join(sample_root, platform_samples_roots[platform])
+
+
+def find_sample_root(path: str) -> str:
+    """
+    Get the samples path from a path to either the repository root or src.
+
+    :param path: The path to the repository root or the samples path.
+    :return: The samples path. Throws if neither has platform samples.
+    """
+    for candidate in (path, os.path.join(path, 'src')):
+        for platform in platform_samples_roots:
+            if os.path.isdir(get_platform_samples_root(platform, candidate)):
+                return candidate
+    raise ValueError(f'No platform samples found under "{path}"')
+
+
+def list_subfolders(path: str) -> typing.List[os.DirEntry]:
+    """
+    Get the folders in a folder that may be categories or samples, sorted by
+    name, without descending into them. Hidden and pruned folders are skipped.
+    """
+    with os.scandir(path) as scanner:
+        folders = [entry for entry in scanner
+                   if entry.is_dir() and not entry.name.startswith('.')
+                   and entry.name not in pruned_folders]
+    return sorted(folders, key=lambda entry: entry.name)
+
+
+def get_categories(platform: str, sample_root: str) -> typing.List[str]:
+    """
+    Get the category folder names of a platform, as found on disk.
+
+    :return: The sorted names, or an empty list if the platform is missing.
+    """
+    platform_root = get_platform_samples_root(platform, sample_root)
+    if not os.path.isdir(platform_root):
+        return []
+    return [entry.name for entry in list_subfolders(platform_root)]
+
+
+def iter_samples(sample_root: str,
+                 platforms: typing.Optional[typing.Iterable[str]] = None) \
+        -> typing.Iterator[SampleDir]:
+    """
+    Enumerate the sample folders, i.e. the folders of the category folders of
+    each platform. Only those two levels are scanned, so build outputs and
+    the contents of the samples are never walked. Platforms missing from the
+    samples path are skipped.
+
+    :param sample_root: The samples path (ends in src).
+    :param platforms: The platforms to enumerate; all of them if not given.
+    :return: The samples, by platform, then category and name.
+    """
+    for platform in platforms or platform_samples_roots:
+        platform_root = get_platform_samples_root(platform, sample_root)
+        if not os.path.isdir(platform_root):
+            continue
+        for category in list_subfolders(platform_root):
+            for sample in list_subfolders(category.path):
+                yield SampleDir(platform, category.name, sample.path)
+# endregion
@@ -0,0 +1,88 @@
+import os
+import sys
+import unittest
+
+tools_root = os.path.join(os.path.dirname(os.path.realpath(__file__)), '..')
+sys.path.append(os.path.join(tools_root, 'shared'))
+
+from attribute_scanner import get_class_file_snippets, parse_strings, \
+    scan_lines
+
+sample_source = '''using System;
+
+namespace ArcGIS.WPF.Samples.DisplayMap
+{
+    [ArcGIS.Samples.Shared.Attributes.Sample(
+        name: "Display map (basic)",
+        category: "Map",
+        description: "Display a \\"map\\".",
+        instructions: "",
+        tags: new[] { "basemap", "map" })]
+    [ArcGIS.Samples.Shared.Attributes.OfflineData("abc123")]
+    [ArcGIS.Samples.Shared.Attributes.ClassFile("Helpers\\\\ArcGISLoginPrompt.cs", "Converters/Converter.cs")]
+    public partial class DisplayMap
+    {
+        [ArcGIS.Samples.Shared.Attributes.ClassFile("Ignored.cs")]
+        public void Method() { }
+    }
+}
+'''
+
+
+class ParseStringsTests(unittest.TestCase):
+    def test_regular_literals(self):
+        self.assertEqual(parse_strings(r'"a\\b.cs", "say \"hi\"", ""'),
+                         ['a\\b.cs', 'say "hi"', ''])
+
+    def test_verbatim_literals(self):
+        self.assertEqual(parse_strings(r'@"Helpers\Foo.cs", @"a""b", @""'),
+                         ['Helpers\\Foo.cs', 'a"b', ''])
+
+    def test_verbatim_literal_ending_in_backslash(self):
+        self.assertEqual(parse_strings(r'@"Helpers\", "Foo.cs"'),
+                         ['Helpers\\', 'Foo.cs'])
+
+
+class ScanLinesTests(unittest.TestCase):
+    def test_sample_source(self):
+        attributes = scan_lines(sample_source.splitlines(True))
+        self.assertEqual(attributes.sample, {
+            'name': 'Display map (basic)',
+            'category': 'Map',
+            'description': 'Display a "map".',
+            'instructions': '',
+            'tags': ['basemap', 'map'],
+        })
+        self.assertEqual(attributes.offline_data, ('abc123',))
+        # The attribute after the class declaration is never read.
+        self.assertEqual(attributes.class_files,
+                         ('Helpers\\ArcGISLoginPrompt.cs',
+                          'Converters/Converter.cs'))
+
+    def test_verbatim_class_file(self):
+        attributes = scan_lines([
+            '[ArcGIS.Samples.Shared.Attributes.ClassFile('
+            '@"Helpers\\Foo.cs", @"Helpers\\(Bar).cs")]\n',
+            'public class Sample\n'])
+        self.assertEqual(attributes.class_files,
+                         ('Helpers\\Foo.cs', 'Helpers\\(Bar).cs'))
+        self.assertEqual(get_class_file_snippets(attributes.class_files),
+                         ['../../../Helpers/Foo.cs',
+                          '../../../Helpers/(Bar).cs'])
+
+    def test_no_attributes(self):
+        attributes = scan_lines(['public class Sample\n'])
+        self.assertIsNone(attributes.sample)
+        self.assertEqual(attributes.class_files, ())
+        self.assertEqual(attributes.offline_data, ())
+
+
+class GetClassFileSnippetsTests(unittest.TestCase):
+    def test_only_files_outside_of_the_sample_folder(self):
+        self.assertEqual(get_class_file_snippets(
+            ['Sample.xaml.cs', 'Helpers\\A.cs', 'Converters/B.cs']),
+            ['../../../Helpers/A.cs', '../../../Converters/B.cs'])
+
+
+if __name__ == '__main__':
+    unittest.main()
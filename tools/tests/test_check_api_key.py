@@ -0,0 +1,73 @@
+import os
+import subprocess
+import sys
+import tempfile
+import unittest
+
+tools_root = os.path.join(os.path.dirname(os.path.realpath(__file__)), '..')
+sys.path.append(os.path.join(tools_root, 'githook_scripts'))
+
+import check_api_key
+
+
+class ReadStagedBlobsTests(unittest.TestCase):
+    def setUp(self):
+        self.folder = tempfile.TemporaryDirectory()
+        self.repo = self.folder.name
+        self.git('init', '-q')
+
+    def tearDown(self):
+        self.folder.cleanup()
+
+    def git(self, *args: str) -> None:
+        subprocess.run(['git', *args], cwd=self.repo, check=True)
+
+    def stage(self, path: str, data: bytes) -> None:
+        with open(os.path.join(self.repo, path), 'wb') as file:
+            file.write(data)
+        self.git('add', path)
+
+    def test_staged_contents(self):
+        self.stage('a.cs', b'apiKey = "";\n')
+        self.stage('b c.cs', b'')
+        # The working tree doesn't matter, only the staged contents.
+        with open(os.path.join(self.repo, 'a.cs'), 'wb') as file:
+            file.write(b'changed\n')
+        self.assertEqual(
+            list(check_api_key.read_staged_blobs(self.repo,
+                                                 ['a.cs', 'b c.cs'])),
+            [('a.cs', b'apiKey = "";\n'), ('b c.cs', b'')])
+
+    def test_missing_path_with_spaces(self):
+        # git answers ":a b c missing", which has three words like the header
+        # of an object.
+        self.stage('d.cs', b'AAPK\n')
+        self.assertEqual(
+            list(check_api_key.read_staged_blobs(self.repo,
+                                                 ['a b c', 'a 12', 'd.cs'])),
+            [('a b c', None), ('a 12', None), ('d.cs', b'AAPK\n')])
+
+    def test_scan_staged(self):
+        self.stage('clean file.cs', b'var apiKey = "";\n')
+        self.stage('key file.cs', b'// a\n// AAPK\n')
+        results = check_api_key.scan_staged(self.repo)
+        self.assertEqual([(result.path, result.line) for result in results],
+                         [('clean file.cs', 0), ('key file.cs', 2)])
+
+
+class ScanDataTests(unittest.TestCase):
+    def test_nul_bytes_are_scanned(self):
+        result = check_api_key.scan_data('a.cs', b'\0\n// AAPK\n')
+        self.assertEqual((result.line, result.skipped), (2, None))
+        result = check_api_key.sweep_data('a.bin', b'\0\n// AAPK\n')
+        self.assertEqual((result.line, result.skipped), (2, None))
+
+    def test_binary_extensions_are_skipped(self):
+        result = check_api_key.scan_data('a.JPG', b'AAPK')
+        self.assertEqual((result.line, result.skipped), (0, 'binary'))
+        result = check_api_key.sweep_data('a.png', b'AAPK')
+        self.assertEqual((result.line, result.skipped), (0, 'binary'))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,68 @@
+import os
+import sys
+import tempfile
+import unittest
+
+tools_root = os.path.join(os.path.dirname(os.path.realpath(__file__)), '..')
+sys.path.append(os.path.join(tools_root, 'githook_scripts'))
+sys.path.append(os.path.join(tools_root, 'shared'))
+
+from check_file_casing import check_samples
+from sample_tree import iter_samples
+
+
+class CheckSamplesTests(unittest.TestCase):
+    def setUp(self):
+        self.folder = tempfile.TemporaryDirectory()
+        self.sample_root = self.folder.name
+
+    def tearDown(self):
+        self.folder.cleanup()
+
+    def add_sample(self, platform_root: str, sample: str, *names: str) -> str:
+        path = os.path.join(self.sample_root, platform_root, 'Map', sample)
+        os.makedirs(path)
+        for name in names:
+            open(os.path.join(path, name), 'w').close()
+        return path
+
+    def check(self) -> list:
+        return [(os.path.relpath(error.path, self.sample_root), error.message)
+                for error in check_samples(iter_samples(self.sample_root))]
+
+    def test_no_errors(self):
+        self.add_sample('WPF/WPF.Viewer/Samples', 'DisplayMap',
+                        'DisplayMap.xaml', 'DisplayMap.xaml.cs')
+        self.add_sample('MAUI/Maui.Samples/Samples', 'DisplayMap',
+                        'DisplayMap.xaml', 'DisplayMap.xaml.cs', 'displaymap.jpg')
+        self.assertEqual(self.check(), [])
+
+    def test_mismatch_within_a_sample(self):
+        folder = self.add_sample('WPF/WPF.Viewer/Samples', 'DisplayMap',
+                                 'DisplayMap.xaml', 'Displaymap.xaml.cs')
+        self.assertEqual(self.check(), [(
+            'WPF/WPF.Viewer/Samples/Map/DisplayMap',
+            f'Error mismatching file casings Displaymap.xaml.cs, DisplayMap.xaml - {folder}')])
+
+    def test_difference_across_platforms_is_reported_once(self):
+        wpf = self.add_sample('WPF/WPF.Viewer/Samples', 'DisplayMap',
+                              'DisplayMap.xaml', 'DisplayMap.xaml.cs')
+        winui = self.add_sample('WinUI/ArcGIS.WinUI.Viewer/Samples', 'DisplayMap',
+                                'DisplayMap.xaml', 'DisplayMap.xaml.cs')
+        maui = self.add_sample('MAUI/Maui.Samples/Samples', 'Displaymap',
+                               'Displaymap.xaml', 'Displaymap.xaml.cs')
+        self.assertEqual(self.check(), [
+            ('MAUI/Maui.Samples/Samples/Map/Displaymap',
+             'Error sample casing differs across platforms (MAUI: Map/Displaymap, '
+             f'WPF: Map/DisplayMap, WinUI: Map/DisplayMap) - {maui}, {wpf}, {winui}'),
+            ('MAUI/Maui.Samples/Samples/Map/Displaymap',
+             'Error file casing differs across platforms (MAUI: Displaymap.xaml, '
+             f'WPF: DisplayMap.xaml, WinUI: DisplayMap.xaml) - {maui}, {wpf}, {winui}'),
+            ('MAUI/Maui.Samples/Samples/Map/Displaymap',
+             'Error file casing differs across platforms (MAUI: Displaymap.xaml.cs, '
+             f'WPF: DisplayMap.xaml.cs, WinUI: DisplayMap.xaml.cs) - {maui}, {wpf}, {winui}'),
+        ])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,59 @@
+import os
+import stat
+import sys
+import tempfile
+import unittest
+
+tools_root = os.path.join(os.path.dirname(os.path.realpath(__file__)), '..')
+sys.path.append(os.path.join(tools_root, 'metadata_tools'))
+
+from file_output import UMASK, write_if_changed
+
+
+class WriteIfChangedTests(unittest.TestCase):
+    def setUp(self):
+        self.folder = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.folder.name, 'readme.metadata.json')
+
+    def tearDown(self):
+        self.folder.cleanup()
+
+    def read(self) -> bytes:
+        with open(self.path, 'rb') as file:
+            return file.read()
+
+    def test_new_file(self):
+        self.assertTrue(write_if_changed(self.path, 'text\n'))
+        self.assertEqual(self.read(), b'text\n')
+        self.assertEqual(stat.S_IMODE(os.stat(self.path).st_mode),
+                         0o666 & ~UMASK)
+        self.assertEqual(os.listdir(self.folder.name),
+                         ['readme.metadata.json'])
+
+    def test_unchanged_file_is_not_written(self):
+        write_if_changed(self.path, 'text\n')
+        os.utime(self.path, ns=(0, 0))
+        self.assertFalse(write_if_changed(self.path, 'text\n'))
+        self.assertEqual(os.stat(self.path).st_mtime_ns, 0)
+
+    def test_changed_file_keeps_its_mode(self):
+        write_if_changed(self.path, 'text\n')
+        os.chmod(self.path, 0o640)
+        self.assertTrue(write_if_changed(self.path, 'other\n'))
+        self.assertEqual(self.read(), b'other\n')
+        self.assertEqual(stat.S_IMODE(os.stat(self.path).st_mode), 0o640)
+
+    def test_encoding_and_newline_are_compared(self):
+        write_if_changed(self.path, 'a\nb\n', newline='\n')
+        self.assertTrue(write_if_changed(self.path, 'a\nb\n',
+                                         newline='\r\n'))
+        self.assertEqual(self.read(), b'a\r\nb\r\n')
+        self.assertFalse(write_if_changed(self.path, 'a\nb\n',
+                                          newline='\r\n'))
+        self.assertTrue(write_if_changed(self.path, 'aé\n',
+                                         encoding='utf-8'))
+        self.assertEqual(self.read(), 'aé\n'.encode('utf-8'))
+
+
+if __name__ == '__main__':
+    unittest.main()
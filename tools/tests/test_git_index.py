@@ -0,0 +1,78 @@
+import os
+import subprocess
+import sys
+import tempfile
+import unittest
+
+tools_root = os.path.join(os.path.dirname(os.path.realpath(__file__)), '..')
+sys.path.append(os.path.join(tools_root, 'shared'))
+
+from git_index import hash_blob, load_git_index
+
+
+class LoadGitIndexTests(unittest.TestCase):
+    def setUp(self):
+        self.folder = tempfile.TemporaryDirectory()
+        self.repo = self.folder.name
+        self.git('init', '-q')
+
+    def tearDown(self):
+        self.folder.cleanup()
+
+    def git(self, *args: str) -> None:
+        subprocess.run(['git', *args], cwd=self.repo, check=True)
+
+    def write(self, path: str, data: bytes) -> None:
+        path = os.path.join(self.repo, path)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        with open(path, 'wb') as file:
+            file.write(data)
+
+    def test_working_tree_changes(self):
+        self.write('unchanged.txt', b'a\n')
+        self.write('modified.txt', b'b\n')
+        self.write('deleted.txt', b'c\n')
+        self.write('sub/with space.txt', b'd\n')
+        self.write('.gitignore', b'*.log\n')
+        self.git('add', 'unchanged.txt', 'modified.txt', 'deleted.txt',
+                 'sub/with space.txt')
+        self.write('modified.txt', b'changed\n')
+        os.remove(os.path.join(self.repo, 'deleted.txt'))
+        self.write('untracked.txt', b'e\n')
+        self.write('ignored.log', b'f\n')
+
+        git_index = load_git_index(self.repo)
+        # Staged files have their blob, modified and untracked files are
+        # hashed on demand, and deleted and ignored files aren't listed.
+        self.assertEqual(git_index.blobs, {
+            '.gitignore': None,
+            'modified.txt': None,
+            'sub/with space.txt': hash_blob(b'd\n'),
+            'unchanged.txt': hash_blob(b'a\n'),
+            'untracked.txt': None,
+        })
+        self.assertEqual(
+            git_index.content_hash(os.path.join(self.repo, 'modified.txt')),
+            hash_blob(b'changed\n'))
+        self.assertIsNone(
+            git_index.content_hash(os.path.join(self.repo, 'ignored.log')))
+        self.assertEqual(git_index.list_files(os.path.join(self.repo, 'sub')),
+                         ['with space.txt'])
+
+    def test_hash_blob_matches_git(self):
+        self.write('a.txt', b'a\n')
+        output = subprocess.run(['git', 'hash-object', 'a.txt'], cwd=self.repo,
+                                check=True, stdout=subprocess.PIPE).stdout
+        self.assertEqual(hash_blob(b'a\n'), output.decode('utf-8').strip())
+
+    def test_not_a_working_tree(self):
+        with tempfile.TemporaryDirectory() as folder:
+            os.environ['GIT_CEILING_DIRECTORIES'] = os.path.dirname(folder)
+            try:
+                self.assertIsNone(load_git_index(folder))
+            finally:
+                del os.environ['GIT_CEILING_DIRECTORIES']
+
+
+if __name__ == '__main__':
+    unittest.main()
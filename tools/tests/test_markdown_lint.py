@@ -0,0 +1,184 @@
+import os
+import re
+import shutil
+import subprocess
+import sys
+import tempfile
+import unittest
+
+tools_root = os.path.join(os.path.dirname(os.path.realpath(__file__)), '..')
+sys.path.append(os.path.join(tools_root, 'CI', 'README_Metadata_StyleCheck'))
+
+import markdown_lint
+import README_style_checker
+
+style_path = markdown_lint.get_default_style_path()
+
+# A document for each ported rule that breaks it, and the errors mdl reports
+# for the document with style.rb, as (line, rule). Other rules may fire too,
+# e.g. MD003 for a closed atx header. The errors follow the rule sources of
+# mdl 0.13; test_fixtures_match_mdl confirms them wherever mdl is installed.
+fixtures = {
+    'MD001': ('# Title\n\n### Section\n',
+              [(3, 'MD001')]),
+    'MD002': ('## Title\n\nText.\n',
+              [(1, 'MD002'), (1, 'MD041')]),
+    'MD003': ('# Title\n\nSection\n-------\n\n## Closed ##\n',
+              [(3, 'MD003'), (6, 'MD003')]),
+    'MD004': ('# Title\n\n- Item\n',
+              [(3, 'MD004')]),
+    'MD005': ('# Title\n\n* Item\n * Item\n',
+              [(4, 'MD005')]),
+    'MD006': ('# Title\n\nText.\n\n  * Item\n  * Item\n',
+              [(5, 'MD006')]),
+    'MD009': ('# Title\n\nOne space \nTwo spaces  \nThree spaces   \n',
+              [(3, 'MD009'), (5, 'MD009')]),
+    'MD010': ('# Title\n\nText\twith a tab.\n',
+              [(3, 'MD010')]),
+    'MD011': ('# Title\n\n(Reversed)[https://example.com] link.\n',
+              [(3, 'MD011')]),
+    'MD012': ('# Title\n\nText.\n\n\nText.\n',
+              [(5, 'MD012')]),
+    'MD014': ('# Title\n\n```sh\n$ ls\n$ cd folder\n```\n',
+              [(3, 'MD014')]),
+    'MD018': ('# Title\n\n##Section\n',
+              [(3, 'MD018')]),
+    'MD019': ('# Title\n\n##  Section\n',
+              [(3, 'MD019')]),
+    'MD020': ('# Title\n\n##Section ##\n',
+              [(3, 'MD003'), (3, 'MD020')]),
+    'MD021': ('# Title\n\n##  Section  ##\n',
+              [(3, 'MD003'), (3, 'MD021')]),
+    'MD022': ('# Title\n\nText.\n## Section\nText.\n',
+              [(4, 'MD022')]),
+    'MD023': ('# Title\n\n ## Section\n\nText\n  =====\n',
+              [(3, 'MD022'), (3, 'MD023'), (5, 'MD023')]),
+    'MD024': ('# Title\n\n## Section\n\n## Section\n',
+              [(5, 'MD024')]),
+    'MD025': ('# Title\n\n# Title\n',
+              [(3, 'MD024'), (3, 'MD025')]),
+    'MD026': ('# Title\n\n## Section.\n',
+              [(3, 'MD026')]),
+    'MD027': ('# Title\n\n>  Quote.\n',
+              [(3, 'MD027')]),
+    'MD028': ('# Title\n\n> Quote.\n\n> Quote.\n',
+              [(4, 'MD028')]),
+    'MD029': ('# Title\n\n1. Item\n1. Item\n1. Item\n',
+              [(4, 'MD029'), (5, 'MD029')]),
+    'MD030': ('# Title\n\n*  Item\n',
+              [(3, 'MD030')]),
+    'MD031': ('# Title\n\nText.\n```csharp\nvar x = 1;\n```\nText.\n',
+              [(4, 'MD031'), (6, 'MD031')]),
+    'MD032': ('# Title\n\nText.\n* Item\n\nText.\n',
+              [(4, 'MD032')]),
+    'MD035': ('# Title\n\n***\n\n- - -\n',
+              [(5, 'MD035')]),
+    'MD036': ('# Title\n\n**Emphasis**\n\nText.\n',
+              [(3, 'MD036')]),
+    'MD037': ('# Title\n\nSome * spaced * emphasis.\n',
+              [(3, 'MD037')]),
+    'MD038': ('# Title\n\nA ` spaced ` code span.\n',
+              [(3, 'MD038')]),
+    'MD039': ('# Title\n\nA [ spaced ](https://example.com) link.\n',
+              [(3, 'MD039')]),
+    'MD040': ('# Title\n\n```\ncode\n```\n',
+              [(3, 'MD040')]),
+    'MD041': ('Text.\n\n# Title\n',
+              [(1, 'MD041')]),
+    'MD046': ('# Title\n\nText.\n\n    indented code\n',
+              [(5, 'MD046')]),
+    'MD047': ('# Title\n\nText.',
+              [(3, 'MD047')]),
+}
+
+# An mdl error, e.g. `readme.md:3: MD009 Trailing spaces`.
+mdl_error_pattern = re.compile(r'^.*:(\d+): (MD\d{3}) ')
+
+
+def run_mdl(text: str) -> list:
+    with tempfile.TemporaryDirectory() as folder:
+        path = os.path.join(folder, 'fixture.md')
+        with open(path, 'w', newline='') as file:
+            file.write(text)
+        result = subprocess.run(['mdl', '--style', style_path, path],
+                                capture_output=True, text=True)
+    errors = []
+    for line in result.stdout.splitlines():
+        match = mdl_error_pattern.match(line)
+        if match:
+            errors.append((int(match.group(1)), match.group(2)))
+    return sorted(errors, key=lambda error: (error[1], error[0]))
+
+
+class FixtureTests(unittest.TestCase):
+    def test_every_rule_of_the_style_has_a_fixture(self):
+        style = markdown_lint.get_style(style_path)
+        self.assertEqual(sorted(style), sorted(fixtures))
+
+    def test_fixtures(self):
+        style = markdown_lint.get_style(style_path)
+        for rule_id, (text, expected) in fixtures.items():
+            with self.subTest(rule_id):
+                errors = markdown_lint.lint(text, style)
+                self.assertEqual([(error.line, error.rule)
+                                  for error in errors], expected)
+
+    @unittest.skipUnless(shutil.which('mdl'), 'mdl is not installed')
+    def test_fixtures_match_mdl(self):
+        for rule_id, (text, expected) in fixtures.items():
+            with self.subTest(rule_id):
+                self.assertEqual(run_mdl(text), expected)
+
+
+class ReadmeStyleCheckerLintTests(unittest.TestCase):
+    readme = '''# Display map
+
+Display a map.
+
+![Image of display map](displaymap.jpg)
+
+## Use case
+
+Text. 
+
+## How to use the sample
+
+Text.
+
+## How it works
+
+Text.
+
+## Relevant API
+
+* Map
+
+## Tags
+
+basemap, display'''
+
+    def setUp(self):
+        self.folder = tempfile.TemporaryDirectory()
+        self.sample_path = os.path.join(self.folder.name, 'DisplayMap')
+        os.mkdir(self.sample_path)
+        with open(os.path.join(self.sample_path, 'readme.md'), 'w') as file:
+            file.write(self.readme)
+
+    def tearDown(self):
+        self.folder.cleanup()
+
+    def test_lint_in_the_same_pass(self):
+        prefix = f'{self.sample_path} - Error markdown lint - readme.md'
+        self.assertEqual(
+            README_style_checker.collect_errors(self.sample_path, lint=True),
+            [f'{prefix}:9: MD009 Trailing spaces',
+             f'{prefix}:25: MD047 File should end with a single newline '
+             f'character'])
+
+    def test_no_lint_by_default(self):
+        self.assertEqual(
+            README_style_checker.collect_errors(self.sample_path), [])
+
+
+if __name__ == '__main__':
+    unittest.main()
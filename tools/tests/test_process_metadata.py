@@ -0,0 +1,70 @@
+import os
+import subprocess
+import sys
+import tempfile
+import unittest
+
+tools_root = os.path.join(os.path.dirname(os.path.realpath(__file__)), '..')
+sys.path.append(os.path.join(tools_root, 'benchmarks'))
+
+from generate_sample_tree import generate_sample_tree
+
+process_metadata = os.path.join(tools_root, 'metadata_tools',
+                                 'process_metadata.py')
+
+
+def run_process_metadata(sample_root: str, *args: str) -> str:
+    result = subprocess.run([sys.executable, process_metadata, sample_root,
+                             *args], capture_output=True, text=True,
+                            check=True)
+    return result.stdout.splitlines()[-1]
+
+
+def read_tocs(sample_root: str) -> dict:
+    tocs = {}
+    for platform in ('WPF', 'WinUI', 'MAUI'):
+        with open(os.path.join(sample_root, platform, 'readme.md')) as file:
+            tocs[platform] = file.read()
+    return tocs
+
+
+class IncrementalRunTests(unittest.TestCase):
+    def setUp(self):
+        self.folder = tempfile.TemporaryDirectory()
+        self.sample_root = os.path.join(self.folder.name, 'src')
+        generate_sample_tree(self.sample_root, 6)
+
+    def tearDown(self):
+        self.folder.cleanup()
+
+    def test_unchanged_run_writes_nothing(self):
+        run_process_metadata(self.sample_root)
+        self.assertEqual(run_process_metadata(self.sample_root),
+                         '0 files changed')
+
+    def test_toc_restored_when_changed_on_disk(self):
+        run_process_metadata(self.sample_root)
+        expected = read_tocs(self.sample_root)
+
+        # The TOCs are reverted or deleted behind the manifest's back, e.g. by
+        # git stash, while every sample is still up to date.
+        with open(os.path.join(self.sample_root, 'WPF', 'readme.md'),
+                  'w') as file:
+            file.write('# Table of contents\n')
+        os.remove(os.path.join(self.sample_root, 'MAUI', 'readme.md'))
+
+        self.assertEqual(run_process_metadata(self.sample_root),
+                         '2 files changed')
+        self.assertEqual(read_tocs(self.sample_root), expected)
+
+    def test_incremental_run_matches_forced_run(self):
+        run_process_metadata(self.sample_root)
+        os.remove(os.path.join(self.sample_root, 'WinUI', 'readme.md'))
+        run_process_metadata(self.sample_root)
+        incremental = read_tocs(self.sample_root)
+        run_process_metadata(self.sample_root, '--force')
+        self.assertEqual(read_tocs(self.sample_root), incremental)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,70 @@
+import os
+import sys
+import unittest
+
+tools_root = os.path.join(os.path.dirname(os.path.realpath(__file__)), '..')
+sys.path.append(os.path.join(tools_root, 'shared'))
+
+from readme_parser import parse_readme
+
+readme = '''# Display map
+
+Display a map.
+
+![Image of display map](displaymap.jpg)
+
+## Use case
+
+Text.
+
+### How it works in detail
+
+Text.
+
+## Tags
+
+basemap, map
+'''
+
+
+class ParseReadmeTests(unittest.TestCase):
+    def test_head(self):
+        document = parse_readme(readme)
+        self.assertEqual(document.title, 'Display map')
+        self.assertEqual(document.description, 'Display a map.')
+        self.assertEqual(document.image,
+                         '![Image of display map](displaymap.jpg)')
+
+    def test_sections(self):
+        document = parse_readme(readme)
+        # Headers with more than two pound marks don't start a section.
+        self.assertEqual(document.headers, ['Use case', 'Tags'])
+        self.assertEqual(document.section('Use case'),
+                         '\n\nText.\n\n### How it works in detail\n\nText.\n\n')
+        self.assertEqual(document.section('Tags'), '\n\nbasemap, map\n')
+        for section in document.sections:
+            self.assertEqual(readme[section.start:section.end],
+                             f'## {section.header}{section.body}')
+        self.assertTrue(document.has_section('Tags'))
+        self.assertFalse(document.has_section('Relevant API'))
+        with self.assertRaises(ValueError):
+            document.section('Relevant API')
+
+    def test_paragraphs(self):
+        document = parse_readme(readme)
+        self.assertEqual(document.paragraphs[0], '# Display map')
+        self.assertEqual(document.paragraphs[-1], 'basemap, map\n')
+
+    def test_no_sections(self):
+        document = parse_readme('# Title\n')
+        self.assertEqual(document.sections, ())
+        self.assertEqual(document.head, '# Title\n')
+        self.assertIsNone(document.description)
+        self.assertIsNone(parse_readme('').title)
+
+    def test_results_are_cached(self):
+        self.assertIs(parse_readme(readme), parse_readme(readme))
+
+
+if __name__ == '__main__':
+    unittest.main()
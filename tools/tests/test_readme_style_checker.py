@@ -0,0 +1,90 @@
+import os
+import sys
+import tempfile
+import unittest
+
+tools_root = os.path.join(os.path.dirname(os.path.realpath(__file__)), '..')
+sys.path.append(os.path.join(tools_root, 'CI', 'README_Metadata_StyleCheck'))
+
+import README_style_checker
+
+head = '''# Display map
+
+Display a map.
+
+![Image of display map](displaymap.jpg)
+
+'''
+
+sections = {
+    'Use case': 'Text.\n\n',
+    'How to use the sample': 'Text.\n\n',
+    'How it works': 'Text.\n\n',
+    'Relevant API': '* Map\n* MapView\n\n',
+    'Tags': 'basemap, display\n',
+}
+
+
+def make_readme(**bodies) -> str:
+    """
+    :param bodies: The bodies of the sections to replace, by header with
+    spaces as underscores, or None to leave a section out.
+    """
+    text = head
+    for header, body in sections.items():
+        body = bodies.get(header.replace(' ', '_'), body)
+        if body is not None:
+            text += f'## {header}\n\n{body}'
+    return text
+
+
+class CollectErrorsTests(unittest.TestCase):
+    def setUp(self):
+        self.folder = tempfile.TemporaryDirectory()
+        self.sample_path = os.path.join(self.folder.name, 'DisplayMap')
+        os.mkdir(self.sample_path)
+
+    def tearDown(self):
+        self.folder.cleanup()
+
+    def check(self, readme: str) -> list:
+        with open(os.path.join(self.sample_path, 'readme.md'), 'w') as file:
+            file.write(readme)
+        prefix = f'{self.sample_path} - '
+        errors = README_style_checker.collect_errors(self.sample_path)
+        self.assertTrue(all(error.startswith(prefix) for error in errors))
+        return [error[len(prefix):] for error in errors]
+
+    def test_valid_readme(self):
+        self.assertEqual(self.check(make_readme()), [])
+
+    def test_missing_section(self):
+        self.assertEqual(self.check(make_readme(Tags=None)), [
+            'Error header - Missing essential header(s) - "{\'Tags\'}".',
+            "Error tags - 'Tags' is not in list",
+            "'Tags' is not in list",
+        ])
+
+    def test_malformed_sections(self):
+        self.assertEqual(self.check(make_readme(
+            Relevant_API='* MapView\n* Map\n\n',
+            Tags='display, basemap\n')), [
+            'Error APIs - APIs are not sorted.',
+            'Error tags - Tags are not sorted.',
+            'APIs are not sorted.',
+        ])
+
+    def test_api_in_tags(self):
+        self.assertEqual(self.check(make_readme(Tags='basemap, Map\n')), [
+            'Error tags - API should not be in tags',
+        ])
+
+    def test_title_case(self):
+        readme = make_readme().replace('# Display map', '# display map', 1)
+        self.assertEqual(self.check(readme), [
+            'Error title - Wrong letter case for the first word in title.',
+        ])
+
+
+if __name__ == '__main__':
+    unittest.main()
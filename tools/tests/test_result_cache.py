@@ -0,0 +1,104 @@
+import concurrent.futures
+import os
+import sys
+import tempfile
+import unittest
+
+tools_root = os.path.join(os.path.dirname(os.path.realpath(__file__)), '..')
+sys.path.append(os.path.join(tools_root, 'shared'))
+
+from result_cache import InputHasher, ResultCache
+
+
+class ResultCacheTests(unittest.TestCase):
+    def setUp(self):
+        self.folder = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.folder.name, 'cache.json')
+        self.calls = []
+
+    def tearDown(self):
+        self.folder.cleanup()
+
+    def check(self, item: str) -> list:
+        self.calls.append(item)
+        return [item.upper()]
+
+    def load(self, fingerprint: str = 'v1') -> ResultCache:
+        cache = ResultCache(self.path, fingerprint)
+        cache.load()
+        return cache
+
+    def test_map_replays_hits(self):
+        cache = self.load()
+        self.assertEqual(cache.map(self.check, ['a', 'b'], lambda item: item),
+                         [['A'], ['B']])
+        cache.save()
+        cache = self.load()
+        self.assertEqual(cache.map(self.check, ['b', 'c'], lambda item: item),
+                         [['B'], ['C']])
+        self.assertEqual(self.calls, ['a', 'b', 'c'])
+
+    def test_map_with_executor(self):
+        cache = self.load()
+        cache.put('a', ['cached'])
+        with concurrent.futures.ThreadPoolExecutor(2) as executor:
+            results = cache.map(self.check, ['a', 'b', 'c'],
+                                lambda item: item, executor)
+        self.assertEqual(results, [['cached'], ['B'], ['C']])
+
+    def test_outdated_fingerprint(self):
+        cache = self.load()
+        cache.put('a', ['A'])
+        cache.save()
+        self.assertEqual(self.load('v2').results, {})
+        self.assertEqual(self.load('v1').results, {'a': ['A']})
+
+    def test_unreadable_cache(self):
+        with open(self.path, 'w') as file:
+            file.write('{')
+        self.assertEqual(self.load().results, {})
+
+    def test_prune(self):
+        cache = self.load()
+        cache.put('a', ['A'])
+        cache.put('b', ['B'])
+        cache.save()
+        cache = self.load()
+        cache.get('a')
+        cache.save(prune=True)
+        self.assertEqual(cache.results, {'a': ['A']})
+        self.assertEqual(self.load().results, {'a': ['A']})
+
+    def test_discard(self):
+        cache = self.load()
+        cache.put('a', ['A'])
+        cache.discard('a')
+        cache.discard('missing')
+        self.assertIsNone(cache.get('a'))
+        cache.save(prune=True)
+        self.assertEqual(self.load().results, {})
+
+
+class InputHasherTests(unittest.TestCase):
+    def digest(self, *strings: str) -> str:
+        hasher = InputHasher()
+        for string in strings:
+            hasher.add_string(string)
+        return hasher.hexdigest()
+
+    def test_values_are_length_prefixed(self):
+        self.assertNotEqual(self.digest('ab', 'c'), self.digest('a', 'bc'))
+
+    def test_missing_file_differs_from_empty_file(self):
+        with tempfile.TemporaryDirectory() as folder:
+            path = os.path.join(folder, 'readme.md')
+            missing = InputHasher()
+            missing.add_file(path)
+            open(path, 'w').close()
+            empty = InputHasher()
+            empty.add_file(path)
+        self.assertNotEqual(missing.hexdigest(), empty.hexdigest())
+
+
+if __name__ == '__main__':
+    unittest.main()